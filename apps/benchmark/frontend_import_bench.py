@@ -0,0 +1,122 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Benchmark script for the import time of large ONNX and PyTorch graphs.
+see README.md for the usage of this script.
+"""
+import argparse
+import time
+
+import numpy as np
+
+from tvm import relay
+from tvm.relay.frontend.onnx import GraphProto
+
+
+def make_onnx_chain(num_nodes, shape=(1, 16)):
+    """A chain of shape dependent ops, each of which infers the shape of its input."""
+    # pylint: disable=import-outside-toplevel
+    import onnx
+    from onnx import helper, TensorProto
+
+    nodes = []
+    initializers = []
+    prev = "x"
+    for i in range(num_nodes // 2):
+        w_name = "w%d" % i
+        initializers.append(
+            helper.make_tensor(
+                w_name, TensorProto.FLOAT, (shape[1], shape[1]), np.ones(shape[1] * shape[1])
+            )
+        )
+        nodes.append(helper.make_node("MatMul", [prev, w_name], ["m%d" % i]))
+        nodes.append(helper.make_node("Softmax", ["m%d" % i], ["s%d" % i], axis=-1))
+        prev = "s%d" % i
+    graph = helper.make_graph(
+        nodes,
+        "chain",
+        [helper.make_tensor_value_info("x", TensorProto.FLOAT, shape)],
+        [helper.make_tensor_value_info(prev, TensorProto.FLOAT, shape)],
+        initializer=initializers,
+    )
+    return onnx.helper.make_model(graph), {"x": shape}
+
+
+def make_pytorch_chain(num_nodes, shape=(1, 16)):
+    """A traced chain of linear layers and activations."""
+    # pylint: disable=import-outside-toplevel
+    import torch
+
+    layers = []
+    for _ in range(num_nodes // 2):
+        layers += [torch.nn.Linear(shape[1], shape[1]), torch.nn.Softmax(dim=-1)]
+    model = torch.nn.Sequential(*layers).eval()
+    data = torch.rand(shape)
+    return torch.jit.trace(model, data), [("x", shape)]
+
+
+def import_onnx(model, shape_dict, incremental):
+    if incremental:
+        return relay.frontend.from_onnx(model, shape_dict)
+    # without the incremental type inference context of from_onnx
+    g = GraphProto(shape_dict, "float32")
+    with g:
+        return g.from_onnx(model.graph, model.opset_import[0].version)
+
+
+def benchmark(frontend, sizes, repeat):
+    """Print the import time of chains of growing size."""
+    configs = [True, False] if frontend == "onnx" else [True]
+    for num_nodes in sizes:
+        if frontend == "onnx":
+            model, inputs = make_onnx_chain(num_nodes)
+        else:
+            model, inputs = make_pytorch_chain(num_nodes)
+        for incremental in configs:
+            costs = []
+            for _ in range(repeat):
+                tic = time.time()
+                if frontend == "onnx":
+                    import_onnx(model, inputs, incremental)
+                else:
+                    relay.frontend.from_pytorch(model, inputs)
+                costs.append(time.time() - tic)
+            cost = np.mean(costs)
+            print(
+                "%-8s %-6d %-12s %8.2f s  %8.2f ms/node"
+                % (
+                    frontend,
+                    num_nodes,
+                    "incremental" if incremental else "full",
+                    cost,
+                    cost / num_nodes * 1000,
+                )
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--frontend", type=str, choices=["onnx", "pytorch"], default="onnx")
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[250, 500, 1000, 2000], help="numbers of nodes"
+    )
+    parser.add_argument("--repeat", type=int, default=1)
+    args = parser.parse_args()
+
+    print("-" * 60)
+    print("%-8s %-6s %-12s %10s  %14s" % ("Frontend", "Nodes", "Inference", "Time", "Per node"))
+    print("-" * 60)
+    benchmark(args.frontend, args.sizes, args.repeat)
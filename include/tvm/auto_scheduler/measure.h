@@ -73,6 +73,8 @@ enum class MeasureErrorNO : int {
   kRunTimeoutError = 7,
   /*! \brief Unknown error. */
   kUnknownError = 8,
+  /*! \brief The run is stopped after a probe, as the program is much slower than the best one. */
+  kEarlyTerminated = 9,
 };
 
 // Inputs and results of one measurement
@@ -171,6 +173,12 @@ class MeasureResultNode : public Object {
   double all_cost;
   /*! \brief The time stamps of this measurement. */
   double timestamp;
+  /*!
+   * \brief The half width of the 95% confidence interval of the mean cost, relative to the mean.
+   * Negative if the runner did not repeat the measurement to a confidence target.
+   * It is not stored in log files.
+   */
+  double rel_ci = -1;
 
   void VisitAttrs(tvm::AttrVisitor* v) {
     v->Visit("costs", &costs);
@@ -178,6 +186,7 @@ class MeasureResultNode : public Object {
     v->Visit("error_msg", &error_msg);
     v->Visit("all_cost", &all_cost);
     v->Visit("timestamp", &timestamp);
+    v->Visit("rel_ci", &rel_ci);
   }
 
   /*! \brief Do shallow copy. */
@@ -200,9 +209,10 @@ class MeasureResult : public ObjectRef {
    * \param error_msg The error message if there is any error.
    * \param all_cost The time cost of build and run.
    * \param timestamp The time stamps of this measurement.
+   * \param rel_ci The relative half width of the confidence interval of the mean cost.
    */
   MeasureResult(Array<PrimExpr> costs, int error_no, String error_msg, double all_cost,
-                double timestamp);
+                double timestamp, double rel_ci = -1);
 
   TVM_DEFINE_OBJECT_REF_METHODS(MeasureResult, ObjectRef, MeasureResultNode);
 };
@@ -368,6 +378,19 @@ class LocalBuilder : public ProgramBuilder {
 /*! \brief LocalRunner that uses local CPU/GPU to measure the time cost of programs */
 class LocalRunnerNode : public ProgramRunnerNode {
  public:
+  /*!
+   * \brief If positive, run each program once first, and stop measuring it when this probe is
+   * slower than probe_ratio times the best cost measured for its workload.
+   */
+  double probe_ratio;
+  /*!
+   * \brief If positive, repeat the measurement until the relative 95% confidence interval of
+   * the mean cost is at most max_rel_ci, or until ci_time_budget seconds are spent.
+   */
+  double max_rel_ci;
+  /*! \brief The time budget in seconds for repeating a measurement to reach max_rel_ci. */
+  double ci_time_budget;
+
   Array<MeasureResult> Run(const Array<MeasureInput>& inputs,
                            const Array<BuildResult>& build_results, int verbose) final;
 
@@ -391,9 +414,13 @@ class LocalRunner : public ProgramRunner {
    * \param min_repeat_ms The minimum duration of one repeat in milliseconds.
    * \param cooldown_interval The cool down interval between two measurements.
    * \param enable_cpu_cache_flush Whether to flush cache on CPU between repeated measurements.
+   * \param probe_ratio The ratio to the best cost above which a probe stops the measurement.
+   * \param max_rel_ci The target relative confidence interval of the mean cost.
+   * \param ci_time_budget The time budget in seconds for reaching max_rel_ci.
    */
   LocalRunner(int timeout, int number, int repeat, int min_repeat_ms, double cooldown_interval,
-              bool enable_cpu_cache_flush);
+              bool enable_cpu_cache_flush, double probe_ratio = 0, double max_rel_ci = 0,
+              double ci_time_budget = 1.0);
 
   TVM_DEFINE_MUTABLE_OBJECT_REF_METHODS(LocalRunner, ProgramRunner, LocalRunnerNode);
 };
@@ -415,6 +442,11 @@ class RPCRunnerNode : public ProgramRunnerNode {
   int priority;
   /*! \brief The number of tasks run in parallel. */
   int n_parallel;
+  /*!
+   * \brief If positive, reuse RPC sessions across measurements, and request them with this
+   * duration in seconds.
+   */
+  double session_lifetime;
 
   Array<MeasureResult> Run(const Array<MeasureInput>& inputs,
                            const Array<BuildResult>& build_results, int verbose) final;
@@ -443,10 +475,11 @@ class RPCRunner : public ProgramRunner {
    * \param min_repeat_ms The minimum duration of one repeat in milliseconds.
    * \param cooldown_interval The cool down interval between two measurements.
    * \param enable_cpu_cache_flush Whether to flush cache on CPU between repeated measurements.
+   * \param session_lifetime If positive, the duration of reused RPC sessions.
    */
   RPCRunner(const String& key, const String& host, int port, int priority, int n_parallel,
             int timeout, int number, int repeat, int min_repeat_ms, double cooldown_interval,
-            bool enable_cpu_cache_flush);
+            bool enable_cpu_cache_flush, double session_lifetime = 0);
 
   TVM_DEFINE_MUTABLE_OBJECT_REF_METHODS(RPCRunner, ProgramRunner, RPCRunnerNode);
 };
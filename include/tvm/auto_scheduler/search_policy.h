@@ -168,6 +168,15 @@ class SearchPolicyNode : public Object {
    */
   void PreloadMeasuredStates(const String& log_file);
 
+  /*!
+   * \brief Preload measured states from measurement records to resume the state of the search
+   * policy. The records of other tasks are skipped.
+   * \param inputs The measure inputs of the records.
+   * \param results The measure results of the records.
+   */
+  void PreloadMeasuredStates(const Array<MeasureInput>& inputs,
+                             const Array<MeasureResult>& results);
+
   /*!
    * \brief Call SearchCallback with the current SearchPolicyNode
    * \param callbacks SearchCallback to be called.
@@ -33,7 +33,12 @@ from . import workload_registry
 # Shortcut
 from .compute_dag import ComputeDAG, LayoutRewriteOption, get_shape_from_rewritten_layout
 from .cost_model import RandomModel, XGBModel
-from .dispatcher import DispatchContext, ApplyHistoryBest, ApplyHistoryBestOrSample
+from .dispatcher import (
+    DispatchContext,
+    ApplyHistoryBest,
+    ApplyHistoryBestOrSample,
+    LazyApplyHistoryBest,
+)
 from .measure import (
     MeasureInput,
     MeasureResult,
@@ -43,7 +48,14 @@ from .measure import (
     LocalRPCMeasureContext,
     register_task_input_check_func,
 )
-from .measure_record import RecordToFile, RecordReader, load_best_record, load_records, save_records
+from .measure_record import (
+    RecordToFile,
+    RecordReader,
+    load_best_index,
+    load_best_record,
+    load_records,
+    save_records,
+)
 from .relay_integration import (
     extract_tasks,
     remove_index_check,
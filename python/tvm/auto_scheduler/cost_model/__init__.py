@@ -19,3 +19,4 @@
 
 from .cost_model import RandomModel
 from .xgb_model import XGBModel
+from .pretrain import load_features_from_files, pretrain_xgb_model
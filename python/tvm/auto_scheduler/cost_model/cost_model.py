@@ -17,6 +17,7 @@
 
 """ Cost models that estimate the performance of programs """
 import ctypes
+import threading
 import numpy as np
 
 import tvm._ffi
@@ -86,19 +87,29 @@ def random_fill_float(size, return_ptr):
 
 @tvm._ffi.register_object("auto_scheduler.PythonBasedModel")
 class PythonBasedModel(CostModel):
-    """Base class for cost models implemented in python"""
+    """Base class for cost models implemented in python.
+
+    The model may be shared by search policies running in several threads, the calls
+    from the search policies are serialized with `lock`, which other readers of the
+    state of the model should hold as well.
+    """
 
     def __init__(self):
+        lock = self.lock = threading.Lock()
+
         def update_func(inputs, results):
-            self.update(inputs, results)
+            with lock:
+                self.update(inputs, results)
 
         def predict_func(task, states, return_ptr):
             return_ptr = ctypes.cast(return_ptr, ctypes.POINTER(ctypes.c_float))
             array_wrapper = np.ctypeslib.as_array(return_ptr, shape=(len(states),))
-            array_wrapper[:] = self.predict(task, states)
+            with lock:
+                array_wrapper[:] = self.predict(task, states)
 
         def predict_stage_func(task, states, return_ptr):
-            ret = self.predict_stages(task, states)
+            with lock:
+                ret = self.predict_stages(task, states)
             return_ptr = ctypes.cast(return_ptr, ctypes.POINTER(ctypes.c_float))
             array_wrapper = np.ctypeslib.as_array(return_ptr, shape=ret.shape)
             array_wrapper[:] = ret
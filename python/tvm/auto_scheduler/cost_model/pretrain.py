@@ -0,0 +1,192 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Pretrain a cost model on a corpus of measure records from many tasks and sessions.
+
+The pretrained model can warm-start the tuning of new networks, see the
+`pretrained_model_file` argument of :code:`TaskScheduler`.
+
+Usage:
+python -m tvm.auto_scheduler.cost_model.pretrain --logs logs/ old.json --output model.xgb
+"""
+import argparse
+import glob
+import logging
+import os
+
+import numpy as np
+
+from ..feature import (
+    FeatureCache,
+    filter_extractable_pairs,
+    get_per_store_features_from_measure_pairs,
+)
+from ..measure_record import RecordReader
+from .xgb_model import XGBModel
+
+logger = logging.getLogger("auto_scheduler")
+
+
+def _expand_log_files(log_files):
+    """Expand the directories in a list of log files to the json files inside them."""
+    ret = []
+    for name in log_files:
+        if os.path.isdir(name):
+            ret.extend(sorted(glob.glob(os.path.join(name, "*.json"))))
+        else:
+            ret.append(name)
+    return ret
+
+
+def load_features_from_files(log_files, chunk_size=4096, max_lines=None, feature_cache=None):
+    """Stream measure records from log files and extract their per-store features.
+
+    The records are read and featurized chunk by chunk, so only the features are kept in
+    memory. The throughputs are normalized per (workload key, target) over all files.
+    The records of workloads not registered in this process are skipped.
+
+    Parameters
+    ----------
+    log_files: List[str]
+        The record files. Directories are expanded to the json files inside them.
+    chunk_size: int = 4096
+        The number of records read and featurized at once.
+    max_lines: Optional[int]
+        Only read the first n lines of every file.
+    feature_cache: Optional[Union[str, FeatureCache]]
+        If is not None, look up and store the features in this on-disk cache.
+
+    Returns
+    -------
+    features: np.ndarray
+        Feature vectors
+    normalized_throughputs: np.ndarray
+        Normalized throughputs
+    task_ids: np.ndarray
+        Task ids
+    """
+    if isinstance(feature_cache, str):
+        feature_cache = FeatureCache(feature_cache)
+    if feature_cache is not None:
+        extract = feature_cache.get_per_store_features_from_measure_pairs
+    else:
+        extract = get_per_store_features_from_measure_pairs
+
+    features, costs, task_ids = [], [], []
+    task_keys = {}  # (workload key, target) -> task id
+    for filename in _expand_log_files(log_files):
+        reader = RecordReader(filename)
+        n_read = 0
+        while max_lines is None or n_read < max_lines:
+            n_lines = chunk_size if max_lines is None else min(chunk_size, max_lines - n_read)
+            inputs, results = reader.read_lines(n_lines)
+            if len(inputs) == 0:
+                break
+            n_read += len(inputs)
+            inputs, results = filter_extractable_pairs(inputs, results)
+            if len(inputs) == 0:
+                continue
+            features.extend(extract(inputs, results)[0])
+            for inp, res in zip(inputs, results):
+                key = (inp.task.workload_key, str(inp.task.target))
+                task_ids.append(task_keys.setdefault(key, len(task_keys)))
+                costs.append(np.mean([x.value for x in res.costs]))
+        logger.info("Pretrain: Loaded %d measure records from %s", n_read, filename)
+    assert len(features) == len(costs) == len(task_ids)
+
+    costs = np.array(costs, dtype=np.float32)
+    task_ids = np.array(task_ids, dtype=np.int32)
+    min_costs = np.full(len(task_keys), np.inf, dtype=np.float32)
+    np.minimum.at(min_costs, task_ids, costs)
+    normalized_throughputs = min_costs[task_ids] / costs
+    return np.array(features, dtype=object), normalized_throughputs, task_ids
+
+
+def pretrain_xgb_model(
+    log_files,
+    model_file=None,
+    chunk_size=4096,
+    max_lines=None,
+    feature_cache=None,
+    verbose_eval=25,
+    seed=None,
+):
+    """Train a global XGBModel on the measure records of many tasks.
+
+    Parameters
+    ----------
+    log_files: List[str]
+        The record files. Directories are expanded to the json files inside them.
+    model_file: Optional[str]
+        If is not None, save the trained model to this file.
+    chunk_size: int = 4096
+        The number of records read and featurized at once.
+    max_lines: Optional[int]
+        Only read the first n lines of every file.
+    feature_cache: Optional[Union[str, FeatureCache]]
+        If is not None, look up and store the features in this on-disk cache.
+    verbose_eval: int = 25
+        Print training log every `verbose_eval` iterations.
+    seed: Optional[int]
+        The random seed
+
+    Returns
+    -------
+    model: XGBModel
+        The trained model
+    """
+    features, normalized_throughputs, task_ids = load_features_from_files(
+        log_files, chunk_size, max_lines, feature_cache
+    )
+    if len(features) == 0:
+        raise ValueError("No measure records found in %s" % (log_files,))
+    logger.info(
+        "Pretrain: Train on %d records of %d tasks", len(features), len(np.unique(task_ids))
+    )
+
+    model = XGBModel(verbose_eval=verbose_eval, num_warmup_sample=-1, seed=seed)
+    model.update_from_features(features, normalized_throughputs, task_ids)
+    if model_file:
+        model.save(model_file)
+    return model
+
+
+def main():
+    """The main function for the pretraining CLI."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--logs", type=str, nargs="+", required=True, help="record files or dirs")
+    parser.add_argument("--output", type=str, required=True, help="the model file")
+    parser.add_argument("--chunk-size", type=int, default=4096)
+    parser.add_argument("--max-lines", type=int, help="only read the first n lines of every file")
+    parser.add_argument("--feature-cache", type=str, help="the directory of the feature cache")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    logging.basicConfig()
+    logger.setLevel(logging.INFO)
+    pretrain_xgb_model(
+        args.logs,
+        args.output,
+        chunk_size=args.chunk_size,
+        max_lines=args.max_lines,
+        feature_cache=args.feature_cache,
+        seed=args.seed,
+    )
+
+
+if __name__ == "__main__":
+    main()
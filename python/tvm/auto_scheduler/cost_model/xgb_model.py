@@ -25,7 +25,12 @@ import numpy as np
 
 from tvm.autotvm.tuner.metric import max_curve
 from .cost_model import PythonBasedModel
-from ..feature import get_per_store_features_from_measure_pairs, get_per_store_features_from_states
+from ..feature import (
+    DEFAULT_FEATURE_VEC_LEN,
+    FeatureCache,
+    get_per_store_features_from_measure_pairs,
+    get_per_store_features_from_states,
+)
 from ..measure_record import RecordReader
 
 xgb = None
@@ -101,6 +106,14 @@ class XGBModel(PythonBasedModel):
     adapative_training: bool = False
         Whether to use adapatie training, which reduces the training frequency when there are
         too many logs.
+    feature_cache: Optional[Union[str, FeatureCache]]
+        If is not None, look up the features of measured states in this on-disk cache (or
+        cache directory) before extracting them, and store the newly extracted ones in it.
+        Resumed tuning sessions and pretraining over record files then skip the extraction.
+    base_model_file: Optional[str]
+        If is not None, load a model pretrained on other tasks (e.g. by `pretrain_xgb_model`)
+        from this file. It is used for predictions from the start, and every update boosts
+        new trees on top of it instead of training a model from scratch.
     """
 
     def __init__(
@@ -110,6 +123,8 @@ class XGBModel(PythonBasedModel):
         seed=None,
         model_file=None,
         adapative_training=False,
+        feature_cache=None,
+        base_model_file=None,
     ):
         global xgb
         try:
@@ -142,6 +157,16 @@ class XGBModel(PythonBasedModel):
         self.verbose_eval = verbose_eval
         self.model_file = model_file
         self.adapative_training = adapative_training
+        if isinstance(feature_cache, str):
+            feature_cache = FeatureCache(feature_cache)
+        self.feature_cache = feature_cache
+        self.base_bst = None
+        if base_model_file:
+            self.base_bst = xgb.Booster(self.xgb_params, model_file=base_model_file)
+            # drop the early stopping state of the pretraining
+            self.base_bst.set_attr(best_score=None, best_iteration=None, best_msg=None)
+            self.bst = self.base_bst
+            self.num_warmup_sample = -1
 
         super().__init__()
 
@@ -179,7 +204,11 @@ class XGBModel(PythonBasedModel):
 
         # extract feature
         n_cached = len(self.inputs_feature_cache)
-        features, normalized_throughputs, task_ids = get_per_store_features_from_measure_pairs(
+        if self.feature_cache is not None:
+            extract = self.feature_cache.get_per_store_features_from_measure_pairs
+        else:
+            extract = get_per_store_features_from_measure_pairs
+        features, normalized_throughputs, task_ids = extract(
             self.inputs, self.results, skip_first_n_feature_extraction=n_cached
         )
         if n_cached > 0:
@@ -187,6 +216,19 @@ class XGBModel(PythonBasedModel):
             features[:n_cached] = self.inputs_feature_cache
             features = np.array(features, dtype=object)
         self.inputs_feature_cache = features
+        self.update_from_features(features, normalized_throughputs, task_ids)
+
+    def update_from_features(self, features, normalized_throughputs, task_ids):
+        """Train the cost model on extracted features.
+        Parameters
+        ----------
+        features: np.ndarray
+            The per-store features of the measured states
+        normalized_throughputs: np.ndarray
+            The normalized throughputs of the measured states
+        task_ids: np.ndarray
+            The task ids of the measured states
+        """
         dtrain = pack_sum_xgbmatrix(
             features, normalized_throughputs, task_ids, normalized_throughputs
         )
@@ -210,6 +252,7 @@ class XGBModel(PythonBasedModel):
                     verbose_eval=self.verbose_eval,
                 )
             ],
+            xgb_model=self.base_bst,
         )
 
         # Update the model file if it has been set
@@ -343,6 +386,61 @@ class XGBModel(PythonBasedModel):
         self.bst.load_model(file_name)
         self.num_warmup_sample = -1
 
+    def get_checkpoint(self, skip_first_n_features=0):
+        """Get the trained model and the extracted features, to checkpoint a tuning session.
+        The measurement records of the model are not included, since the caller stores them.
+
+        Parameters
+        ----------
+        skip_first_n_features: int = 0
+            Skip the features of the first n measured states, e.g. the ones a previous
+            checkpoint already holds.
+
+        Returns
+        -------
+        state: Dict[str, np.ndarray]
+            The state of the model as numpy arrays
+        """
+        features = [
+            np.asarray(x, dtype=np.float32)
+            for x in self.inputs_feature_cache[skip_first_n_features:]
+        ]
+        return {
+            "raw": np.frombuffer(
+                bytes(self.bst.save_raw()) if self.bst is not None else b"", dtype=np.uint8
+            ),
+            "features": (
+                np.concatenate(features)
+                if features
+                else np.zeros((0, DEFAULT_FEATURE_VEC_LEN), dtype=np.float32)
+            ),
+            "feature_rows": np.array([len(x) for x in features], dtype=np.int32),
+            "last_train_length": np.array(self.last_train_length),
+        }
+
+    def load_checkpoint(self, state, inputs, results):
+        """Restore the model from a checkpoint made by `get_checkpoint`.
+
+        Parameters
+        ----------
+        state: Dict[str, np.ndarray]
+            The state of the model as numpy arrays
+        inputs : List[MeasureInput]
+            The measurement inputs the model was trained with
+        results : List[MeasureResult]
+            The measurement results the model was trained with
+        """
+        self.inputs = list(inputs)
+        self.results = list(results)
+        self.last_train_length = int(state["last_train_length"])
+        offsets = np.cumsum(state["feature_rows"])
+        self.inputs_feature_cache = np.empty(len(offsets), dtype=object)
+        for i, feature in enumerate(np.split(state["features"], offsets)[: len(offsets)]):
+            self.inputs_feature_cache[i] = feature
+        if len(state["raw"]):
+            self.bst = xgb.Booster(self.xgb_params)
+            self.bst.load_model(bytearray(state["raw"].tobytes()))
+
 
 def feature_to_pack_sum_xgbmatrix(xs):
     """Convert an extracted multi-stage feature vector to a xgbmatrx in pack-sum format
@@ -32,7 +32,7 @@ from tvm.contrib.utils import tempdir
 from tvm.tir.expr import FloatImm
 from .cost_model import RandomModel, XGBModel
 from .measure import LocalRPCMeasureContext
-from .measure_record import RecordToFile, load_records
+from .measure_record import MappedRecordFile, RecordToFile, load_best_index, load_records
 from .search_policy import PreloadMeasuredStates, SketchPolicy
 from .search_task import SearchTask, TuningOptions
 from .utils import calc_workload_dis_factor, decode_workload_key
@@ -310,6 +310,97 @@ class ApplyHistoryBest(DispatchContext):
             entry[workload_args] = (state, 1)
 
 
+class _LazyState(object):
+    """A placeholder of the state of a record, decoded when it is first needed."""
+
+    def __init__(self, records, offset):
+        self.records = records
+        self.offset = offset
+        self._state = None
+
+    def get(self):
+        if self._state is None:
+            self._state = self.records.read_at(self.offset)[0].state
+        return self._state
+
+
+class LazyApplyHistoryBest(ApplyHistoryBest):
+    """
+    Apply the history best config, decoding the best records on demand.
+
+    Instead of decoding every record of a log file, this context loads the index of the
+    best record offset per (target key, workload key) and (target model, workload key),
+    built by :any:`load_best_index` and kept next to the log by a previous run. The log
+    file is mapped in memory and a state is only decoded when it is queried. Compatible
+    workloads are matched from the costs in the index too.
+
+    Parameters
+    ----------
+    records : str or iterator of (auto_scheduler.measure.MeasureInput,\
+                                  auto_scheduler.measure.MeasureResult)
+        Collection of tuning records.
+        If is str, then it should be the filename of a records log file.
+        Iterators are loaded eagerly as in ApplyHistoryBest.
+    n_lines: Optional[int]
+        if it is not None, only load the first `n_lines` lines of log, without the index.
+    include_compatible: bool
+        When set to True, compatible records will also be considered.
+    use_cache: bool
+        Whether to read and write the index file of the logs.
+
+    Note
+    ----
+    The log files are unmapped when this context exits, or by `close`. They are
+    mapped again if states are queried later.
+    """
+
+    def __init__(self, records, n_lines=None, include_compatible=False, use_cache=True):
+        self.use_cache = use_cache
+        self._files = []
+        super(LazyApplyHistoryBest, self).__init__(records, n_lines, include_compatible)
+
+    def load(self, records, n_lines=None):
+        if isinstance(records, pathlib.Path):
+            records = str(records)
+        if not isinstance(records, str) or n_lines is not None:
+            super(LazyApplyHistoryBest, self).load(records, n_lines)
+            return
+
+        index = load_best_index(records, self.use_cache)
+        mapped = MappedRecordFile(records)
+        self._files.append(mapped)
+
+        counter = 0
+        for kind, best_records in [
+            ("targetkey", self.best_by_targetkey),
+            ("model", self.best_by_model),
+        ]:
+            for (key, workload_key), (offset, cost) in index[kind].items():
+                counter += 1
+                entry, _, workload_args = self.get_workload_entry(
+                    best_records, key, workload_key
+                )
+                if workload_args not in entry or entry[workload_args][1] > cost:
+                    entry[workload_args] = (_LazyState(mapped, offset), cost)
+
+        logger.debug("Finish indexing %d best records", counter)
+
+    def _query_inside(self, target, workload_key, func_name):
+        ret = super(LazyApplyHistoryBest, self)._query_inside(target, workload_key, func_name)
+        if isinstance(ret, _LazyState):
+            ret = ret.get()
+        return ret
+
+    def close(self):
+        """Unmap the log files."""
+        for mapped in self._files:
+            mapped.close()
+
+    def __exit__(self, ptype, value, trace):
+        super(LazyApplyHistoryBest, self).__exit__(ptype, value, trace)
+        self.close()
+
+
 class ApplyHistoryBestOrSample(ApplyHistoryBest):
     """
     Apply the history best config, or sample a valid schedule if no config is found.
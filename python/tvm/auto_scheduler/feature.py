@@ -27,12 +27,16 @@ The feature specification is defined by `src/auto_scheduler/feature.cc::FeatureS
 """
 
 from typing import List, Tuple, Union, Optional
+import hashlib
+import os
 import struct
+import threading
 
 import numpy as np
 
 from .loop_state import State, StateObject
 from .measure import MeasureInput, MeasureResult
+from .workload_registry import workload_key_to_tensors
 from . import _ffi_api
 
 # The maximum number of extracted buffers for one statement
@@ -209,6 +213,222 @@ def get_per_store_features_from_measure_pairs(
     return unpack_feature(byte_arr)
 
 
+class FeatureCache(object):
+    """An on-disk cache of the per-store features of measured states.
+
+    The features of a state are keyed on its workload key and the hash of the serialized
+    measure input, which holds the target and the transform steps of the state. Every
+    workload has its own append-only shard file in the cache directory, holding records of
+    the format ``{char digest[20]; int32 n_stmts; int32 vec_len; float32 features[]}``.
+    Appends are single writes, so several tuning processes can share a directory.
+
+    Parameters
+    ----------
+    cache_dir: str
+        The directory of the cache. It is created if it does not exist.
+    max_n_bufs: Optional[int]
+        The maximum number of extracted buffers for one statement
+    """
+
+    HEADER_SIZE = 20 + 2 * SIZE_OF_INT32
+
+    def __init__(self, cache_dir: str, max_n_bufs: Optional[int] = None):
+        self.cache_dir = os.path.abspath(os.path.expanduser(str(cache_dir)))
+        self.max_n_bufs = max_n_bufs or DEFAULT_MAX_N_BUFS
+        os.makedirs(self.cache_dir, exist_ok=True)
+        # shard filename -> (scanned size, {digest: (offset, n_stmts, vec_len)})
+        self._index = {}
+        self._lock = threading.Lock()
+        self.num_hits = 0
+        self.num_misses = 0
+
+    def key(self, inp: MeasureInput) -> Tuple[str, bytes]:
+        """Compute the shard filename and the digest of a measure input.
+
+        Parameters
+        ----------
+        inp: MeasureInput
+            The measure input
+
+        Returns
+        -------
+        shard: str
+            The shard file holding the features of the workload of the input
+        digest: bytes
+            The digest of the serialized input
+        """
+        workload_key = inp.task.workload_key
+        shard = hashlib.sha1(("%s/%d" % (workload_key, self.max_n_bufs)).encode()).hexdigest()
+        digest = hashlib.sha1(_ffi_api.SerializeMeasureInput(inp).encode()).digest()
+        return os.path.join(self.cache_dir, shard + ".feat"), digest
+
+    def _scan(self, shard):
+        """Index the records appended to a shard since the last scan."""
+        size, entries = self._index.get(shard, (0, {}))
+        try:
+            with open(shard, "rb") as fin:
+                file_size = os.fstat(fin.fileno()).st_size
+                fin.seek(size)
+                while size + self.HEADER_SIZE <= file_size:
+                    header = fin.read(self.HEADER_SIZE)
+                    n_stmts, vec_len = struct.unpack_from("2i", header, offset=20)
+                    offset = size + self.HEADER_SIZE
+                    nbytes = n_stmts * vec_len * SIZE_OF_FLOAT32
+                    # stop at a record which is still being written
+                    if n_stmts < 0 or vec_len < 0 or offset + nbytes > file_size:
+                        break
+                    fin.seek(nbytes, os.SEEK_CUR)
+                    entries[header[:20]] = (offset, n_stmts, vec_len)
+                    size = offset + nbytes
+        except OSError:
+            pass
+        self._index[shard] = (size, entries)
+        return entries
+
+    def get(self, inp: MeasureInput) -> Optional[np.ndarray]:
+        """Look up the features of a measure input.
+
+        Parameters
+        ----------
+        inp: MeasureInput
+            The measure input
+
+        Returns
+        -------
+        features: Optional[np.ndarray]
+            The features of shape (n_stmts, vec_len), or None on a miss
+        """
+        shard, digest = self.key(inp)
+        with self._lock:
+            entries = self._index[shard][1] if shard in self._index else self._scan(shard)
+            if digest not in entries:
+                entries = self._scan(shard)
+            if digest not in entries:
+                return None
+        offset, n_stmts, vec_len = entries[digest]
+        features = np.fromfile(shard, dtype=np.float32, count=n_stmts * vec_len, offset=offset)
+        return features.reshape((n_stmts, vec_len))
+
+    def put(self, inp: MeasureInput, features: np.ndarray):
+        """Insert the features of a measure input.
+
+        Parameters
+        ----------
+        inp: MeasureInput
+            The measure input
+        features: np.ndarray
+            The features of shape (n_stmts, vec_len)
+        """
+        shard, digest = self.key(inp)
+        features = np.ascontiguousarray(features, dtype=np.float32)
+        record = digest + struct.pack("2i", *features.shape) + features.tobytes()
+        with self._lock:
+            with open(shard, "ab") as fout:
+                fout.write(record)
+
+    def get_per_store_features_from_measure_pairs(
+        self,
+        inputs: List[MeasureInput],
+        results: List[MeasureResult],
+        skip_first_n_feature_extraction: int = 0,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Get per-store features from measurement input/result pairs through the cache.
+        Only the features of the states missing in the cache are extracted. The pairs
+        whose task can not be rebuilt are dropped, see :any:`filter_extractable_pairs`.
+
+        Parameters
+        ----------
+        inputs: List[MeasureInput]
+            The measure inputs
+        results: List[MeasureResult]
+            The measure results
+        skip_first_n_feature_extraction: int
+            Skip feature extraction for the first n states
+
+        Returns
+        -------
+        features: np.ndarray
+            Feature vectors
+        normalized_throughputs: np.ndarray
+            Normalized throughputs
+        task_ids: np.ndarray
+            Task ids
+        """
+        # the extraction skips the pairs whose task can not be rebuilt, so drop them here
+        # to keep the rows cached and looked up by position aligned with the inputs
+        inputs, results = filter_extractable_pairs(inputs, results)
+        if not inputs:
+            return np.array([], dtype=object), np.array([]), np.array([], dtype=np.int32)
+        # the throughputs are normalized over all pairs, so compute them without extraction
+        features, normalized_throughputs, task_ids = get_per_store_features_from_measure_pairs(
+            inputs, results, len(inputs), self.max_n_bufs
+        )
+        features = list(features)
+        missing = []
+        for i in range(skip_first_n_feature_extraction, len(inputs)):
+            cached = self.get(inputs[i])
+            if cached is None:
+                missing.append(i)
+            else:
+                features[i] = cached
+        self.num_hits += len(inputs) - skip_first_n_feature_extraction - len(missing)
+        self.num_misses += len(missing)
+
+        if missing:
+            extracted = get_per_store_features_from_measure_pairs(
+                [inputs[i] for i in missing],
+                [results[i] for i in missing],
+                max_n_bufs=self.max_n_bufs,
+            )[0]
+            assert len(extracted) == len(missing)
+            for i, feature in zip(missing, extracted):
+                self.put(inputs[i], feature)
+                features[i] = feature
+        assert len(features) == len(normalized_throughputs) == len(task_ids) == len(inputs)
+        return np.array(features, dtype=object), normalized_throughputs, task_ids
+
+
+def filter_extractable_pairs(
+    inputs: List[MeasureInput], results: List[MeasureResult]
+) -> Tuple[List[MeasureInput], List[MeasureResult]]:
+    """Drop the measurement pairs whose task can not be rebuilt for feature extraction.
+
+    The tasks of inputs read from log files have no compute DAG, so the extraction
+    rebuilds them from the workload registry, and skips the pairs of workloads not
+    registered in this process. Filtering the pairs first keeps any other data of the
+    pairs aligned with the extracted features.
+
+    Parameters
+    ----------
+    inputs: List[MeasureInput]
+        The measure inputs
+    results: List[MeasureResult]
+        The measure results
+
+    Returns
+    -------
+    inputs: List[MeasureInput]
+        The measure inputs whose features can be extracted
+    results: List[MeasureResult]
+        The measure results of these inputs
+    """
+    extractable = {}  # (workload key, target) -> bool
+    kept_inputs, kept_results = [], []
+    for inp, res in zip(inputs, results):
+        key = (inp.task.workload_key, str(inp.task.target))
+        if key not in extractable:
+            extractable[key] = True
+            if inp.task.compute_dag is None:
+                try:
+                    workload_key_to_tensors(inp.task.workload_key)
+                except Exception:  # pylint: disable=broad-except
+                    extractable[key] = False
+        if extractable[key]:
+            kept_inputs.append(inp)
+            kept_results.append(res)
+    return kept_inputs, kept_results
+
+
 def get_per_store_features_from_states(
     states: List[Union[State, StateObject]], task: "SearchTask", max_n_bufs: Optional[int] = None
 ) -> np.ndarray:
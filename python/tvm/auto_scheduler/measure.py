@@ -31,6 +31,7 @@ get the measurement results. The flow of data structures is
 We implement these in python to utilize python's multiprocessing and error handling.
 """
 
+import atexit
 import os
 import time
 import shutil
@@ -39,10 +40,11 @@ import multiprocessing
 import logging
 
 import tvm._ffi
+from tvm import rpc
 from tvm.runtime import Object, module, ndarray
 from tvm.driver import build_module
 from tvm.ir import transform
-from tvm.autotvm.measure.measure_methods import set_cuda_target_arch
+from tvm.autotvm.measure.measure_methods import run_until_confident, set_cuda_target_arch
 from tvm.autotvm.env import AutotvmGlobalScope, reset_global_scope
 from tvm.contrib import tar, ndk
 from tvm.contrib.popen_pool import PopenWorker, PopenPoolExecutor, StatusKind
@@ -193,13 +195,17 @@ class MeasureResult(Object):
         The time cost of build and run.
     timestamp : float
         The time stamps of this measurement.
+    rel_ci : float = -1
+        The half width of the 95% confidence interval of the mean cost, relative to the mean.
+        Negative if the runner did not repeat the measurement to a confidence target.
+        It is not stored in log files.
     """
 
-    def __init__(self, costs, error_no, error_msg, all_cost, timestamp):
+    def __init__(self, costs, error_no, error_msg, all_cost, timestamp, rel_ci=-1):
         error_msg = error_msg if error_msg else ""
 
         self.__init_handle_by_constructor__(
-            _ffi_api.MeasureResult, costs, error_no, error_msg, all_cost, timestamp
+            _ffi_api.MeasureResult, costs, error_no, error_msg, all_cost, timestamp, rel_ci
         )
 
 
@@ -383,6 +389,19 @@ class LocalRunner(ProgramRunner):
         its actual latency during end-to-end inference.
         To make this option effective, the argument `number` should also be set to 1.
         This is only has effect on CPU task.
+    probe_ratio : float = 0
+        If positive, run each program once first, and stop measuring it when this probe is
+        slower than `probe_ratio` times the best cost measured for its workload so far.
+        Such programs get the error number `MeasureErrorNo.EARLY_TERMINATED` and the cost
+        of the probe. This saves device time on search spaces with many slow programs.
+    max_rel_ci : float = 0
+        If positive, keep repeating the measurement (`repeat` costs at a time) until the half
+        width of the 95% confidence interval of the mean cost is at most this fraction of the
+        mean, or until `ci_time_budget` runs out. The achieved value is stored in
+        `MeasureResult.rel_ci`.
+    ci_time_budget : float = 1.0
+        The maximum time in seconds spent repeating a measurement for `max_rel_ci`.
+        It should be well below `timeout`.
     """
 
     def __init__(
@@ -393,6 +412,9 @@ class LocalRunner(ProgramRunner):
         min_repeat_ms=100,
         cooldown_interval=0.0,
         enable_cpu_cache_flush=False,
+        probe_ratio=0,
+        max_rel_ci=0,
+        ci_time_budget=1.0,
     ):
         if enable_cpu_cache_flush:
             number = 1
@@ -406,6 +428,9 @@ class LocalRunner(ProgramRunner):
             min_repeat_ms,
             cooldown_interval,
             enable_cpu_cache_flush,
+            probe_ratio,
+            max_rel_ci,
+            ci_time_budget,
         )
 
 
@@ -454,6 +479,12 @@ class RPCRunner(ProgramRunner):
         its actual latency during end-to-end inference.
         To make this option effective, the argument `number` should also be set to 1.
         This is only has effect on CPU task.
+    session_lifetime : float = 0
+        If positive, the measurement workers lease RPC sessions from a `tvm.rpc.SessionPool`
+        and reuse them across measurements and batches, instead of requesting a new session
+        from the tracker for every measurement. The sessions are requested with this duration
+        in seconds instead of `timeout`, so a hung program holds the device for up to
+        this long.
     """
 
     def __init__(
@@ -469,6 +500,7 @@ class RPCRunner(ProgramRunner):
         min_repeat_ms=100,
         cooldown_interval=0.0,
         enable_cpu_cache_flush=False,
+        session_lifetime=0,
     ):
         self.__init_handle_by_constructor__(
             _ffi_api.RPCRunner,
@@ -483,6 +515,7 @@ class RPCRunner(ProgramRunner):
             min_repeat_ms,
             cooldown_interval,
             enable_cpu_cache_flush,
+            session_lifetime,
         )
 
         if check_remote(key, host, port, priority, timeout):
@@ -599,6 +632,7 @@ class MeasureErrorNo(object):
     BUILD_TIMEOUT = 6  # Timeout during compilation
     RUN_TIMEOUT = 7  # Timeout during run
     UNKNOWN_ERROR = 8  # Unknown error
+    EARLY_TERMINATED = 9  # The run is stopped after a probe, as the program is too slow
 
 
 def _local_build_worker(inp_serialized, build_func, verbose):
@@ -665,6 +699,59 @@ def local_build_worker(args):
     return _local_build_worker(inp, build_func, verbose)
 
 
+# The modules imported by the build workers ahead of their first build
+BUILD_WORKER_PRELOAD_MODULES = ("tvm.auto_scheduler", "tvm.topi", "tvm.driver.build_module")
+
+# The build executor, reused across calls of local_builder_build with the same arguments
+_BUILD_EXECUTOR = {"key": None, "executor": None}
+
+
+def _shutdown_executor(cached):
+    """Shut down an executor kept across calls, killing its worker processes."""
+    if cached["executor"] is not None:
+        cached["executor"].shutdown()
+    cached["executor"] = None
+    cached["key"] = None
+
+
+atexit.register(_shutdown_executor, _BUILD_EXECUTOR)
+
+
+def _get_build_executor(timeout, n_parallel):
+    """Get a warm executor for local_builder_build.
+
+    The workers stay alive between batches, and a worker killed by a timeout is
+    replaced by a spare started in the background, so builds do not wait for
+    processes to import tvm.
+    """
+    key = (timeout, n_parallel, AutotvmGlobalScope.current)
+    if _BUILD_EXECUTOR["key"] != key:
+        _shutdown_executor(_BUILD_EXECUTOR)
+        _BUILD_EXECUTOR["executor"] = PopenPoolExecutor(
+            n_parallel,
+            timeout,
+            reset_global_scope,
+            (AutotvmGlobalScope.current,),
+            warm=True,
+            preload_modules=BUILD_WORKER_PRELOAD_MODULES,
+        )
+        _BUILD_EXECUTOR["key"] = key
+    return _BUILD_EXECUTOR["executor"]
+
+
+def get_build_executor_stats():
+    """Get the worker statistics of the executor of local_builder_build.
+
+    Returns
+    -------
+    stats : Dict[str, Union[int, float]]
+        See `PopenPoolExecutor.stats`, or an empty dict if nothing has been built.
+    """
+    if _BUILD_EXECUTOR["executor"] is None:
+        return {}
+    return _BUILD_EXECUTOR["executor"].stats()
+
+
 @tvm._ffi.register_func("auto_scheduler.local_builder.build")
 def local_builder_build(inputs, timeout, n_parallel, build_func="default", verbose=1):
     """
@@ -692,9 +779,7 @@ def local_builder_build(inputs, timeout, n_parallel, build_func="default", verbo
     assert build_func == BuildFunc.name, (
         "BuildFunc.name: " + BuildFunc.name + ", but args is: " + build_func
     )
-    executor = PopenPoolExecutor(
-        n_parallel, timeout, reset_global_scope, (AutotvmGlobalScope.current,)
-    )
+    executor = _get_build_executor(timeout, n_parallel)
     tuple_res = executor.map_with_error_catching(
         local_build_worker,
         [
@@ -876,11 +961,15 @@ def _timed_eval_func(
     cooldown_interval,
     enable_cpu_cache_flush,
     verbose,
+    probe_limit=None,
+    max_rel_ci=0,
+    ci_time_budget=1.0,
 ):
     inp = MeasureInput.deserialize(inp_serialized)
     tic = time.time()
     error_no = 0
     error_msg = None
+    rel_ci = -1
     try:
         func = module.load_module(build_res.filename)
         dev = ndarray.device(str(inp.task.target), 0)
@@ -921,7 +1010,22 @@ def _timed_eval_func(
                 else:
                     args[idx] = ndarray.array(args[idx], dev)
             dev.sync()
-            costs = time_f(*args).results
+            if probe_limit is not None:
+                probe_f = func.time_evaluator(
+                    func.entry_name, dev, number=1, repeat=1, f_preproc=f_prepare
+                )
+                probe_cost = probe_f(*args).mean
+                if probe_cost > probe_limit:
+                    costs = (probe_cost,)
+                    error_no = MeasureErrorNo.EARLY_TERMINATED
+                    error_msg = "The probe took %.3g s, over the limit of %.3g s" % (
+                        probe_cost,
+                        probe_limit,
+                    )
+            if error_no == 0 and max_rel_ci > 0:
+                costs, rel_ci = run_until_confident(time_f, args, max_rel_ci, ci_time_budget)
+            elif error_no == 0:
+                costs = time_f(*args).results
         # pylint: disable=broad-except
         except Exception:
             costs = (MAX_FLOAT,)
@@ -935,9 +1039,15 @@ def _timed_eval_func(
     if verbose >= 1:
         if error_no == MeasureErrorNo.NO_ERROR:
             print("*", end="", flush=True)
+        elif error_no == MeasureErrorNo.EARLY_TERMINATED:
+            print("*S", end="", flush=True)  # Slow, stopped after the probe
         else:
             print("*E", end="", flush=True)  # Run error
-    return costs, error_no, error_msg, toc - tic + build_res.time_cost, toc
+    return costs, error_no, error_msg, toc - tic + build_res.time_cost, toc, rel_ci
+
+
+# The best costs measured by local_run, keyed on workload key and target
+_BEST_RUN_COSTS = {}
 
 
 @tvm._ffi.register_func("auto_scheduler.local_runner.run")
@@ -951,6 +1061,9 @@ def local_run(
     cooldown_interval=0,
     enable_cpu_cache_flush=False,
     verbose=1,
+    probe_ratio=0,
+    max_rel_ci=0,
+    ci_time_budget=1.0,
 ):
     """
     Run function of LocalRunner to test the performance of the input BuildResults.
@@ -990,6 +1103,14 @@ def local_run(
         This is only has effect on CPU task.
     verbose: int = 1
         Verbosity level. 0 for silent, 1 to output information during program measuring.
+    probe_ratio : float = 0
+        If positive, run each program once first, and stop measuring it when this probe is
+        slower than `probe_ratio` times the best cost measured for its workload so far.
+    max_rel_ci : float = 0
+        If positive, repeat the measurement until the relative 95% confidence interval of
+        the mean cost is at most this value, or until `ci_time_budget` runs out.
+    ci_time_budget : float = 1.0
+        The maximum time in seconds spent repeating a measurement for `max_rel_ci`.
 
     Returns
     -------
@@ -1011,6 +1132,10 @@ def local_run(
             )
         else:
             args = prepare_runner_args(inp, build_res)
+            best_key = (inp.task.workload_key, str(inp.task.target))
+            probe_limit = None
+            if probe_ratio > 0 and best_key in _BEST_RUN_COSTS:
+                probe_limit = probe_ratio * _BEST_RUN_COSTS[best_key]
             res = call_func_with_timeout(
                 worker,
                 timeout,
@@ -1025,6 +1150,9 @@ def local_run(
                     cooldown_interval,
                     enable_cpu_cache_flush,
                     verbose,
+                    probe_limit,
+                    max_rel_ci,
+                    ci_time_budget,
                 ),
             )
             if isinstance(res, TimeoutError):
@@ -1047,6 +1175,9 @@ def local_run(
                     build_res.time_cost + timeout,
                     time.time(),
                 )
+            elif res[1] == MeasureErrorNo.NO_ERROR:
+                cost = sum(res[0]) / len(res[0])
+                _BEST_RUN_COSTS[best_key] = min(_BEST_RUN_COSTS.get(best_key, cost), cost)
 
         measure_results.append(MeasureResult(*res))
 
@@ -1071,14 +1202,20 @@ def _rpc_run(
     cooldown_interval,
     enable_cpu_cache_flush,
     verbose,
+    session_lifetime=0,
 ):
     inp = MeasureInput.deserialize(inp_serialized)
     tic = time.time()
     error_no = 0
     error_msg = None
+    pool = rpc.get_session_pool(host, port) if session_lifetime > 0 else None
+    remote = None
     try:
         # upload built module
-        remote = request_remote(key, host, port, priority, timeout)
+        if pool is not None:
+            remote = pool.request(key, priority, session_timeout=session_lifetime)
+        else:
+            remote = request_remote(key, host, port, priority, timeout)
         remote.upload(build_res.filename)
         func = remote.load_module(os.path.split(build_res.filename)[1])
         dev = remote.device(str(inp.task.target), 0)
@@ -1134,7 +1271,9 @@ def _rpc_run(
             # clean up remote files
             remote.remove(build_res.filename)
             remote.remove(os.path.splitext(build_res.filename)[0] + ".so")
-            remote.remove("")
+            if pool is None:
+                # the working directory of a reused session is still needed
+                remote.remove("")
             dev.free_raw_stream(stream)
         # pylint: disable=broad-except
         except Exception:
@@ -1144,6 +1283,9 @@ def _rpc_run(
             error_msg = make_traceback_info()
 
     shutil.rmtree(os.path.dirname(build_res.filename))
+    if pool is not None and remote is not None:
+        # a session may be broken after an error
+        pool.release(remote, reuse=error_no == MeasureErrorNo.NO_ERROR)
     toc = time.time()
 
     time.sleep(cooldown_interval)
@@ -1156,6 +1298,22 @@ def _rpc_run(
     return costs, error_no, error_msg, toc - tic + build_res.time_cost, toc
 
 
+# The executor of rpc_runner_run with reused sessions, kept across calls
+_RPC_RUN_EXECUTOR = {"key": None, "executor": None}
+
+
+atexit.register(_shutdown_executor, _RPC_RUN_EXECUTOR)
+
+
+def _get_rpc_run_executor(n_parallel):
+    """Get the executor of rpc_runner_run whose workers keep their pooled sessions."""
+    if _RPC_RUN_EXECUTOR["key"] != n_parallel:
+        _shutdown_executor(_RPC_RUN_EXECUTOR)
+        _RPC_RUN_EXECUTOR["executor"] = PopenPoolExecutor(n_parallel)
+        _RPC_RUN_EXECUTOR["key"] = n_parallel
+    return _RPC_RUN_EXECUTOR["executor"]
+
+
 def _rpc_run_worker(args):
     """Function to be ran in the RPCRunner thread pool.
 
@@ -1169,7 +1327,7 @@ def _rpc_run_worker(args):
     res : MeasureResult
         The measure result of this Runner thread.
     """
-    _, build_res, _, _, _, _, _, timeout, _, _, _, _, _, verbose = args
+    _, build_res, _, _, _, _, _, timeout, _, _, _, _, _, verbose, _ = args
     if build_res.error_no != MeasureErrorNo.NO_ERROR:
         return (
             (MAX_FLOAT,),
@@ -1212,6 +1370,7 @@ def rpc_runner_run(
     cooldown_interval=0.0,
     enable_cpu_cache_flush=False,
     verbose=1,
+    session_lifetime=0,
 ):
     """Run function of RPCRunner to test the performance of the input BuildResults.
 
@@ -1260,6 +1419,9 @@ def rpc_runner_run(
         This is only has effect on CPU task.
     verbose: int = 1
         Verbosity level. 0 for silent, 1 to output information during program measuring.
+    session_lifetime : float = 0
+        If positive, reuse RPC sessions across measurements and calls, and request them
+        with this duration in seconds.
 
     Returns
     -------
@@ -1268,7 +1430,11 @@ def rpc_runner_run(
     """
     assert len(inputs) == len(build_results), "Measure input size should be equal to build results"
     # This pool is not doing computationally intensive work, so we can use threads
-    executor = PopenPoolExecutor(n_parallel)
+    if session_lifetime > 0:
+        # the sessions live in the workers, so keep them across calls
+        executor = _get_rpc_run_executor(n_parallel)
+    else:
+        executor = PopenPoolExecutor(n_parallel)
     tuple_res = executor.map_with_error_catching(
         _rpc_run_worker,
         [
@@ -1287,6 +1453,7 @@ def rpc_runner_run(
                 cooldown_interval,
                 enable_cpu_cache_flush,
                 verbose,
+                session_lifetime,
             )
             for inp, build_res in zip(inputs, build_results)
         ],
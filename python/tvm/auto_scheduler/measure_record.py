@@ -18,7 +18,9 @@
 
 """ Serialization and other I/O support for measurement records (tuning logs). """
 import argparse
+import json
 import logging
+import mmap
 import os
 import itertools
 
@@ -26,6 +28,7 @@ import numpy as np
 
 import tvm._ffi
 from tvm.runtime import Object
+from tvm.contrib import record_index
 from .measure import MeasureErrorNo, MeasureCallback
 from .utils import calc_workload_dis_factor, decode_workload_key
 from . import _ffi_api
@@ -272,6 +275,86 @@ def load_best_record(filename, workload_key=None, target=None, include_compatibl
     return best_inp, best_res
 
 
+def load_best_index(filename, use_cache=True):
+    """Get the best record index of a log file without decoding its records.
+
+    The index maps (target key, workload key) and (target model, workload key) to the
+    byte offset and mean cost of the best valid record. It is computed from the raw json
+    lines, so no MeasureInput or MeasureResult is created. With `use_cache`, the index
+    is kept in a `<filename>.bestidx` file next to the log, and only the lines appended
+    since it was written are scanned.
+
+    Parameters
+    ----------
+    filename : str
+        The log file.
+    use_cache : bool = True
+        Whether to reuse and update the index file.
+
+    Returns
+    -------
+    index : Dict[str, Dict[Tuple[str, str], Tuple[int, float]]]
+        A dict with keys "targetkey" and "model", each mapping (key, workload key)
+        to (offset, cost).
+    """
+
+    def parse_line(line):
+        row = json.loads(line)
+        costs, error_no = row["r"][0], row["r"][1]
+        if error_no != MeasureErrorNo.NO_ERROR:
+            return None
+        return float(np.mean(costs)), row["i"][0][1], row["i"][0][0]
+
+    return record_index.load_best_index(filename, parse_line, use_cache)
+
+
+class MappedRecordFile(object):
+    """A log file mapped in memory, to decode the records at given byte offsets.
+
+    Parameters
+    ----------
+    filename : str
+        The log file.
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+        self._mmap = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, ptype, value, trace):
+        self.close()
+
+    def read_at(self, offset):
+        """Decode the record on the line that starts at a byte offset.
+
+        Parameters
+        ----------
+        offset : int
+            The byte offset of the line, e.g. from :any:`load_best_index`.
+
+        Returns
+        -------
+        ret: Tuple[MeasureInput, MeasureResult]
+            A tuple of MeasureInput, MeasureResult.
+        """
+        if self._mmap is None:
+            # mapped on first use, and again after close
+            with open(self.filename, "rb") as fin:
+                self._mmap = mmap.mmap(fin.fileno(), 0, access=mmap.ACCESS_READ)
+        end = self._mmap.find(b"\n", offset)
+        line = self._mmap[offset : end if end != -1 else len(self._mmap)]
+        return load_record_from_string(line.decode())
+
+    def close(self):
+        """Unmap the file."""
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+
 def distill_record_file(in_file, out_file):
     """
     Pick the best entries from a record file and store them to another file.
@@ -344,7 +427,7 @@ def distill_record_file(in_file, out_file):
 def main():
     """The main function for CLI."""
     parser = argparse.ArgumentParser()
-    parser.add_argument("--mode", choices=["distill"], default="distill")
+    parser.add_argument("--mode", choices=["distill", "index"], default="distill")
     parser.add_argument("-i", "--input", type=str, help="input file")
     parser.add_argument("-o", "--output", type=str, default=None, help="output file")
 
@@ -355,12 +438,22 @@ def main():
     if args.mode == "distill":
         args.output = args.output or args.input + ".best.json"
         distill_record_file(args.input, args.output)
+    elif args.mode == "index":
+        index = load_best_index(args.input)
+        logger.info(
+            "Index %d best records of %s to %s",
+            len(index["targetkey"]) + len(index["model"]),
+            args.input,
+            args.input + ".bestidx",
+        )
 
 
 """
 Usage:
 * Distill the best entries from a large log file
 e.g. python -m tvm.auto_scheduler.measure_record --mode distill -i input.json
+* Build the best record index of a log file, used by LazyApplyHistoryBest
+e.g. python -m tvm.auto_scheduler.measure_record --mode index -i input.json
 """
 if __name__ == "__main__":
     main()
@@ -129,6 +129,21 @@ class SearchPolicy(Object):
         """
         return _ffi_api.SearchPolicySetVerbose(self, verbose)
 
+    def preload_measured_states(self, inputs, results):
+        """
+        Preload measured states from measurement records to resume the state of the policy.
+        This is the in-memory version of the `PreloadMeasuredStates` callback. The records of
+        other tasks are skipped.
+
+        Parameters
+        ----------
+        inputs: List[MeasureInput]
+            The measurement inputs
+        results: List[MeasureResult]
+            The measurement results
+        """
+        _ffi_api.SearchPolicyPreloadMeasuredStates(self, inputs, results)
+
 
 @tvm._ffi.register_object("auto_scheduler.EmptyPolicy")
 class EmptyPolicy(SearchPolicy):
@@ -22,22 +22,31 @@ The details of the "gradient" strategy below can be found in the section 6 of th
 L. Zheng, C. Jia, M. Sun, Z. Wu, C. Yu, et al. "Ansor : Generating High-Performance Tensor
 Programs for Deep Learning." (OSDI 2020).
 """
+import io
 import os
+import json
 import time
 import math
+import queue
 import logging
+import tempfile
+import threading
+import concurrent.futures
 
 import numpy as np
 
 from .search_policy import SearchPolicy, SketchPolicy, PreloadMeasuredStates
 from .cost_model import RandomModel, XGBModel
 from .utils import array_mean
-from .measure import ProgramMeasurer
-from .measure_record import RecordReader
+from .measure import ProgramMeasurer, PythonBasedMeasureCallback
+from .measure_record import RecordReader, dump_record_to_string, load_record_from_string
 from . import _ffi_api
 
 logger = logging.getLogger("auto_scheduler")
 
+# The version of the checkpoint format of TaskScheduler
+CHECKPOINT_VERSION = 2
+
 
 def make_search_policies(
     search_policy,
@@ -48,6 +57,7 @@ def make_search_policies(
     load_model_file=None,
     load_log_file=None,
     adapative_training=False,
+    pretrained_model_file=None,
 ):
     """Make a list of search policies for a list of search tasks.
     It creates one policy per task.
@@ -74,12 +84,43 @@ def make_search_policies(
     adapative_training: bool = False
         Option used by XGBModel to reduce the model training frequency when there're too
         many logs.
+    pretrained_model_file: Optional[str]
+        Warm-start the cost model from a model pretrained on other tasks, e.g. by
+        `auto_scheduler.cost_model.pretrain_xgb_model`. Unlike `load_model_file`, the file is
+        never overwritten and the model keeps being refined with the new measurements.
 
     Returns
     -------
     policies: List[SearchPolicy]
         The list of search policies
     """
+    return _make_search_policies(
+        search_policy,
+        search_policy_params,
+        tasks,
+        num_measures_per_round,
+        verbose,
+        load_model_file,
+        load_log_file,
+        adapative_training,
+        pretrained_model_file,
+    )[0]
+
+
+def _make_search_policies(
+    search_policy,
+    search_policy_params,
+    tasks,
+    num_measures_per_round,
+    verbose,
+    load_model_file=None,
+    load_log_file=None,
+    adapative_training=False,
+    pretrained_model_file=None,
+):
+    """Make a list of search policies, and return it together with their shared cost model,
+    which is None if the policies are given by the user."""
+    cost_model = None
     if search_policy == "default":
         search_policy = "sketch.xgb"
 
@@ -90,6 +131,7 @@ def make_search_policies(
                 num_warmup_sample=len(tasks) * num_measures_per_round,
                 model_file=load_model_file,
                 adapative_training=adapative_training,
+                base_model_file=pretrained_model_file,
             )
             if load_model_file and os.path.isfile(load_model_file):
                 logger.info("TaskScheduler: Load pretrained model...")
@@ -127,7 +169,7 @@ def make_search_policies(
             assert isinstance(item, SearchPolicy)
         search_policies = search_policy
 
-    return search_policies
+    return search_policies, cost_model
 
 
 def derive_similarity_tag(dag, log_base=1.618):
@@ -160,6 +202,26 @@ def derive_similarity_tag(dag, log_base=1.618):
     return ret
 
 
+class _SerializedMeasureCallbacks(PythonBasedMeasureCallback):
+    """Run measure callbacks one call at a time, for measurers running in several threads.
+
+    Parameters
+    ----------
+    callbacks : List[MeasureCallback]
+        The callbacks, called in order.
+    """
+
+    def __init__(self, callbacks):
+        super(_SerializedMeasureCallbacks, self).__init__()
+        self.callbacks = list(callbacks)
+        self._lock = threading.Lock()
+
+    def callback(self, policy, inputs, results):
+        with self._lock:
+            for callback in self.callbacks:
+                _ffi_api.MeasureCallbackCallback(callback, policy, inputs, results)
+
+
 class TaskScheduler:
     """
     Allocate the time resources when tuning multiple tasks together.
@@ -202,6 +264,18 @@ class TaskScheduler:
     callbacks: Optional[List[TaskSchedulerCallback]]
         The task scheduler callbacks that will be called before and after tuning a task.
         If None, PrintTableInfo and LogEstimatedLatency callback will be used.
+    pretrained_model_file: Optional[str]
+        Warm-start the cost model from a model pretrained on other tasks, e.g. by
+        `auto_scheduler.cost_model.pretrain_xgb_model`.
+    checkpoint_file: Optional[str]
+        Periodically save the search state of all tasks to this file: the status of the task
+        scheduler, the measurement records the search policies have seen, and the trained
+        cost model with its extracted features. The records and the features are appended
+        to the files `<checkpoint_file>.records` and `<checkpoint_file>.features`, so every
+        checkpoint only writes the new ones. If the file exists when tuning starts, the
+        state is restored from it instead of being rebuilt from `load_log_file`.
+    checkpoint_interval: int = 10
+        Save a checkpoint every n search rounds.
     """
 
     def __init__(
@@ -217,6 +291,9 @@ class TaskScheduler:
         gamma: float = 0.5,
         backward_window_size: int = 3,
         callbacks=None,
+        pretrained_model_file: str = None,
+        checkpoint_file: str = None,
+        checkpoint_interval: int = 10,
     ):
         self.tasks = tasks
         if objective_func:  # use custom objective function
@@ -230,6 +307,9 @@ class TaskScheduler:
         self.strategy = strategy
         self.load_log_file = load_log_file
         self.load_model_file = load_model_file
+        self.pretrained_model_file = pretrained_model_file
+        self.checkpoint_file = checkpoint_file
+        self.checkpoint_interval = checkpoint_interval
         self.alpha = alpha
         self.beta = beta
         self.gamma = gamma
@@ -256,11 +336,20 @@ class TaskScheduler:
         self.best_costs = 1e10 * np.ones(len(self.tasks))
         self.cur_score = self._compute_score(self.best_costs)
 
-        self.tune_option = self.measurer = self.search_policies = None
+        self.tune_option = self.measurer = self.search_policies = self.cost_model = None
         self.ct = self.best_ct = self.best_score = self.tic = None
         self.num_measures_per_round = None
         self.dead_tasks = set()
 
+        # the measurement records to checkpoint, and the sizes of the saved checkpoint
+        self.measured_inputs, self.measured_results = [], []
+        self.checkpoint_sizes = {
+            "n_records": 0,
+            "records_bytes": 0,
+            "n_features": 0,
+            "features_bytes": 0,
+        }
+
         # Build similarity groups
         self.task_tags = []  # task_id -> tag
         self.tag_to_group_id = {}  # tag -> group_id
@@ -285,6 +374,7 @@ class TaskScheduler:
         search_policy_params=None,
         adapative_training=False,
         per_task_early_stopping=None,
+        num_parallel_tasks=1,
     ):
         """Tune a batch of tasks together.
 
@@ -305,6 +395,12 @@ class TaskScheduler:
             too many logs.
         per_task_early_stopping : Optional[int]
             Stop tuning a task early if getting no improvement after n measurements.
+        num_parallel_tasks : int = 1
+            The number of tasks whose search rounds run concurrently. Each running round
+            leases one of `num_parallel_tasks` measurement slots, which share the builder
+            and runner of `tune_option`. Set it to the number of devices available to an
+            RPCRunner, so that all of them measure at the same time. Tasks are still chosen
+            with the scheduling strategy, among the tasks not being tuned.
         """
         # init members
         self.tune_option = tune_option
@@ -334,22 +430,39 @@ class TaskScheduler:
                 f"It should be at least {len(self.tasks)} for this model."
             )
 
-        # restore the status of the task scheduler from a log file
-        if self.load_log_file:
+        # restore the status of the task scheduler from a checkpoint or a log file
+        checkpoint = None
+        load_log_file = self.load_log_file
+        if self.checkpoint_file and os.path.isfile(self.checkpoint_file):
+            checkpoint = self._load_checkpoint(self.checkpoint_file)
+            load_log_file = None
+        elif self.load_log_file:
             self._restore_status(self.load_log_file, self.num_measures_per_round)
 
         # make one search policy for one task
-        self.search_policies = make_search_policies(
+        self.search_policies, self.cost_model = _make_search_policies(
             search_policy,
             search_policy_params,
             self.tasks,
             self.num_measures_per_round,
             tune_option.verbose,
             self.load_model_file,
-            self.load_log_file,
+            load_log_file,
             adapative_training,
+            self.pretrained_model_file,
         )
+        if checkpoint is not None:
+            self._restore_checkpoint(checkpoint)
+
+        if num_parallel_tasks > 1:
+            self._tune_concurrently(num_parallel_tasks)
+        else:
+            self._tune_sequentially()
+        if self.checkpoint_file:
+            self._save_checkpoint()
 
+    def _tune_sequentially(self):
+        """Tune tasks one search round after another"""
         # do a round robin first to warm up
         for idx in range(len(self.tasks)):
             # skip warming up this task if it has been tuned before (restored from the log file)
@@ -360,87 +473,186 @@ class TaskScheduler:
 
         # use the specific strategy to choose workload to tune
         task_idx = -1
-        while self.ct < tune_option.num_measure_trials and len(self.dead_tasks) < len(self.tasks):
-            if self.strategy == "round-robin":
-                task_idx = (task_idx + 1) % len(self.tasks)
-                while task_idx in self.dead_tasks:
-                    task_idx = (task_idx + 1) % len(self.tasks)
-            elif self.strategy == "gradient":
-                gradients = []
-                for i in range(len(self.tasks)):
-                    if i in self.dead_tasks:
-                        gradients.append(0)
-                        continue
+        while (
+            self.ct < self.tune_option.num_measure_trials
+            and len(self.dead_tasks) < len(self.tasks)
+        ):
+            task_idx = self._pick_task(task_idx)
+            self._tune_task(task_idx)
+            self._adjust_similarity_group(task_idx)
+            if self._check_early_stopping():
+                break
 
-                    # compute gradient from chain rule : (delta f / delta g_i)
-                    delta = 1e-4
-                    new_costs = list(self.best_costs)
-                    new_costs[i] -= delta
-                    chain_grad = (
-                        self._compute_score(self.best_costs) - self._compute_score(new_costs)
-                    ) / delta
-
-                    # compute (g_i(t_i) - g(t_i - \Delta t)) / (\Delta t)
-                    if (
-                        self.task_cts[i] - 1 < len(self.task_costs_history[i])
-                        and self.task_cts[i] - 1 - self.backward_window_size >= 0
-                    ):
-                        backward_grad = (
-                            self.task_costs_history[i][self.task_cts[i] - 1]
-                            - self.task_costs_history[i][
-                                self.task_cts[i] - 1 - self.backward_window_size
-                            ]
-                        ) / self.backward_window_size
+    def _tune_concurrently(self, num_parallel_tasks):
+        """Tune tasks with search rounds of several tasks running at the same time"""
+        # the slots share the callbacks, which run one at a time, e.g. to append to one log
+        callbacks = self.tune_option.measure_callbacks
+        if callbacks:
+            callbacks = [_SerializedMeasureCallbacks(callbacks)]
+        slots = queue.Queue()
+        for _ in range(num_parallel_tasks):
+            slots.put(
+                ProgramMeasurer(
+                    self.tune_option.builder,
+                    self.tune_option.runner,
+                    callbacks,
+                    self.tune_option.verbose,
+                )
+            )
+
+        def search_round(task_idx):
+            measurer = slots.get()
+            try:
+                return self.search_policies[task_idx].continue_search_one_round(
+                    self.num_measures_per_round, measurer
+                )
+            finally:
+                slots.put(measurer)
+
+        # do a round robin first to warm up, skipping the tasks restored from the log file
+        warmup = [idx for idx in range(len(self.tasks)) if not self.task_cts[idx]]
+        warming = set()
+        if not warmup:
+            self.best_ct = self.ct
+            self.best_score = self.cur_score
+        running = {}  # future -> task index
+        task_idx = -1
+        stop = False
+        with concurrent.futures.ThreadPoolExecutor(max_workers=num_parallel_tasks) as executor:
+            while True:
+                while not stop and len(running) < num_parallel_tasks:
+                    if warmup:
+                        idx = warmup.pop(0)
+                        warming.add(idx)
+                    elif warming:
+                        # the strategy needs every task to have been tuned once
+                        break
                     else:
-                        backward_grad = 0
-
-                    # compute (g_i(t_i + \Delta t) - g(t_i)) / (\Delta t)
-                    g_next_1 = self.best_costs[i] - (self.best_costs[i] / self.task_cts[i])
-
-                    g_next_2 = self.beta * 1e30
-                    group_id = self.tag_to_group_id.get(self.task_tags[i], None)
-                    if group_id is not None and len(self.group_task_ids[group_id]) > 1:
-                        best_flops = max(
-                            [
-                                self.flop_cts[j] / self.best_costs[j]
-                                for j in self.group_task_ids[group_id]
-                            ]
-                        )
-                        g_next_2 = self.beta * self.flop_cts[i] / best_flops
-
-                    g_next = min(g_next_1, g_next_2)
-                    forward_grad = g_next - self.best_costs[i]
-
-                    # combine all grads
-                    grad = chain_grad * (
-                        self.alpha * backward_grad + (1 - self.alpha) * forward_grad
-                    )
-                    assert grad <= 0
-                    gradients.append(grad)
-
-                if max(gradients) == min(gradients):
-                    task_idx = np.random.choice(len(gradients))
-                else:
-                    task_idx = np.argmin(gradients)
+                        num_running_trials = len(running) * self.num_measures_per_round
+                        if (
+                            self.ct + num_running_trials >= self.tune_option.num_measure_trials
+                            or len(self.dead_tasks) >= len(self.tasks)
+                        ):
+                            break
+                        idx = self._pick_task(task_idx, busy=running.values())
+                        if idx is None:
+                            break
+                        task_idx = idx
+
+                    for callback in self.callbacks:
+                        callback.pre_tune(self, idx)
+                    running[executor.submit(search_round, idx)] = idx
+
+                if not running:
+                    break
+                done, _ = concurrent.futures.wait(
+                    running, return_when=concurrent.futures.FIRST_COMPLETED
+                )
+                for future in done:
+                    idx = running.pop(future)
+                    measure_inputs, measure_results = future.result()
+                    self._update_task(idx, measure_inputs, measure_results)
+                    if idx in warming:
+                        warming.remove(idx)
+                        if not warmup and not warming:
+                            self.best_ct = self.ct
+                            self.best_score = self.cur_score
+                        continue
+                    self._adjust_similarity_group(idx)
+                    if self._check_early_stopping():
+                        stop = True
+
+    def _pick_task(self, last_task_idx, busy=()):
+        """Choose the next task to tune with the scheduling strategy.
+
+        Parameters
+        ----------
+        last_task_idx: int
+            The last task chosen, or -1.
+        busy: Iterable[int]
+            The tasks being tuned, which cannot be chosen.
+
+        Returns
+        -------
+        task_idx: Optional[int]
+            The task to tune, or None if every task is dead or busy.
+        """
+        busy = set(busy)
+        candidates = [
+            i for i in range(len(self.tasks)) if i not in self.dead_tasks and i not in busy
+        ]
+        if not candidates:
+            return None
+
+        if self.strategy == "round-robin":
+            task_idx = (last_task_idx + 1) % len(self.tasks)
+            while task_idx not in candidates:
+                task_idx = (task_idx + 1) % len(self.tasks)
+        elif self.strategy == "gradient":
+            gradients = [self._compute_gradient(i) for i in candidates]
+            if max(gradients) == min(gradients):
+                task_idx = candidates[np.random.choice(len(gradients))]
             else:
-                raise ValueError("Invalid strategy: " + self.strategy)
+                task_idx = candidates[np.argmin(gradients)]
+        else:
+            raise ValueError("Invalid strategy: " + self.strategy)
+        return task_idx
+
+    def _compute_gradient(self, i):
+        """Compute the gradient of the objective with respect to the tuning time of a task"""
+        # compute gradient from chain rule : (delta f / delta g_i)
+        delta = 1e-4
+        new_costs = list(self.best_costs)
+        new_costs[i] -= delta
+        chain_grad = (self._compute_score(self.best_costs) - self._compute_score(new_costs)) / delta
+
+        # compute (g_i(t_i) - g(t_i - \Delta t)) / (\Delta t)
+        if (
+            self.task_cts[i] - 1 < len(self.task_costs_history[i])
+            and self.task_cts[i] - 1 - self.backward_window_size >= 0
+        ):
+            backward_grad = (
+                self.task_costs_history[i][self.task_cts[i] - 1]
+                - self.task_costs_history[i][self.task_cts[i] - 1 - self.backward_window_size]
+            ) / self.backward_window_size
+        else:
+            backward_grad = 0
 
-            self._tune_task(task_idx)
-            self._adjust_similarity_group(task_idx)
+        # compute (g_i(t_i + \Delta t) - g(t_i)) / (\Delta t)
+        g_next_1 = self.best_costs[i] - (self.best_costs[i] / self.task_cts[i])
 
-            if self.cur_score < self.best_score:
-                self.best_score = self.cur_score
-                self.best_ct = self.ct
-            elif self.ct - self.best_ct >= self.early_stopping_all and all(
-                cost < 1e9 for cost in self.best_costs
-            ):
-                if self.tune_option.verbose >= 1:
-                    print(
-                        "Stop early since no performance improvement in the last "
-                        + str(self.early_stopping_all)
-                        + " measurement trials."
-                    )
-                break
+        g_next_2 = self.beta * 1e30
+        group_id = self.tag_to_group_id.get(self.task_tags[i], None)
+        if group_id is not None and len(self.group_task_ids[group_id]) > 1:
+            best_flops = max(
+                [self.flop_cts[j] / self.best_costs[j] for j in self.group_task_ids[group_id]]
+            )
+            g_next_2 = self.beta * self.flop_cts[i] / best_flops
+
+        g_next = min(g_next_1, g_next_2)
+        forward_grad = g_next - self.best_costs[i]
+
+        # combine all grads
+        grad = chain_grad * (self.alpha * backward_grad + (1 - self.alpha) * forward_grad)
+        assert grad <= 0
+        return grad
+
+    def _check_early_stopping(self):
+        """Update the best score, and check whether to stop tuning all tasks"""
+        if self.cur_score < self.best_score:
+            self.best_score = self.cur_score
+            self.best_ct = self.ct
+        elif self.ct - self.best_ct >= self.early_stopping_all and all(
+            cost < 1e9 for cost in self.best_costs
+        ):
+            if self.tune_option.verbose >= 1:
+                print(
+                    "Stop early since no performance improvement in the last "
+                    + str(self.early_stopping_all)
+                    + " measurement trials."
+                )
+            return True
+        return False
 
     def _tune_task(self, task_idx):
         """Tune the select task for one round"""
@@ -452,7 +664,10 @@ class TaskScheduler:
         measure_inputs, measure_results = self.search_policies[task_idx].continue_search_one_round(
             self.num_measures_per_round, self.measurer
         )
+        self._update_task(task_idx, measure_inputs, measure_results)
 
+    def _update_task(self, task_idx, measure_inputs, measure_results):
+        """Update the status with the results of a tuning round of a task"""
         self.task_cts[task_idx] += 1
 
         for res in measure_results:
@@ -474,6 +689,12 @@ class TaskScheduler:
         self.ct += len(measure_inputs)
         self.cur_score = self._compute_score(self.best_costs)
 
+        if self.checkpoint_file:
+            self.measured_inputs.extend(measure_inputs)
+            self.measured_results.extend(measure_results)
+            if sum(self.task_cts) % self.checkpoint_interval == 0:
+                self._save_checkpoint()
+
         # Run post-tune callbacks
         for callback in self.callbacks:
             callback.post_tune(self, task_idx)
@@ -540,6 +761,144 @@ class TaskScheduler:
 
         logger.info("TaskScheduler: Loaded %d measurement records from %s", total_ct + 1, log_file)
 
+    def _append_checkpoint_file(self, suffix, size, data):
+        """Append data to a file of the checkpoint, whose saved size is `size`, and return
+        the new size"""
+        with open(self.checkpoint_file + suffix, "ab") as fout:
+            # drop anything written after the saved checkpoint, e.g. before a crash
+            fout.truncate(size)
+            fout.write(data)
+        return size + len(data)
+
+    def _save_checkpoint(self):
+        """Save the search state of all tasks to the checkpoint file"""
+        sizes = dict(self.checkpoint_sizes)
+        model_state = None
+        # An XGBModel holds all records the search policies learned from, including the
+        # preloaded ones. Concurrent search rounds update it in other threads.
+        if isinstance(self.cost_model, XGBModel):
+            with self.cost_model.lock:
+                inputs = self.cost_model.inputs[sizes["n_records"] :]
+                results = self.cost_model.results[sizes["n_records"] :]
+                model_state = self.cost_model.get_checkpoint(sizes["n_features"])
+        else:
+            inputs = self.measured_inputs[sizes["n_records"] :]
+            results = self.measured_results[sizes["n_records"] :]
+
+        # records and features are only appended, so each of them is written once
+        records = "".join(dump_record_to_string(inp, res) for inp, res in zip(inputs, results))
+        sizes["records_bytes"] = self._append_checkpoint_file(
+            ".records", sizes["records_bytes"], records.encode()
+        )
+        sizes["n_records"] += len(inputs)
+        if model_state is not None:
+            feature_rows = model_state.pop("feature_rows")
+            features = model_state.pop("features")
+            buf = io.BytesIO()
+            if len(feature_rows):
+                np.save(buf, feature_rows)
+                np.save(buf, features)
+            sizes["features_bytes"] = self._append_checkpoint_file(
+                ".features", sizes["features_bytes"], buf.getvalue()
+            )
+            sizes["n_features"] += len(feature_rows)
+
+        meta = {
+            "version": CHECKPOINT_VERSION,
+            "workload_keys": [task.workload_key for task in self.tasks],
+            "task_cts": self.task_cts,
+            "task_best_cts": self.task_best_cts,
+            "task_costs_history": [[float(x) for x in h] for h in self.task_costs_history],
+            "best_costs": [float(x) for x in self.best_costs],
+            "dead_tasks": sorted(self.dead_tasks),
+            "task_tags": self.task_tags,
+            "group_task_ids": self.group_task_ids,
+            "checkpoint_sizes": sizes,
+        }
+        arrays = {"meta": np.frombuffer(json.dumps(meta).encode(), dtype=np.uint8)}
+        if model_state is not None:
+            for key, value in model_state.items():
+                arrays["model_" + key] = value
+
+        # write to a temporary file and rename it, so a crash never leaves a broken checkpoint
+        dirname = os.path.dirname(os.path.abspath(self.checkpoint_file))
+        fd, tmp = tempfile.mkstemp(dir=dirname, suffix=".tmp")
+        with os.fdopen(fd, "wb") as fout:
+            np.savez_compressed(fout, **arrays)
+        os.replace(tmp, self.checkpoint_file)
+        self.checkpoint_sizes = sizes
+
+    def _load_checkpoint(self, checkpoint_file):
+        """Restore the status of the task scheduler from a checkpoint file, and return the
+        arrays of the checkpoint"""
+        with np.load(checkpoint_file) as data:
+            arrays = {key: data[key] for key in data.files}
+        meta = json.loads(arrays["meta"].tobytes().decode())
+        if meta["version"] != CHECKPOINT_VERSION:
+            raise ValueError("Unsupported checkpoint version: %s" % meta["version"])
+        if meta["workload_keys"] != [task.workload_key for task in self.tasks]:
+            raise ValueError("The checkpoint %s is made for other tasks" % checkpoint_file)
+
+        self.task_cts = meta["task_cts"]
+        self.task_best_cts = meta["task_best_cts"]
+        self.task_costs_history = meta["task_costs_history"]
+        self.best_costs = np.array(meta["best_costs"])
+        self.dead_tasks = set(meta["dead_tasks"])
+        self.task_tags = meta["task_tags"]
+        self.group_task_ids = meta["group_task_ids"]
+        self.checkpoint_sizes = meta["checkpoint_sizes"]
+        self.cur_score = self._compute_score(self.best_costs)
+        return arrays
+
+    def _restore_checkpoint(self, arrays):
+        """Restore the search policies and the cost model from the arrays of a checkpoint"""
+        sizes = self.checkpoint_sizes
+        # the files may be longer than the saved checkpoint, e.g. after a crash
+        with open(self.checkpoint_file + ".records", "rb") as fin:
+            lines = fin.read(sizes["records_bytes"]).decode().splitlines()
+        inputs, results = [], []
+        for line in lines:
+            inp, res = load_record_from_string(line)
+            inputs.append(inp)
+            results.append(res)
+        assert len(inputs) == sizes["n_records"]
+
+        if isinstance(self.cost_model, XGBModel) and "model_raw" in arrays:
+            state = {key[6:]: value for key, value in arrays.items() if key.startswith("model_")}
+            feature_rows, features = [], []
+            if sizes["features_bytes"]:
+                with open(self.checkpoint_file + ".features", "rb") as fin:
+                    while fin.tell() < sizes["features_bytes"]:
+                        feature_rows.append(np.load(fin))
+                        features.append(np.load(fin))
+            state["feature_rows"] = np.concatenate(feature_rows or [np.zeros(0, np.int32)])
+            state["features"] = np.concatenate(features or [np.zeros((0, 0), np.float32)])
+            assert len(state["feature_rows"]) == sizes["n_features"]
+            self.cost_model.load_checkpoint(state, inputs, results)
+        elif isinstance(self.cost_model, XGBModel):
+            # the records of a session without an XGBModel are not part of the model yet,
+            # they are saved already but their features are not
+            self.cost_model.update(inputs, results)
+            self.checkpoint_sizes = dict(sizes, n_features=0, features_bytes=0)
+        else:
+            self.measured_inputs, self.measured_results = inputs, results
+
+        # preload every policy with the records of its own task only
+        records = {}
+        for inp, res in zip(inputs, results):
+            task_records = records.setdefault(inp.task.workload_key, ([], []))
+            task_records[0].append(inp)
+            task_records[1].append(res)
+        for task, policy in zip(self.tasks, self.search_policies):
+            if task.workload_key in records:
+                policy.preload_measured_states(*records[task.workload_key])
+
+        logger.info(
+            "TaskScheduler: Restored %d measurement records from %s",
+            len(inputs),
+            self.checkpoint_file,
+        )
+
 
 class TaskSchedulerCallback:
     """The base class of task scheduler callback functions."""
@@ -31,6 +31,7 @@ from . import database
 from . import feature
 from . import measure
 from . import record
+from . import record_store
 from . import task
 from . import tuner
 from . import utils
@@ -59,6 +60,7 @@ from .task import (
     DispatchContext,
     FallbackContext,
     ApplyHistoryBest as apply_history_best,
+    LazyApplyHistoryBest as apply_history_best_lazy,
     ApplyGraphBest as apply_graph_best,
 )
 from .env import GLOBAL_SCOPE
@@ -20,8 +20,9 @@ Database of MeasureInput/MeasureResult pair.
 This can be used for replaying measurement.
 """
 import os
+import itertools
 
-from .record import encode, decode, measure_str_key
+from .record import encode, decode, measure_str_key, workload_key
 
 
 class Database(object):
@@ -61,6 +62,51 @@ class Database(object):
         """
         raise NotImplementedError()
 
+    def save_batch(self, inputs, results, extend=False):
+        """
+        Save a batch of results. Databases may override this to write them at once.
+
+        Parameters
+        ----------
+        inputs: Array of MeasureInput
+            to be translated into keys
+        results: Array of MeasureResult
+            to associate with the keys
+        extend:
+            Whether to extend existing MeasureResults if they exist
+        """
+        for inp, res in zip(inputs, results):
+            self.save(inp, res, extend)
+
+    def filter_inputs(self, measure_inputs, retry=False):
+        """
+        Filter a measure_inputs batch based on saved db results
+
+        Parameters
+        ----------
+        measure_inputs: Array of MeasureInput
+            measure_inputs as expected in measure_batch
+        retry: bool
+            whether to retry if the saved result is a failure
+
+        Returns
+        -------
+        partial_results: Array of MeasureResult
+            a full list of result, where None denotes no corresponding saved result
+        unsaved: Array of MeasureInput
+            a list that only contains unsaved inputs
+        """
+        partial_results = list()
+        unsaved = list()
+        for inp in measure_inputs:
+            res = self.load(inp)
+            if res is None or (retry and res.error_no != 0):
+                unsaved.append(inp)
+                partial_results.append(None)
+            else:
+                partial_results.append(res)
+        return partial_results, unsaved
+
 
 def filter_inputs(db, measure_inputs, retry=False):
     """
@@ -82,16 +128,7 @@ def filter_inputs(db, measure_inputs, retry=False):
     unsaved: Array of MeasureInput
         a list that only contains unsaved inputs
     """
-    partial_results = list()
-    unsaved = list()
-    for inp in measure_inputs:
-        res = db.load(inp)
-        if res is None or (retry and res.error_no != 0):
-            unsaved.append(inp)
-            partial_results.append(None)
-        else:
-            partial_results.append(res)
-    return partial_results, unsaved
+    return db.filter_inputs(measure_inputs, retry)
 
 
 class RedisDatabase(Database):
@@ -202,3 +239,176 @@ class DummyDatabase(RedisDatabase):
 
     def flush(self):
         self.db = {}
+
+
+class SQLiteDatabase(Database):
+    """
+    SQLite version of record database.
+
+    The database is a single local file that can be shared by several tuning
+    processes at once. It runs in WAL mode so readers do not block the writer,
+    writes a batch of records in one transaction and indexes the records by
+    key, workload and target.
+
+    Parameters
+    ----------
+    filename: str
+        The database file. It is created if it does not exist.
+    timeout: float
+        Seconds to wait for the lock held by another writer.
+    """
+
+    # max number of host parameters in one sqlite statement
+    MAX_VARIABLES = 500
+
+    def __init__(self, filename, timeout=60.0):
+        # pylint: disable=import-outside-toplevel
+        import sqlite3
+
+        self.filename = str(filename)
+        self.conn = sqlite3.connect(self.filename, timeout=timeout, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        with self.conn:
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS records ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                "key TEXT NOT NULL, "
+                "workload TEXT NOT NULL, "
+                "target TEXT NOT NULL, "
+                "timestamp REAL NOT NULL, "
+                "record TEXT NOT NULL)"
+            )
+            self.conn.execute("CREATE INDEX IF NOT EXISTS records_key ON records (key)")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS records_workload ON records (workload)")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS records_target ON records (target)")
+
+    def _decode_latest(self, rows, get_all):
+        records = [decode(row) for row in rows]
+        results = [rec[1] for rec in records if rec is not None]
+        if not results:
+            return None
+        if get_all:
+            return results
+        return max(results, key=lambda result: result.timestamp)
+
+    def load(self, inp, get_all=False):
+        rows = self.conn.execute(
+            "SELECT record FROM records WHERE key = ? ORDER BY id", (measure_str_key(inp),)
+        )
+        return self._decode_latest([row[0] for row in rows], get_all)
+
+    def save(self, inp, res, extend=False):
+        self.save_batch([inp], [res], extend)
+
+    def save_batch(self, inputs, results, extend=False):
+        rows = [
+            (
+                measure_str_key(inp),
+                workload_key(inp.task.workload),
+                str(inp.target),
+                res.timestamp,
+                encode(inp, res),
+            )
+            for inp, res in zip(inputs, results)
+        ]
+        if not extend:
+            # only the last result of a key in the batch is kept
+            rows = list({row[0]: row for row in rows}.values())
+        # BEGIN IMMEDIATE takes the write lock up front, so concurrent writers queue
+        # on the busy timeout instead of failing on lock upgrade.
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            if not extend:
+                self.conn.executemany(
+                    "DELETE FROM records WHERE key = ?", [(row[0],) for row in rows]
+                )
+            self.conn.executemany(
+                "INSERT INTO records (key, workload, target, timestamp, record) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+
+    def filter_inputs(self, measure_inputs, retry=False):
+        keys = [measure_str_key(inp) for inp in measure_inputs]
+        saved = {}
+        unique_keys = list(set(keys))
+        for i in range(0, len(unique_keys), SQLiteDatabase.MAX_VARIABLES):
+            chunk = unique_keys[i : i + SQLiteDatabase.MAX_VARIABLES]
+            rows = self.conn.execute(
+                "SELECT key, record FROM records WHERE key IN (%s) ORDER BY key, id"
+                % ",".join("?" * len(chunk)),
+                chunk,
+            )
+            for key, group in itertools.groupby(rows, key=lambda row: row[0]):
+                saved[key] = self._decode_latest([row[1] for row in group], False)
+
+        partial_results = list()
+        unsaved = list()
+        for inp, key in zip(measure_inputs, keys):
+            res = saved.get(key)
+            if res is None or (retry and res.error_no != 0):
+                unsaved.append(inp)
+                partial_results.append(None)
+            else:
+                partial_results.append(res)
+        return partial_results, unsaved
+
+    def filter(self, func, workload=None, target=None):
+        """
+        Dump all of the records that match the given rule
+
+        Parameters
+        ----------
+        func: callable
+            The signature of the function is (MeasureInput, [MeasureResult]) -> bool
+        workload: tuple, optional
+            Only consider records of this workload. This is answered by an index.
+        target: str or Target, optional
+            Only consider records of this target. This is answered by an index.
+
+        Returns
+        -------
+        list of records in tuple (MeasureInput, MeasureResult) matching the rule
+
+        Examples
+        --------
+        get records of a workload with errors
+        >>> db.filter(lambda inp, results: any(r.error_no != 0 for r in results), task.workload)
+        """
+        conditions, params = [], []
+        if workload is not None:
+            conditions.append("workload = ?")
+            params.append(workload_key(workload))
+        if target is not None:
+            conditions.append("target = ?")
+            params.append(str(target))
+        where = " WHERE " + " AND ".join(conditions) if conditions else ""
+        rows = self.conn.execute(
+            "SELECT key, record FROM records%s ORDER BY key, id" % where, params
+        )
+
+        matched_records = list()
+        for _, group in itertools.groupby(rows, key=lambda row: row[0]):
+            records = [decode(row[1]) for row in group]
+            records = [rec for rec in records if rec is not None]
+            if not records:
+                continue
+            inps, results = zip(*records)
+            inp = inps[0]
+            if not func(inp, results):
+                continue
+            result = max(results, key=lambda res: res.timestamp)
+            matched_records.append((inp, result))
+        return matched_records
+
+    def flush(self):
+        with self.conn:
+            self.conn.execute("DELETE FROM records")
+
+    def close(self):
+        self.conn.close()
@@ -28,6 +28,8 @@ from .measure_methods import (
     LocalRunner,
     RPCRunner,
     default_module_loader,
+    pooled_remote,
     request_remote,
 )
+from .build_cache import BuildCache
 from .executor import Executor
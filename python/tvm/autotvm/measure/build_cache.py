@@ -0,0 +1,180 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Persistent, content-addressed cache of built measurement artifacts.
+
+Entries are keyed on a hash of the lowered TIR together with the target and
+build options, so the same program is only sent through codegen once, no
+matter which tuning session or worker process built it first. The cache is a
+plain directory and is safe to share between processes: entries are written
+to a temporary file and renamed into place.
+"""
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+
+from ... import __version__
+
+logger = logging.getLogger("autotvm")
+
+
+class BuildCache(object):
+    """A size-bounded, least-recently-used cache of built libraries on disk.
+
+    Parameters
+    ----------
+    cache_dir: str
+        The directory of the cache. It is created if it does not exist.
+    max_size_mb: float
+        The maximum total size of the cached artifacts in megabytes. The least
+        recently used entries are evicted when an insertion exceeds it.
+    """
+
+    def __init__(self, cache_dir, max_size_mb=1024):
+        self.cache_dir = os.path.abspath(os.path.expanduser(str(cache_dir)))
+        self.max_size = int(max_size_mb * 1024 * 1024)
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    @staticmethod
+    def key(mod, target, target_host, output_format, build_func_name, build_kwargs):
+        """Compute the cache key of a lowered program.
+
+        Parameters
+        ----------
+        mod: IRModule
+            The lowered module.
+        target: Target
+            The target of the build.
+        target_host: Target
+            The host target of the build.
+        output_format: str
+            The format of the exported library.
+        build_func_name: str
+            The name of the function exporting the library.
+        build_kwargs: dict
+            The options of the build, e.g. ``check_gpu`` and ``build_option``.
+
+        Returns
+        -------
+        key: str
+            The hex digest identifying the artifact.
+        """
+        material = json.dumps(
+            [
+                __version__,
+                str(target),
+                str(target_host),
+                output_format,
+                build_func_name,
+                sorted((k, repr(v)) for k, v in build_kwargs.items()),
+                str(mod),
+            ]
+        )
+        return hashlib.sha256(material.encode()).hexdigest()
+
+    def _paths(self, key, output_format):
+        base = os.path.join(self.cache_dir, key)
+        return "%s.%s" % (base, output_format.lstrip(".")), base + ".json"
+
+    def fetch(self, key, output_format, filename):
+        """Place the cached artifact of a key at a filename.
+
+        Parameters
+        ----------
+        key: str
+            The cache key.
+        output_format: str
+            The format of the exported library.
+        filename: str
+            The destination of the artifact.
+
+        Returns
+        -------
+        arg_info: Tuple or None
+            The shape and dtype information of the arguments, or None on a miss.
+        """
+        lib_path, info_path = self._paths(key, output_format)
+        try:
+            with open(info_path) as fin:
+                arg_info = tuple((tuple(shape), dtype) for shape, dtype in json.load(fin))
+            try:
+                os.link(lib_path, filename)
+            except OSError:
+                shutil.copyfile(lib_path, filename)
+            # touch the entry so that eviction is least-recently-used
+            os.utime(info_path)
+        except (OSError, ValueError):
+            return None
+        return arg_info
+
+    def put(self, key, output_format, filename, arg_info):
+        """Insert a built artifact into the cache.
+
+        Parameters
+        ----------
+        key: str
+            The cache key.
+        output_format: str
+            The format of the exported library.
+        filename: str
+            The built artifact.
+        arg_info: Tuple
+            The shape and dtype information of the arguments.
+        """
+        lib_path, info_path = self._paths(key, output_format)
+        fd, tmp = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        os.close(fd)
+        shutil.copyfile(filename, tmp)
+        os.replace(tmp, lib_path)
+        # the info file is written last, it marks the entry as complete
+        fd, tmp = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        with os.fdopen(fd, "w") as fout:
+            json.dump(arg_info, fout)
+        os.replace(tmp, info_path)
+        self.evict()
+
+    def evict(self):
+        """Remove least recently used entries until the cache fits in its size bound."""
+        entries = {}
+        total = 0
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(".tmp"):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.cache_dir, name))
+            except OSError:
+                continue
+            total += stat.st_size
+            entry = entries.setdefault(name.split(".", 1)[0], [0, 0, []])
+            entry[0] += stat.st_size
+            entry[1] = max(entry[1], stat.st_mtime)
+            entry[2].append(name)
+
+        if total <= self.max_size:
+            return
+        for key, (size, _, names) in sorted(entries.items(), key=lambda x: x[1][1]):
+            for name in names:
+                try:
+                    os.remove(os.path.join(self.cache_dir, name))
+                except OSError:
+                    pass
+            total -= size
+            logger.debug("Evict %s from build cache", key)
+            if total <= self.max_size:
+                break
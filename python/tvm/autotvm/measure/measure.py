@@ -36,7 +36,11 @@ class MeasureInput(namedtuple("MeasureInput", ["target", "task", "config"])):
     """
 
 
-class MeasureResult(namedtuple("MeasureResult", ["costs", "error_no", "all_cost", "timestamp"])):
+class MeasureResult(
+    namedtuple(
+        "MeasureResult", ["costs", "error_no", "all_cost", "timestamp", "rel_ci"], defaults=(-1,)
+    )
+):
     """
     Stores all the results of a measurement
 
@@ -51,6 +55,10 @@ class MeasureResult(namedtuple("MeasureResult", ["costs", "error_no", "all_cost"
         All cost of this measure, including rpc, compilation, test runs
     timestamp: float
         The absolute time stamp when we finish measurement.
+    rel_ci: float, optional
+        The half width of the 95% confidence interval of the mean cost, relative to the mean.
+        Negative if the runner did not repeat the measurement to a confidence target, as in
+        `auto_scheduler.MeasureResult`. It is not stored in log files.
     """
 
     def __repr__(self):
@@ -61,7 +69,7 @@ class MeasureResult(namedtuple("MeasureResult", ["costs", "error_no", "all_cost"
         )
         return (
             f"{self.__class__.__name__}(costs={self.costs!r}, error_no={error_no_str}, "
-            f"all_cost={self.all_cost}, timestamp={self.timestamp!r})"
+            f"all_cost={self.all_cost}, timestamp={self.timestamp!r}, rel_ci={self.rel_ci})"
         )
 
 
@@ -77,6 +85,7 @@ class MeasureErrorNo(enum.IntEnum):
     BUILD_TIMEOUT = 6  # timeout during compilation
     RUN_TIMEOUT = 7  # timeout during run
     UNKNOWN_ERROR = 8  # unknown error
+    EARLY_TERMINATED = 9  # run stopped after a probe, as the program is too slow
 
 
 class Builder(object):
@@ -293,4 +302,6 @@ def create_measure_batch(task, option):
 
     measure_batch.n_parallel = builder.n_parallel
     measure_batch.attach_objects = attach_objects
+    measure_batch.builder = builder
+    measure_batch.runner = runner
     return measure_batch
@@ -26,6 +26,7 @@ import contextlib
 import logging
 import os
 import shutil
+import statistics
 import tempfile
 import threading
 import time
@@ -41,13 +42,14 @@ from tvm import rpc as _rpc
 from tvm.autotvm.env import AutotvmGlobalScope, reset_global_scope
 from tvm.contrib import ndk, nvcc, stackvm, tar
 from tvm.contrib.popen_pool import PopenPoolExecutor
-from tvm.driver import build
+from tvm.driver import build, lower
 from tvm.error import TVMError
 from tvm.target import Target
 
 from ..env import AutotvmGlobalScope
 from ..task.space import InstantiationError
 from ..utils import get_const_tuple
+from .build_cache import BuildCache
 from .measure import Builder, MeasureErrorNo, MeasureResult, Runner
 
 logger = logging.getLogger("autotvm")
@@ -89,10 +91,20 @@ class LocalBuilder(Builder):
         If is callable, use it as custom build function, expect lib_format field.
     do_fork: bool
         If False, do not fork when building. Requires n_parallel=1.
+    build_cache: str or BuildCache, optional
+        If supplied, a persistent cache of built libraries keyed on the lowered TIR,
+        target and build options. Configs built by an earlier session or by another
+        builder sharing the cache directory skip codegen. A str is the cache directory.
     """
 
     def __init__(
-        self, timeout=10, n_parallel=None, build_kwargs=None, build_func="default", do_fork=False
+        self,
+        timeout=10,
+        n_parallel=None,
+        build_kwargs=None,
+        build_func="default",
+        do_fork=False,
+        build_cache=None,
     ):
         super(LocalBuilder, self).__init__(timeout, n_parallel, build_kwargs)
 
@@ -105,7 +117,9 @@ class LocalBuilder(Builder):
                 build_func = stackvm.build
             else:
                 raise ValueError("Invalid build_func" + build_func)
-        self.build_func = _WrappedBuildFunc(build_func)
+        if isinstance(build_cache, str):
+            build_cache = BuildCache(build_cache)
+        self.build_func = _WrappedBuildFunc(build_func, build_cache)
         if not do_fork:
             assert n_parallel in (
                 None,
@@ -115,11 +129,16 @@ class LocalBuilder(Builder):
             timeout=timeout, initializer=reset_global_scope, initargs=(AutotvmGlobalScope.current,)
         )
         self.tmp_dir = tempfile.mkdtemp()
+        self.prev_tmp_dir = None
 
     def build(self, measure_inputs):
         results = []
 
-        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+        # keep the libraries of the previous batch, which may still be running
+        # while this batch builds in pipelined tuning
+        if self.prev_tmp_dir is not None:
+            shutil.rmtree(self.prev_tmp_dir, ignore_errors=True)
+        self.prev_tmp_dir = self.tmp_dir
         self.tmp_dir = tempfile.mkdtemp()
 
         for i in range(0, len(measure_inputs), self.n_parallel):
@@ -222,6 +241,25 @@ class RPCRunner(Runner):
     module_loader : ModuleLoader
         If given, a context manager that loads the module to be timed into the remote runtime.
         If not given, default_module_loader is used.
+    probe_ratio: float, optional
+        If positive, run each program once first, and stop measuring it when this probe is
+        slower than `probe_ratio` times the best cost measured for its task so far.
+        Such programs get the error number `MeasureErrorNo.EARLY_TERMINATED` and the cost
+        of the probe. This saves device time on search spaces with many slow programs.
+    max_rel_ci: float, optional
+        If positive, keep repeating the measurement (`repeat` costs at a time) until the half
+        width of the 95% confidence interval of the mean cost is at most this fraction of the
+        mean, or until `ci_time_budget` runs out. Stable programs are then measured cheaply
+        and noisy ones get more samples. The achieved value is stored in `MeasureResult.rel_ci`.
+    ci_time_budget: float, optional
+        The maximum time in seconds spent repeating a measurement for `max_rel_ci`.
+        It should be well below `timeout`.
+    session_lifetime: float, optional
+        If positive, the measurement workers lease RPC sessions from a `tvm.rpc.SessionPool`
+        and reuse them across measurements and batches, instead of requesting a new session
+        from the tracker for every measurement. The sessions are requested with this duration
+        in seconds instead of `timeout`, so a hung program holds the device for up to
+        this long. It only applies when `module_loader` is not given.
     """
 
     def __init__(
@@ -238,6 +276,10 @@ class RPCRunner(Runner):
         cooldown_interval=0.1,
         enable_cpu_cache_flush=False,
         module_loader=None,
+        probe_ratio=0,
+        max_rel_ci=0,
+        ci_time_budget=1.0,
+        session_lifetime=0,
     ):
         super(RPCRunner, self).__init__(timeout, n_parallel)
 
@@ -255,6 +297,12 @@ class RPCRunner(Runner):
         self.enable_cpu_cache_flush = enable_cpu_cache_flush
         self.cooldown_interval = cooldown_interval
         self.module_loader = module_loader
+        self.probe_ratio = probe_ratio
+        self.max_rel_ci = max_rel_ci
+        self.ci_time_budget = ci_time_budget
+        self.session_lifetime = session_lifetime
+        # the best measured costs, keyed on target and workload
+        self.best_costs = {}
 
         self.executor = PopenPoolExecutor(
             timeout=timeout * (self.n_parallel + 1),
@@ -337,8 +385,12 @@ class RPCRunner(Runner):
                 module_loader = (
                     self.module_loader
                     if self.module_loader is not None
-                    else default_module_loader()
+                    else default_module_loader(session_lifetime=self.session_lifetime)
                 )
+                probe_limit = None
+                best_key = (str(measure_inp.target), measure_inp.task.workload)
+                if self.probe_ratio > 0 and best_key in self.best_costs:
+                    probe_limit = self.probe_ratio * self.best_costs[best_key]
                 ret = self.executor.submit(
                     run_through_rpc,
                     measure_inp,
@@ -351,13 +403,20 @@ class RPCRunner(Runner):
                     self.ref_input,
                     self.enable_cpu_cache_flush,
                     module_loader,
+                    probe_limit,
+                    self.max_rel_ci,
+                    self.ci_time_budget,
                 )
                 futures.append(ret)
 
-            for future in futures:
+            for measure_inp, future in zip(measure_inputs[i : i + self.n_parallel], futures):
                 try:
                     res = future.result()
                     results.append(res)
+                    if res.error_no == MeasureErrorNo.NO_ERROR:
+                        best_key = (str(measure_inp.target), measure_inp.task.workload)
+                        cost = sum(res.costs) / len(res.costs)
+                        self.best_costs[best_key] = min(self.best_costs.get(best_key, cost), cost)
                 except Exception as ex:  # pylint: disable=broad-except
                     results.append(
                         MeasureResult(
@@ -414,6 +473,10 @@ class LocalRunner(RPCRunner):
         cooldown_interval=0.1,
         enable_cpu_cache_flush=False,
         module_loader=None,
+        probe_ratio=0,
+        max_rel_ci=0,
+        ci_time_budget=1.0,
+        session_lifetime=0,
     ):
         super(LocalRunner, self).__init__(
             "",
@@ -428,6 +491,10 @@ class LocalRunner(RPCRunner):
             cooldown_interval=cooldown_interval,
             enable_cpu_cache_flush=enable_cpu_cache_flush,
             module_loader=module_loader,
+            probe_ratio=probe_ratio,
+            max_rel_ci=max_rel_ci,
+            ci_time_budget=ci_time_budget,
+            session_lifetime=session_lifetime,
         )
         self.tracker = None
         self.server = None
@@ -455,8 +522,9 @@ class LocalRunner(RPCRunner):
         return server, tracker
 
 
-def _build_func_common(measure_input, check_gpu=None, cuda_arch=None, build_option=None):
-    """Common part for building a configuration"""
+@contextlib.contextmanager
+def _instantiate_common(measure_input, check_gpu=None, cuda_arch=None, build_option=None):
+    """Instantiate a configuration and yield (schedule, args, pass options) under its target"""
     target, task, config = measure_input
     target, task.target_host = Target.check_and_update_host_consist(target, task.target_host)
 
@@ -473,6 +541,21 @@ def _build_func_common(measure_input, check_gpu=None, cuda_arch=None, build_opti
         if cuda_arch:
             set_cuda_target_arch(cuda_arch)
 
+        yield s, args, opts
+
+
+def _lower_func_common(measure_input, check_gpu=None, cuda_arch=None, build_option=None):
+    """Lower a configuration, the part of _build_func_common that precedes codegen"""
+    with _instantiate_common(measure_input, check_gpu, cuda_arch, build_option) as (s, args, opts):
+        with tvm.ir.transform.PassContext(config=opts):
+            mod = lower(s, args, name="default_function")
+    return mod, opts, tuple((get_const_tuple(x.shape), x.dtype) for x in args)
+
+
+def _build_func_common(measure_input, check_gpu=None, cuda_arch=None, build_option=None):
+    """Common part for building a configuration"""
+    task = measure_input.task
+    with _instantiate_common(measure_input, check_gpu, cuda_arch, build_option) as (s, args, opts):
         # if target is vta, we need to use vta build
         if (
             hasattr(measure_input.target, "device_name")
@@ -506,10 +589,53 @@ class _WrappedBuildFunc:
         The wrapped build function
     """
 
-    def __init__(self, build_func):
+    def __init__(self, build_func, build_cache=None):
         if not hasattr(build_func, "output_format"):
             raise AttributeError("Expect build_func to have the attribute output_format.")
         self.build_func = build_func
+        self.build_cache = build_cache
+
+    def _build_cached(self, measure_input, filename, **kwargs):
+        """Build through the build cache, running codegen only on a cache miss."""
+        target, task, _ = measure_input
+        output_format = self.build_func.output_format
+        # snapshot the options, lowering adds the gpu verify pass to build_option
+        options = {k: repr(v) for k, v in kwargs.items()}
+        mod, opts, arg_info = _lower_func_common(measure_input, **kwargs)
+        key = self.build_cache.key(
+            mod,
+            target,
+            task.target_host,
+            output_format,
+            getattr(self.build_func, "__name__", type(self.build_func).__name__),
+            options,
+        )
+        cached_arg_info = self.build_cache.fetch(key, output_format, filename)
+        if cached_arg_info is not None:
+            logger.debug("Build cache hit for %s", measure_input.config)
+            return cached_arg_info
+
+        with target:
+            with tvm.ir.transform.PassContext(config=opts):
+                func = build({target: mod}, target_host=task.target_host)
+        self._export(func, filename)
+        try:
+            self.build_cache.put(key, output_format, filename, arg_info)
+        except OSError as e:
+            logger.warning("Failed to insert into build cache: %s", e)
+        return arg_info
+
+    def _export(self, func, filename):
+        if self.build_func.output_format == ".model-library-format":
+            # Late import to preserve autoTVM with USE_MICRO OFF
+            try:
+                from tvm import micro  # pylint: disable=import-outside-toplevel
+            except ImportError:
+                raise ImportError("Requires USE_MICRO")
+
+            micro.export_model_library_format(func, filename)
+        else:
+            func.export_library(filename, self.build_func)
 
     def __call__(self, measure_input, tmp_dir, **kwargs):
         """
@@ -528,18 +654,13 @@ class _WrappedBuildFunc:
             filename = os.path.join(
                 tmp_dir, "tmp_func_%0x.%s" % (getrandbits(64), self.build_func.output_format)
             )
-            # TODO(tvm-team) consider linline _build_func_common
-            func, arg_info = _build_func_common(measure_input, **kwargs)
-            if self.build_func.output_format == ".model-library-format":
-                # Late import to preserve autoTVM with USE_MICRO OFF
-                try:
-                    from tvm import micro  # pylint: disable=import-outside-toplevel
-                except ImportError:
-                    raise ImportError("Requires USE_MICRO")
-
-                micro.export_model_library_format(func, filename)
+            target = measure_input.target
+            if self.build_cache is not None and getattr(target, "device_name", None) != "vta":
+                arg_info = self._build_cached(measure_input, filename, **kwargs)
             else:
-                func.export_library(filename, self.build_func)
+                # TODO(tvm-team) consider linline _build_func_common
+                func, arg_info = _build_func_common(measure_input, **kwargs)
+                self._export(func, filename)
         except Exception as e:  # pylint: disable=broad-except
             return BuildResult(None, None, e, time.time() - tic)
         return BuildResult(filename, arg_info, None, time.time() - tic)
@@ -550,6 +671,68 @@ ModuleLoader = typing.Callable[
 ]
 
 
+# The two-sided 95% quantiles of the Student's t-distribution, indexed by degrees of freedom - 1
+_T_QUANTILES_95 = (
+    12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+    2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+    2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042,
+)  # fmt: skip
+
+
+def relative_confidence_interval(costs):
+    """Compute the half width of the 95% confidence interval of the mean of costs,
+    relative to the mean.
+
+    Parameters
+    ----------
+    costs: List of float
+        The measured costs
+
+    Returns
+    -------
+    rel_ci: float
+        The relative half width, which is infinite for less than two costs.
+    """
+    if len(costs) < 2:
+        return float("inf")
+    dof = len(costs) - 1
+    quantile = _T_QUANTILES_95[dof - 1] if dof <= len(_T_QUANTILES_95) else 1.96
+    return quantile * statistics.stdev(costs) / len(costs) ** 0.5 / statistics.mean(costs)
+
+
+def run_until_confident(time_f, args, max_rel_ci, time_budget, max_costs=1000):
+    """Call a time evaluator until the relative 95% confidence interval of the mean cost is
+    at most max_rel_ci, or until the time budget is spent.
+
+    Parameters
+    ----------
+    time_f: Function
+        The time evaluator. Every call adds its `repeat` costs to the samples.
+    args: List
+        The arguments of the time evaluator.
+    max_rel_ci: float
+        The target half width of the confidence interval, relative to the mean.
+    time_budget: float
+        The maximum time to spend in seconds.
+    max_costs: int
+        The maximum number of costs to collect.
+
+    Returns
+    -------
+    costs: Tuple of float
+        All measured costs.
+    rel_ci: float
+        The achieved relative half width of the confidence interval.
+    """
+    costs = []
+    tic = time.time()
+    while True:
+        costs.extend(time_f(*args).results)
+        rel_ci = relative_confidence_interval(costs)
+        if rel_ci <= max_rel_ci or time.time() - tic >= time_budget or len(costs) >= max_costs:
+            return tuple(costs), rel_ci
+
+
 def run_through_rpc(
     measure_input,
     build_result,
@@ -561,6 +744,9 @@ def run_through_rpc(
     ref_input,
     enable_cpu_cache_flush=False,
     module_loader=None,
+    probe_limit=None,
+    max_rel_ci=0,
+    ci_time_budget=1.0,
 ):
     """Run a generated library through rpc
 
@@ -600,12 +786,21 @@ def run_through_rpc(
         This is only has effect on CPU task.
     module_loader: ModuleLoader
         A function that returns a ContextManager used to establish and teardown the remote session.
+    probe_limit: float, optional
+        If given, run the program once first, and stop measuring it when this probe takes
+        longer than probe_limit seconds.
+    max_rel_ci: float, optional
+        If positive, repeat the measurement until the relative 95% confidence interval of
+        the mean cost is at most this value, see `run_until_confident`.
+    ci_time_budget: float, optional
+        The maximum time in seconds spent repeating the measurement for `max_rel_ci`.
     """
     if isinstance(build_result, MeasureResult):
         return build_result
 
     tic = time.time()
     errno = MeasureErrorNo.NO_ERROR
+    rel_ci = -1
     try:
         # upload built module
         with module_loader(remote_kwargs, build_result) as (remote, mod):
@@ -643,7 +838,18 @@ def run_through_rpc(
                         random_fill(arg)
                 dev.sync()
 
-            costs = time_f(*args).results
+            if probe_limit is not None:
+                probe_f = mod.time_evaluator(
+                    mod.entry_name, dev, number=1, repeat=1, f_preproc=f_prepare
+                )
+                probe_cost = probe_f(*args).mean
+                if probe_cost > probe_limit:
+                    errno = MeasureErrorNo.EARLY_TERMINATED
+                    costs = (probe_cost,)
+            if errno == MeasureErrorNo.NO_ERROR and max_rel_ci > 0:
+                costs, rel_ci = run_until_confident(time_f, args, max_rel_ci, ci_time_budget)
+            elif errno == MeasureErrorNo.NO_ERROR:
+                costs = time_f(*args).results
 
         if len(costs) > 2:  # remove largest and smallest value to reduce variance
             costs = list(costs)
@@ -659,33 +865,40 @@ def run_through_rpc(
         errno = MeasureErrorNo.RUNTIME_DEVICE
     tstamp = time.time()
     time.sleep(cooldown_interval)
-    return MeasureResult(costs, errno, tstamp - tic + build_result.time_cost, tstamp)
+    return MeasureResult(costs, errno, tstamp - tic + build_result.time_cost, tstamp, rel_ci)
 
 
 class DefaultModuleLoader:
     """See default_module_loader(). A pickleable emulation of the original function closure."""
 
-    def __init__(self, pre_load_function=None) -> None:
+    def __init__(self, pre_load_function=None, session_lifetime=0) -> None:
         self.pre_load_function = pre_load_function
+        self.session_lifetime = session_lifetime
 
     @contextlib.contextmanager
     def __call__(self, remote_kwargs, build_result):
-        remote = request_remote(**remote_kwargs)
-        if self.pre_load_function is not None:
-            self.pre_load_function(remote, build_result)
+        if self.session_lifetime > 0:
+            session = pooled_remote(**dict(remote_kwargs, timeout=self.session_lifetime))
+        else:
+            session = contextlib.nullcontext(request_remote(**remote_kwargs))
+        with session as remote:
+            if self.pre_load_function is not None:
+                self.pre_load_function(remote, build_result)
 
-        remote.upload(build_result.filename)
-        try:
-            yield remote, remote.load_module(os.path.split(build_result.filename)[1])
+            remote.upload(build_result.filename)
+            try:
+                yield remote, remote.load_module(os.path.split(build_result.filename)[1])
 
-        finally:
-            # clean up remote files
-            remote.remove(build_result.filename)
-            remote.remove(os.path.splitext(build_result.filename)[0] + ".so")
-            remote.remove("")
+            finally:
+                # clean up remote files
+                remote.remove(build_result.filename)
+                remote.remove(os.path.splitext(build_result.filename)[0] + ".so")
+                if self.session_lifetime <= 0:
+                    # the working directory of a reused session is still needed
+                    remote.remove("")
 
 
-def default_module_loader(pre_load_function=None):
+def default_module_loader(pre_load_function=None, session_lifetime=0):
     """Returns a default function that can be passed as module_loader to run_through_rpc.
 
     Parameters
@@ -693,6 +906,9 @@ def default_module_loader(pre_load_function=None):
     pre_load_function : Optional[Function[tvm.rpc.Session, tvm.runtime.Module]]
         Invoked after a session is established and before the default code-loading RPC calls are
         issued. Allows performing pre-upload actions, e.g. resetting the remote runtime environment.
+    session_lifetime : float
+        If positive, lease the sessions from the session pool of the process with this
+        duration in seconds, see `pooled_remote`.
 
     Returns
     -------
@@ -702,7 +918,7 @@ def default_module_loader(pre_load_function=None):
 
     # This was a function with a closure before but that couldn't be pickled!
     # We need pickle to work for using python's multiprocessing on some platforms.
-    return DefaultModuleLoader(pre_load_function)
+    return DefaultModuleLoader(pre_load_function, session_lifetime)
 
 
 def request_remote(device_key, host=None, port=None, priority=1, timeout=60):
@@ -736,6 +952,40 @@ def request_remote(device_key, host=None, port=None, priority=1, timeout=60):
     return remote
 
 
+@contextlib.contextmanager
+def pooled_remote(device_key, host=None, port=None, priority=1, timeout=60):
+    """Lease a remote session from the session pool of this process for a with block.
+
+    The session is reused by later leases if the block exits without an exception.
+    See `tvm.rpc.SessionPool`.
+
+    Parameters
+    ----------
+    device_key: string
+        The device key of registered device in tracker
+    host: host, optional
+        The host address of rpc tracker.
+        If is none, will use environment variable "TVM_TRACKER_HOST"
+    port: int, optional
+        The port of rpc tracker.
+        If is none, will use environment variable "TVM_TRACKER_PORT"
+    priority: int, optional
+        The priority of this request, larger is more prior
+    timeout: float, optional
+        The timeout of this session (units: second)
+
+    Returns
+    ------
+    session: RPCSession
+    """
+    host = host or os.environ["TVM_TRACKER_HOST"]
+    port = port or int(os.environ["TVM_TRACKER_PORT"])
+
+    pool = _rpc.get_session_pool(host, port)
+    with pool.session(device_key, priority=priority, session_timeout=timeout) as remote:
+        yield remote
+
+
 def check_remote(target, device_key, host=None, port=None, priority=100, timeout=10):
     """
     Check the availability of a remote device
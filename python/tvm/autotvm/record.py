@@ -31,7 +31,7 @@ import numpy as np
 
 from .. import build, lower
 from ..target import Target
-from ..contrib import popen_pool
+from ..contrib import popen_pool, record_index
 from .. import __version__
 from . import task
 from .task import ConfigEntity, ApplyHistoryBest
@@ -113,7 +113,7 @@ def encode(inp, result, protocol="json"):
                 ).decode()
             ),
             str(base64.b64encode(pickle.dumps(inp.config)).decode()),
-            str(base64.b64encode(pickle.dumps(tuple(result))).decode()),
+            str(base64.b64encode(pickle.dumps(tuple(result[:4]))).decode()),
             str(AUTOTVM_LOG_VERSION),
             str(__version__),
         )
@@ -215,6 +215,79 @@ def load_from_file(filename):
             yield ret
 
 
+def workload_key(workload):
+    """Get the string key of a workload used by persistent record indices.
+
+    Parameters
+    ----------
+    workload: tuple
+        The workload of a task.
+
+    Returns
+    -------
+    key: str
+        The canonical string representation of the workload.
+    """
+    return json.dumps(workload)
+
+
+def read_record_at(filename, offset):
+    """Decode the record on the line that starts at a byte offset of a log file.
+
+    Parameters
+    ----------
+    filename: str
+        The log file.
+    offset: int
+        The byte offset of the line, e.g. from :any:`load_best_index`.
+
+    Returns
+    -------
+    ret : tuple(autotvm.measure.MeasureInput, autotvm.measure.MeasureResult), or None
+        The decoded record.
+    """
+    with open(filename, "rb") as fin:
+        fin.seek(offset)
+        return decode(fin.readline().decode())
+
+
+def load_best_index(filename, use_cache=True):
+    """Get the best record index of a log file without decoding its records.
+
+    The index maps (target key, workload key) and (target model, workload key)
+    to the byte offset and mean cost of the best valid record. It is computed
+    from the raw json rows, so no MeasureInput or MeasureResult is created.
+    With ``use_cache``, the index is kept in a ``<filename>.bestidx`` sidecar
+    file and only the lines appended since it was written are scanned.
+
+    Parameters
+    ----------
+    filename: str
+        The log file in json protocol.
+    use_cache: bool
+        Whether to reuse and update the sidecar index file.
+
+    Returns
+    -------
+    index: dict
+        A dict with keys "targetkey" and "model", each mapping
+        (key, workload key) to (offset, cost).
+    """
+
+    def parse_line(line):
+        row = json.loads(line)
+        if "v" in row and row["v"] == 0.1:
+            return None
+        costs, error_no = row["result"][0], row["result"][1]
+        if error_no != 0:
+            return None
+        tgt, task_name, task_args, _ = row["input"]
+        target = str(tgt).replace("-target", "-mtriple")
+        return sum(costs) / len(costs), target, workload_key([task_name] + list(task_args))
+
+    return record_index.load_best_index(filename, parse_line, use_cache)
+
+
 def split_workload(in_file, clean=True):
     """Split a log file into separate files, each of which contains only a single workload
     This function can also delete duplicated records in log file
@@ -305,7 +378,7 @@ def pick_best(in_file, out_file):
 
 """
 Usage:
-This record executable module has three modes.
+This record executable module has four modes.
 
 * Print log file in readable format
 e.g. python -m tvm.autotvm.record --mode read --i collect_conv.log --begin 0 --end 5 --ir --code
@@ -315,10 +388,13 @@ e.g. python -m tvm.autotvm.record --mode pick --i collect.log
 
 * Split a log file into separate files, each of which contains only a single wkl
 e.g. python -m tvm.autotvm.record --mode split --i collect.log
+
+* Convert a log file into an indexed binary record store
+e.g. python -m tvm.autotvm.record --mode convert --i collect.log --o collect.rec
 """
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
-    parser.add_argument("--mode", choices=["read", "pick", "split"], default="read")
+    parser.add_argument("--mode", choices=["read", "pick", "split", "convert"], default="read")
     parser.add_argument("--i", type=str, help="input file")
     parser.add_argument("--o", type=str, default=None, help="output file")
     parser.add_argument("--begin", type=int, default=0)
@@ -352,3 +428,8 @@ if __name__ == "__main__":
                         print(func.imported_modules[0].get_source())
     elif args.mode == "split":
         split_workload(args.i)
+    elif args.mode == "convert":
+        from .record_store import convert_from_json  # pylint: disable=import-outside-toplevel
+
+        args.o = args.o or args.i + ".rec"
+        convert_from_json(args.i, args.o)
@@ -0,0 +1,468 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+# pylint: disable=invalid-name
+"""Indexed, append-only binary store of tuning records.
+
+A record store consists of three files:
+
+* ``<name>``: the data file, a magic header followed by length-prefixed
+  encoded records. Records are only ever appended.
+* ``<name>.best``: the best record index, mapping (target key, workload) and
+  (target model, workload) to the offset and mean cost of the best record.
+* ``<name>.keys``: the key index, mapping ``measure_str_key`` to the offset
+  of the latest record of a measured config.
+
+Both indices remember how much of the data file they cover, so records
+appended by an older index writer are picked up incrementally on open.
+The data file is memory-mapped for reading, and only the records that are
+actually looked up get decoded.
+"""
+import json
+import logging
+import mmap
+import os
+import struct
+
+import numpy as np
+
+from .record import encode, decode, load_from_file, measure_str_key, workload_key
+
+logger = logging.getLogger("autotvm")
+
+RECORD_STORE_MAGIC = b"TVMATREC"
+RECORD_STORE_VERSION = 1
+
+_LENGTH = struct.Struct("<I")
+
+
+def is_record_store(filename):
+    """Check whether a file is a binary record store.
+
+    Parameters
+    ----------
+    filename: str
+        The file to check.
+
+    Returns
+    -------
+    ret: bool
+        Whether the file starts with the record store magic.
+    """
+    if not os.path.isfile(filename):
+        return False
+    with open(filename, "rb") as fin:
+        return fin.read(len(RECORD_STORE_MAGIC)) == RECORD_STORE_MAGIC
+
+
+def _write_json_atomic(filename, obj):
+    tmp = filename + ".tmp.%d" % os.getpid()
+    with open(tmp, "w") as fout:
+        json.dump(obj, fout)
+    os.replace(tmp, filename)
+
+
+class RecordStore(object):
+    """An append-only binary store of tuning records with persistent indices.
+
+    Parameters
+    ----------
+    filename: str
+        The data file of the store. It is created if it does not exist and
+        ``readonly`` is False.
+    readonly: bool
+        Whether to open the store for reading only.
+
+    Examples
+    --------
+    .. code-block:: python
+
+        with RecordStore("tuning.rec") as store:
+            store.append(inp, res)
+            inp, res = store.best_by_targetkey("cpu", task.workload)
+    """
+
+    def __init__(self, filename, readonly=False):
+        self.filename = str(filename)
+        self.readonly = readonly
+
+        if not os.path.isfile(self.filename):
+            if readonly:
+                raise FileNotFoundError("Record store %s does not exist" % self.filename)
+            with open(self.filename, "wb") as fout:
+                fout.write(RECORD_STORE_MAGIC)
+        elif not is_record_store(self.filename):
+            raise ValueError("%s is not an autotvm record store" % self.filename)
+
+        self._fout = None if readonly else open(self.filename, "ab")
+        self._mmap = None
+        self._mmap_file = None
+        self._decoded = {}
+
+        # (target key, workload key) -> (offset, cost)
+        self._best_by_targetkey = {}
+        # (target model, workload key) -> (offset, cost)
+        self._best_by_model = {}
+        self._num_records = 0
+        self._best_covered = len(RECORD_STORE_MAGIC)
+        self._best_dirty = False
+
+        # measure_str_key -> offset, loaded on first use
+        self._by_str_key = None
+        self._keys_covered = len(RECORD_STORE_MAGIC)
+        self._keys_dirty = False
+
+        self._load_best_index()
+
+    @property
+    def best_index_file(self):
+        return self.filename + ".best"
+
+    @property
+    def key_index_file(self):
+        return self.filename + ".keys"
+
+    def __len__(self):
+        return self._num_records
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, ptype, value, trace):
+        self.close()
+
+    # ---------------------------------------------------------------------
+    # Raw data access
+    # ---------------------------------------------------------------------
+    def _data(self):
+        """Get a memory map of the data file that covers all appended records."""
+        if self._fout is not None:
+            # the size and the mapping only cover what left the write buffer
+            self._fout.flush()
+        size = os.path.getsize(self.filename)
+        if self._mmap is None or len(self._mmap) != size:
+            self._close_mmap()
+            self._mmap_file = open(self.filename, "rb")
+            self._mmap = mmap.mmap(self._mmap_file.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._mmap
+
+    def _close_mmap(self):
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap_file.close()
+            self._mmap = None
+            self._mmap_file = None
+
+    def _read_row(self, offset):
+        data = self._data()
+        (length,) = _LENGTH.unpack_from(data, offset)
+        start = offset + _LENGTH.size
+        return data[start : start + length].decode()
+
+    def _scan(self, start):
+        """Iterate (offset, end, row) of records from the data file starting at an offset.
+
+        A truncated record at the end of the file, left by an interrupted writer,
+        ends the scan. In writable mode it is cut off so new records stay aligned.
+        """
+        data = self._data()
+        end = len(data)
+        offset = start
+        while offset < end:
+            if offset + _LENGTH.size > end:
+                break
+            (length,) = _LENGTH.unpack_from(data, offset)
+            nxt = offset + _LENGTH.size + length
+            if nxt > end:
+                break
+            yield offset, nxt, data[offset + _LENGTH.size : nxt].decode()
+            offset = nxt
+
+        if offset < end:
+            logger.warning("Found a truncated record at offset %d of %s", offset, self.filename)
+            if not self.readonly:
+                self._close_mmap()
+                self._fout.truncate(offset)
+
+    def record_at(self, offset):
+        """Decode the record stored at an offset of the data file.
+
+        Parameters
+        ----------
+        offset: int
+            The offset returned by :any:`append` or stored in an index.
+
+        Returns
+        -------
+        ret: tuple(autotvm.measure.MeasureInput, autotvm.measure.MeasureResult)
+            The decoded record.
+        """
+        if offset not in self._decoded:
+            self._decoded[offset] = decode(self._read_row(offset))
+        return self._decoded[offset]
+
+    def __iter__(self):
+        for _, _, row in self._scan(len(RECORD_STORE_MAGIC)):
+            ret = decode(row)
+            if ret is not None:
+                yield ret
+
+    # ---------------------------------------------------------------------
+    # Indices
+    # ---------------------------------------------------------------------
+    def _index_best(self, offset, inp, res):
+        self._num_records += 1
+        if res.error_no != 0:
+            return
+        cost = float(np.mean(res.costs))
+        wkl = workload_key(inp.task.workload)
+
+        for k in inp.target.keys:
+            key = (k, wkl)
+            if key not in self._best_by_targetkey or self._best_by_targetkey[key][1] > cost:
+                self._best_by_targetkey[key] = (offset, cost)
+
+        if inp.target.model != "unknown":
+            key = (inp.target.model, wkl)
+            if key not in self._best_by_model or self._best_by_model[key][1] > cost:
+                self._best_by_model[key] = (offset, cost)
+
+    def _load_best_index(self):
+        if os.path.isfile(self.best_index_file):
+            with open(self.best_index_file) as fin:
+                index = json.load(fin)
+            if index.get("version") == RECORD_STORE_VERSION:
+                self._num_records = index["num_records"]
+                self._best_covered = index["covered"]
+                self._best_by_targetkey = {
+                    (k, wkl): (offset, cost) for k, wkl, offset, cost in index["targetkey"]
+                }
+                self._best_by_model = {
+                    (k, wkl): (offset, cost) for k, wkl, offset, cost in index["model"]
+                }
+
+        if self._best_covered < os.path.getsize(self.filename):
+            logger.debug("Indexing new records of %s", self.filename)
+            for offset, end, row in self._scan(self._best_covered):
+                ret = decode(row)
+                if ret is not None:
+                    self._index_best(offset, *ret)
+                self._best_covered = end
+            self._best_dirty = True
+
+    def load_key_index(self):
+        """Load the ``measure_str_key`` index, indexing records it does not cover yet.
+
+        The key index is loaded lazily by :any:`get` since it is much larger than
+        the best record index. Call this before appending many records so that
+        they are added to the persisted key index as well.
+        """
+        if self._by_str_key is not None:
+            return
+        self._by_str_key = {}
+        if os.path.isfile(self.key_index_file):
+            with open(self.key_index_file) as fin:
+                index = json.load(fin)
+            if index.get("version") == RECORD_STORE_VERSION:
+                self._keys_covered = index["covered"]
+                self._by_str_key = index["keys"]
+
+        if self._keys_covered < os.path.getsize(self.filename):
+            for offset, end, row in self._scan(self._keys_covered):
+                ret = decode(row)
+                if ret is not None:
+                    self._by_str_key[measure_str_key(ret[0])] = offset
+                self._keys_covered = end
+            self._keys_dirty = True
+
+    # ---------------------------------------------------------------------
+    # Public API
+    # ---------------------------------------------------------------------
+    def append(self, inp, result):
+        """Append a record to the store and update the indices.
+
+        Parameters
+        ----------
+        inp: autotvm.measure.MeasureInput
+        result: autotvm.measure.MeasureResult
+            The record pair.
+
+        Returns
+        -------
+        offset: int
+            The offset of the new record in the data file.
+        """
+        if self.readonly:
+            raise RuntimeError("Cannot append to a read-only record store")
+        payload = encode(inp, result).encode()
+        self._fout.seek(0, os.SEEK_END)
+        offset = self._fout.tell()
+        self._fout.write(_LENGTH.pack(len(payload)) + payload)
+        end = offset + _LENGTH.size + len(payload)
+
+        self._index_best(offset, inp, result)
+        self._best_covered = end
+        self._best_dirty = True
+        if self._by_str_key is not None:
+            self._by_str_key[measure_str_key(inp)] = offset
+            self._keys_covered = end
+            self._keys_dirty = True
+        return offset
+
+    def flush(self):
+        """Flush appended records to disk and persist the indices."""
+        if self.readonly:
+            return
+        self._fout.flush()
+        if self._best_dirty:
+            _write_json_atomic(
+                self.best_index_file,
+                {
+                    "version": RECORD_STORE_VERSION,
+                    "covered": self._best_covered,
+                    "num_records": self._num_records,
+                    "targetkey": [
+                        [k, wkl, offset, cost]
+                        for (k, wkl), (offset, cost) in self._best_by_targetkey.items()
+                    ],
+                    "model": [
+                        [k, wkl, offset, cost]
+                        for (k, wkl), (offset, cost) in self._best_by_model.items()
+                    ],
+                },
+            )
+            self._best_dirty = False
+        if self._keys_dirty:
+            _write_json_atomic(
+                self.key_index_file,
+                {
+                    "version": RECORD_STORE_VERSION,
+                    "covered": self._keys_covered,
+                    "keys": self._by_str_key,
+                },
+            )
+            self._keys_dirty = False
+
+    def close(self):
+        """Flush the store and release the file handles."""
+        self.flush()
+        self._close_mmap()
+        if self._fout is not None:
+            self._fout.close()
+            self._fout = None
+
+    def best_by_targetkey(self, target_key, workload):
+        """Get the best record of a workload for a target key.
+
+        Parameters
+        ----------
+        target_key: str
+            A key of the target, e.g. "cpu" or "cuda".
+        workload: tuple
+            The workload of the task.
+
+        Returns
+        -------
+        ret: tuple(MeasureInput, MeasureResult) or None
+            The best record, or None if there is no valid record.
+        """
+        entry = self._best_by_targetkey.get((target_key, workload_key(workload)))
+        return None if entry is None else self.record_at(entry[0])
+
+    def best_by_model(self, model, workload):
+        """Get the best record of a workload for a target model.
+
+        Parameters
+        ----------
+        model: str
+            The model of the target.
+        workload: tuple
+            The workload of the task.
+
+        Returns
+        -------
+        ret: tuple(MeasureInput, MeasureResult) or None
+            The best record, or None if there is no valid record.
+        """
+        entry = self._best_by_model.get((model, workload_key(workload)))
+        return None if entry is None else self.record_at(entry[0])
+
+    def best_entries(self):
+        """Iterate over the entries of the best record index without decoding them.
+
+        Yields
+        ------
+        kind: str
+            Either "targetkey" or "model".
+        key: str
+            The target key or target model.
+        workload_key: str
+            The workload key, see :any:`autotvm.record.workload_key`.
+        offset: int
+            The offset of the best record.
+        cost: float
+            The mean cost of the best record.
+        """
+        for (k, wkl), (offset, cost) in self._best_by_targetkey.items():
+            yield "targetkey", k, wkl, offset, cost
+        for (k, wkl), (offset, cost) in self._best_by_model.items():
+            yield "model", k, wkl, offset, cost
+
+    def get(self, inp):
+        """Get the latest record with the same ``measure_str_key`` as an input.
+
+        Parameters
+        ----------
+        inp: autotvm.measure.MeasureInput
+            The input to look up.
+
+        Returns
+        -------
+        ret: tuple(MeasureInput, MeasureResult) or None
+            The latest matching record, or None if the config was never measured.
+        """
+        self.load_key_index()
+        offset = self._by_str_key.get(measure_str_key(inp))
+        return None if offset is None else self.record_at(offset)
+
+    def __contains__(self, inp):
+        self.load_key_index()
+        return measure_str_key(inp) in self._by_str_key
+
+
+def convert_from_json(in_file, out_file):
+    """Append all records of a JSON log file to a record store.
+
+    Parameters
+    ----------
+    in_file: str
+        The JSON log file, as written by :any:`autotvm.callback.log_to_file`.
+    out_file: str
+        The record store to write. Records are appended if it exists.
+
+    Returns
+    -------
+    num: int
+        The number of converted records.
+    """
+    num = 0
+    with RecordStore(out_file) as store:
+        store.load_key_index()
+        for inp, res in load_from_file(in_file):
+            store.append(inp, res)
+            num += 1
+    logger.info("Converted %d records from %s to %s", num, in_file, out_file)
+    return num
@@ -37,6 +37,7 @@ from .dispatcher import (
     DispatchContext,
     ApplyConfig,
     ApplyHistoryBest,
+    LazyApplyHistoryBest,
     FallbackContext,
     clear_fallback_cache,
     ApplyGraphBest,
@@ -186,7 +186,8 @@ class ApplyHistoryBest(DispatchContext):
     ----------
     records : str or iterator of (autotvm.measure.MeasureInput, autotvm.measure.MeasureResult)
         Collection of tuning records.
-        If is str, then it should be the filename of a records log file.
+        If is str, then it should be the filename of a records log file or of a
+        binary record store (see :any:`autotvm.record_store.RecordStore`).
         Each row of this file is an encoded record pair. Otherwise, it is an iterator.
     """
 
@@ -207,18 +208,27 @@ class ApplyHistoryBest(DispatchContext):
         ----------
         records : str or iterator of (autotvm.measure.MeasureInput, autotvm.measure.MeasureResult)
             Collection of tuning records.
-            If is str, then it should be the filename of a records log file.
-            Each row of this file is an encoded record pair. Otherwise, it is an iterator.
+            If is str, then it should be the filename of a records log file or of a
+            binary record store. Each row of this file is an encoded record pair.
+            Otherwise, it is an iterator or a RecordStore.
         """
         # pylint: disable=import-outside-toplevel
         from pathlib import Path
         from ..record import load_from_file
+        from ..record_store import RecordStore, is_record_store
 
         if isinstance(records, Path):
             records = str(records)
 
         if isinstance(records, str):
+            if is_record_store(records):
+                with RecordStore(records, readonly=True) as store:
+                    self._load_store(store)
+                return
             records = load_from_file(records)
+        if isinstance(records, RecordStore):
+            self._load_store(records)
+            return
         if not records:
             return
 
@@ -253,6 +263,23 @@ class ApplyHistoryBest(DispatchContext):
 
         logger.debug("Finish loading %d records", counter)
 
+    def _load_store(self, store):
+        """Load the best records of a RecordStore using its best record index.
+
+        Only the best records are decoded, the rest of the store is never read.
+        """
+        best_by_targetkey = self.best_by_targetkey
+        best_by_model = self.best_by_model
+
+        for kind, key, _, offset, cost in store.best_entries():
+            inp, res = store.record_at(offset)
+            best = best_by_targetkey if kind == "targetkey" else best_by_model
+            key = (key, inp.task.workload)
+            if key not in best or np.mean(best[key][1].costs) > cost:
+                best[key] = (inp, res)
+
+        logger.debug("Finish loading best records of %d records", len(store))
+
     def _query_inside(self, target, workload):
         if target is None:
             raise RuntimeError(
@@ -292,6 +319,110 @@ class ApplyHistoryBest(DispatchContext):
             self._best_user_defined[key] = cfg
 
 
+class LazyApplyHistoryBest(ApplyHistoryBest):
+    """
+    Apply the history best config, decoding the best records on demand.
+
+    Instead of decoding every record, this context builds a compact table of
+    the best record offset per (target key, workload) and (target model, workload),
+    reusing the ``<filename>.bestidx`` sidecar written by a previous run, and only
+    decodes a winning record when it is queried. Decoded records are moved into
+    ``best_by_targetkey`` and ``best_by_model``.
+
+    Parameters
+    ----------
+    records : str or RecordStore or iterator of (MeasureInput, MeasureResult)
+        Collection of tuning records. If is str, then it should be the filename
+        of a records log file or of a binary record store. Iterators are loaded
+        eagerly as in ApplyHistoryBest.
+    use_cache : bool
+        Whether to read and write the sidecar index of json log files.
+
+    Note
+    ----
+    The record stores opened by this context are closed when it exits. They are
+    mapped again if records are queried later.
+    """
+
+    def __init__(self, records, use_cache=True):
+        # (key, workload key) -> (reader, offset, cost)
+        self._lazy_by_targetkey = {}
+        self._lazy_by_model = {}
+        self._use_cache = use_cache
+        self._stores = []
+        super(LazyApplyHistoryBest, self).__init__(records)
+
+    def load(self, records):
+        # pylint: disable=import-outside-toplevel
+        import functools
+        from pathlib import Path
+        from ..record import load_best_index, read_record_at
+        from ..record_store import RecordStore, is_record_store
+
+        if isinstance(records, Path):
+            records = str(records)
+        if isinstance(records, str) and is_record_store(records):
+            records = RecordStore(records, readonly=True)
+            self._stores.append(records)
+
+        if isinstance(records, RecordStore):
+            reader = records.record_at
+            entries = records.best_entries()
+        elif isinstance(records, str):
+            reader = functools.partial(read_record_at, records)
+            index = load_best_index(records, self._use_cache)
+            entries = (
+                (kind, k, wkl, offset, cost)
+                for kind, best in index.items()
+                for (k, wkl), (offset, cost) in best.items()
+            )
+        else:
+            super(LazyApplyHistoryBest, self).load(records)
+            return
+
+        counter = 0
+        for kind, k, wkl, offset, cost in entries:
+            counter += 1
+            lazy = self._lazy_by_targetkey if kind == "targetkey" else self._lazy_by_model
+            if (k, wkl) not in lazy or lazy[(k, wkl)][2] > cost:
+                lazy[(k, wkl)] = (reader, offset, cost)
+        logger.debug("Finish indexing %d best records", counter)
+
+    def _materialize(self, lazy, best, key, wkl):
+        entry = lazy.pop((key, wkl), None)
+        if entry is None:
+            return
+        reader, offset, cost = entry
+        record = reader(offset)
+        key = (key, record[0].task.workload)
+        if key not in best or np.mean(best[key][1].costs) > cost:
+            best[key] = record
+
+    def _query_inside(self, target, workload):
+        # pylint: disable=import-outside-toplevel
+        from ..record import workload_key
+
+        if target is not None and (self._lazy_by_targetkey or self._lazy_by_model):
+            try:
+                wkl = workload_key(workload)
+            except TypeError:
+                # the tir.Var of dynamic shapes has no key, nor any record in the index
+                return super(LazyApplyHistoryBest, self)._query_inside(target, workload)
+            self._materialize(self._lazy_by_model, self.best_by_model, target.model, wkl)
+            for k in target.keys:
+                self._materialize(self._lazy_by_targetkey, self.best_by_targetkey, k, wkl)
+        return super(LazyApplyHistoryBest, self)._query_inside(target, workload)
+
+    def close(self):
+        """Release the record stores opened by this context."""
+        for store in self._stores:
+            store.close()
+
+    def __exit__(self, ptype, value, trace):
+        super(LazyApplyHistoryBest, self).__exit__(ptype, value, trace)
+        self.close()
+
+
 class FallbackContext(DispatchContext):
     """
     A fallback dispatch context.
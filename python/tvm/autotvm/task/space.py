@@ -209,7 +209,7 @@ class SplitSpace(TransformSpace):
         if policy == "candidate":
             for size in kwargs["candidate"]:
                 assert len(size) == self.num_output
-                self.entities.append(SplitEntity(size))
+            sizes = np.array(kwargs["candidate"], dtype=np.int64).reshape(-1, self.num_output)
         else:
             if policy == "verbose":
                 # Include factors and power-of-twos. May generate tails.
@@ -230,22 +230,43 @@ class SplitSpace(TransformSpace):
 
             # Generate split entity by enumerating candidate factors.
             self.factors = factors
-            self._generate_space(0, [None] * (self.num_output - 1), enforce_no_tail=no_tail)
+            sizes = self._generate_space(enforce_no_tail=no_tail)
 
-        self.entities = list(filter(fil, self.entities))
+        if "filter" in kwargs:
+            sizes = sizes[[bool(fil(SplitEntity([int(x) for x in size]))) for size in sizes]]
+        self.entities = SplitEntityArray(sizes)
 
-    def _generate_space(self, now, tmp_stack, enforce_no_tail=False):
-        """Generate space by DFS"""
-        if now == self.num_output - 1:
-            prod = functools.reduce(lambda x, y: x * y, tmp_stack)
-            if prod > self.product:
-                return
-            if self.product % prod == 0 or (not enforce_no_tail and prod < self.product):
-                self.entities.append(SplitEntity([-1] + tmp_stack[::-1]))
+    def _generate_space(self, enforce_no_tail=False):
+        """Generate the sizes of all split entities.
+
+        The enumeration order is the same as a depth-first search over the factors
+        of each axis, but it runs on arrays and prunes partial products that already
+        exceed the axis length.
+
+        Returns
+        -------
+        sizes: np.ndarray
+            int64 array of shape (number of entities, num_output)
+        """
+        factors = np.array(self.factors, dtype=np.int64)
+        stack = np.empty((1, 0), dtype=np.int64)
+        prod = np.ones(1, dtype=np.int64)
+        for _ in range(self.num_output - 1):
+            stack = np.concatenate(
+                [np.repeat(stack, len(factors), axis=0), np.tile(factors, len(stack))[:, None]],
+                axis=1,
+            )
+            prod = np.repeat(prod, len(factors)) * np.tile(factors, len(prod))
+            keep = prod <= self.product
+            stack, prod = stack[keep], prod[keep]
+
+        if enforce_no_tail:
+            keep = self.product % prod == 0
         else:
-            for factor in self.factors:
-                tmp_stack[now] = factor
-                self._generate_space(now + 1, tmp_stack, enforce_no_tail)
+            keep = (self.product % prod == 0) | (prod < self.product)
+        stack = stack[keep]
+        first = np.full((len(stack), 1), -1, dtype=np.int64)
+        return np.concatenate([first, stack[:, ::-1]], axis=1)
 
     @staticmethod
     def get_num_output(axes, policy, **kwargs):
@@ -304,6 +325,34 @@ class SplitEntity(object):
         return str(self.size)
 
 
+class SplitEntityArray(object):
+    """A read-only sequence of SplitEntity backed by an int64 array of sizes.
+
+    Large split spaces are stored as one array instead of a list of objects,
+    and a SplitEntity is only created when an element is accessed.
+
+    Parameters
+    ----------
+    sizes: np.ndarray
+        int64 array of shape (number of entities, number of outputs)
+    """
+
+    def __init__(self, sizes):
+        self.sizes = sizes
+
+    def __len__(self):
+        return len(self.sizes)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        return SplitEntity([int(x) for x in self.sizes[index]])
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+
 class ReorderSpace(TransformSpace):
     """The parameter space for ordering an array of axes"""
 
@@ -665,6 +714,7 @@ class ConfigSpace(object):
         self.space_map = OrderedDict()  # name -> space
         self._collect = True
         self._length = None
+        self._feature_tables = None
         self._entity_map = OrderedDict()  # name -> entity
         self._constraints = []
         self.errors = []
@@ -861,6 +911,108 @@ class ConfigSpace(object):
         ret = ConfigEntity(index, self.code_hash, entities, self._constraints)
         return ret
 
+    @staticmethod
+    def decode_indexes(indexes, dims):
+        """Decode a batch of indexes into the index of every knob.
+
+        An index is a mixed radix number whose digits are the indexes of the knobs,
+        the first knob being the least significant one.
+
+        Parameters
+        ----------
+        indexes: Array of int
+            indexes in the space
+        dims: Array of int
+            the number of entities of every knob
+
+        Returns
+        -------
+        knob_indexes: np.ndarray
+            int64 array of shape (len(indexes), len(dims))
+        """
+        indexes = np.asarray(indexes, dtype=np.int64).reshape(-1)
+        knob_indexes = np.empty((len(indexes), len(dims)), dtype=np.int64)
+        for j, dim in enumerate(dims):
+            knob_indexes[:, j] = indexes % dim
+            indexes = indexes // dim
+        return knob_indexes
+
+    def _knob_indexes(self, indexes):
+        """Check a batch of indexes against the size of the space and decode them"""
+        if indexes.size and (indexes.min() < 0 or indexes.max() >= len(self)):
+            raise IndexError("Index out of range: size {}".format(len(self)))
+        return self.decode_indexes(indexes, [len(space) for space in self.space_map.values()])
+
+    def get_many(self, indexes):
+        """Get config entities for a batch of indexes in this space
+
+        The indexes are decoded into the index of every knob with array operations,
+        which is cheaper than calling `get` for each of them.
+
+        Parameters
+        ----------
+        indexes: Array of int
+            indexes in the space
+
+        Returns
+        -------
+        configs: List of ConfigEntity
+            The config entity of every index
+        """
+        indexes = np.asarray(indexes, dtype=np.int64).reshape(-1)
+        knob_indexes = self._knob_indexes(indexes)
+
+        names = list(self.space_map.keys())
+        spaces = list(self.space_map.values())
+        ret = []
+        for index, row in zip(indexes.tolist(), knob_indexes.tolist()):
+            entities = OrderedDict()
+            for name, space, knob_index in zip(names, spaces, row):
+                entities[name] = space[knob_index]
+            ret.append(ConfigEntity(index, self.code_hash, entities, self._constraints))
+        return ret
+
+    def _knob_feature_tables(self):
+        """Get per-knob tables whose row i is the flatten feature of the i-th entity"""
+        if self._feature_tables is None:
+            tables = []
+            for space in self.space_map.values():
+                if isinstance(space.entities, SplitEntityArray):
+                    tables.append(space.entities.sizes.astype(np.float32))
+                    continue
+                rows = [
+                    ConfigEntity(0, None, {"_": entity}, []).get_flatten_feature()
+                    for entity in space.entities
+                ]
+                tables.append(np.array(rows, dtype=np.float32).reshape(len(space), -1))
+            self._feature_tables = tables
+        return self._feature_tables
+
+    def get_flatten_feature_batch(self, indexes):
+        """Get the flatten features of a batch of configs without creating ConfigEntity.
+
+        This is equivalent to stacking ``self.get(i).get_flatten_feature()`` for all
+        indexes, but decodes the indexes and gathers the features with array operations.
+
+        Parameters
+        ----------
+        indexes: Array of int
+            indexes in the space
+
+        Returns
+        -------
+        fea: np.array
+            two dimensional float32 array of shape (len(indexes), feature length)
+        """
+        indexes = np.asarray(indexes, dtype=np.int64).reshape(-1)
+        knob_indexes = self._knob_indexes(indexes)
+        columns = [
+            table[knob_indexes[:, j]] for j, table in enumerate(self._knob_feature_tables())
+        ]
+        if not columns:
+            return np.empty((len(indexes), 0), dtype=np.float32)
+        return np.concatenate(columns, axis=1)
+
     def __iter__(self):
         return self._entity_map.__iter__()
 
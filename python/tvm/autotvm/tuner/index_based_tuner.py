@@ -61,14 +61,10 @@ class GridSearchTuner(IndexBaseTuner):
     """Enumerate the search space in a grid search order"""
 
     def next_batch(self, batch_size):
-        ret = []
-        for _ in range(batch_size):
-            if self.counter >= self.range_length:
-                break
-            index = self.counter + self.index_offset
-            ret.append(self.task.config_space.get(index))
-            self.counter = self.counter + 1
-        return ret
+        n = min(batch_size, self.range_length - self.counter)
+        start = self.counter + self.index_offset
+        self.counter += n
+        return self.task.config_space.get_many(np.arange(start, start + n))
 
 
 class RandomTuner(IndexBaseTuner):
@@ -93,7 +89,7 @@ class RandomTuner(IndexBaseTuner):
         self.visited = []
 
     def next_batch(self, batch_size):
-        ret = []
+        indexes = []
         for _ in range(batch_size):
             if self.rand_max == 0:
                 break
@@ -104,11 +100,11 @@ class RandomTuner(IndexBaseTuner):
 
             # Use the indirect index to get a direct index.
             index = self.rand_state.get(index_, index_) + self.index_offset
-            ret.append(self.task.config_space.get(index))
+            indexes.append(index)
             self.visited.append(index)
 
             # Update the direct index map.
             self.rand_state[index_] = self.rand_state.get(self.rand_max, self.rand_max)
             self.rand_state.pop(self.rand_max, None)
             self.counter += 1
-        return ret
+        return self.task.config_space.get_many(indexes)
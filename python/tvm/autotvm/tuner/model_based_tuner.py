@@ -25,6 +25,7 @@ import numpy as np
 
 from .tuner import Tuner
 from ..env import GLOBAL_SCOPE
+from ..task.space import ConfigSpace
 
 
 class FeatureCache(object):
@@ -232,7 +233,7 @@ class ModelBasedTuner(Tuner):
         self.train_ct = 0
 
     def next_batch(self, batch_size):
-        ret = []
+        indexes = []
 
         counter = 0
         while counter < batch_size:
@@ -252,11 +253,11 @@ class ModelBasedTuner(Tuner):
                 while index in self.visited:
                     index = np.random.randint(len(self.space))
 
-            ret.append(self.space.get(index))
+            indexes.append(index)
             self.visited.add(index)
 
             counter += 1
-        return ret
+        return self.space.get_many(indexes)
 
     def update(self, inputs, results):
         for inp, res in zip(inputs, results):
@@ -339,6 +340,43 @@ def knob2point(knob, dims):
     return p
 
 
+def points2knobs(points, dims):
+    """convert a batch of points to knob form, the batched version of point2knob
+
+    Parameters
+    ----------
+    points: Array of int
+        indexes in the space
+    dims: Array of int
+        sizes of each dimension
+
+    Returns
+    -------
+    knobs: np.ndarray
+        int64 array of shape (len(points), len(dims))
+    """
+    return ConfigSpace.decode_indexes(points, dims)
+
+
+def knobs2points(knobs, dims):
+    """convert a batch of knobs to point form, the batched version of knob2point
+
+    Parameters
+    ----------
+    knobs: np.ndarray
+        int array of shape (n, len(dims))
+    dims: Array of int
+        sizes of each dimension
+
+    Returns
+    -------
+    points: np.ndarray
+        int64 array of shape (n,)
+    """
+    strides = np.cumprod([1] + list(dims[:-1]), dtype=np.int64)
+    return np.asarray(knobs, dtype=np.int64) @ strides
+
+
 def submodular_pick(scores, knobs, n_pick, knob_weight=1.0):
     """Run greedy optimization to pick points with regard to both score and diversity.
     DiversityScore = knob_weight * number of unique knobs in the selected set
@@ -26,7 +26,7 @@ import time
 import numpy as np
 
 from ..utils import sample_ints
-from .model_based_tuner import ModelOptimizer, knob2point, point2knob
+from .model_based_tuner import ModelOptimizer, knob2point, point2knob, knobs2points, points2knobs
 
 logger = logging.getLogger("autotvm")
 
@@ -43,6 +43,11 @@ class SimulatedAnnealingOptimizer(ModelOptimizer):
     temp: float or Array of float
         If is a single float, then use a constant temperature.
         If is an Array, then perform linear cooling from temp[0] to temp[1]
+    persistent: bool, optional
+        Whether to keep the chains between calls of `find_maximums`
+    parallel_size: int, optional
+        The number of chains walked together. All chains are stored as one knob
+        matrix and mutated in bulk, so large values are cheap for large spaces.
     early_stop: int, optional
         Stop iteration if the optimal set do not change in `early_stop` rounds
     log_interval: int, optional
@@ -110,20 +115,23 @@ class SimulatedAnnealingOptimizer(ModelOptimizer):
             t = temp
             cool = 0
 
+        knobs = points2knobs(points, self.dims)
         while k < n_iter and k < k_last_modify + early_stop:
-            new_points = np.empty_like(points)
-            for i, p in enumerate(points):
-                new_points[i] = random_walk(p, self.dims)
+            new_knobs = random_walk_batch(knobs, self.dims)
+            new_points = knobs2points(new_knobs, self.dims)
 
             new_scores = model.predict(new_points)
 
             ac_prob = np.exp(np.minimum((new_scores - scores) / (t + 1e-5), 1))
             ac_index = np.random.random(len(ac_prob)) < ac_prob
 
+            knobs[ac_index] = new_knobs[ac_index]
             points[ac_index] = new_points[ac_index]
             scores[ac_index] = new_scores[ac_index]
 
-            for s, p in zip(new_scores, new_points):
+            # only the points that beat the current minimum of the heap can enter it
+            for i in np.nonzero(new_scores > heap_items[0][0])[0]:
+                s, p = new_scores[i], new_points[i]
                 if s > heap_items[0][0] and p not in in_heap:
                     pop = heapq.heapreplace(heap_items, (s, p))
                     in_heap.remove(pop[1])
@@ -186,3 +194,36 @@ def random_walk(p, dims):
 
     # transform to index form
     return knob2point(new, dims)
+
+
+def random_walk_batch(knobs, dims):
+    """random walk of a batch of points in knob form, the batched version of random_walk
+
+    Every point mutates exactly one of its dimensions to a different value.
+
+    Parameters
+    ----------
+    knobs: np.ndarray
+        int64 array of shape (n, len(dims)), points in knob form
+    dims: Array of int
+        sizes of each dimension
+
+    Returns
+    -------
+    new_knobs: np.ndarray
+        new neighborhood points in knob form
+    """
+    dims = np.asarray(dims, dtype=np.int64)
+    mutable = np.nonzero(dims > 1)[0]
+    new_knobs = knobs.copy()
+    if len(mutable) == 0:
+        return new_knobs
+
+    n = len(knobs)
+    rows = np.arange(n)
+    from_i = mutable[np.random.randint(len(mutable), size=n)]
+    # draw from the other dim - 1 values by skipping over the old value
+    to_v = (np.random.random(n) * (dims[from_i] - 1)).astype(np.int64)
+    to_v += to_v >= knobs[rows, from_i]
+    new_knobs[rows, from_i] = to_v
+    return new_knobs
@@ -16,12 +16,13 @@
 # under the License.
 # pylint: disable=unused-argument, no-self-use, invalid-name
 """Base class of tuner"""
+import concurrent.futures
 import logging
 import tempfile
 
 import numpy as np
 
-from ..measure import MeasureInput, create_measure_batch
+from ..measure import MeasureErrorNo, MeasureInput, create_measure_batch
 from ..utils import format_si_prefix
 
 from ..env import GLOBAL_SCOPE
@@ -89,7 +90,60 @@ class Tuner(object):
             result for measurement
         """
 
-    def tune(self, n_trial, measure_option, early_stopping=None, callbacks=(), si_prefix="G"):
+    def _measure_batches(self, measure_batch, n_trial, n_parallel):
+        """Generator: pick, build and run batches one after another"""
+        i = 0
+        while i < n_trial:
+            if not self.has_next():
+                break
+
+            configs = self.next_batch(min(n_parallel, n_trial - i))
+
+            inputs = [MeasureInput(self.task.target, self.task, config) for config in configs]
+            results = measure_batch(inputs)
+            i += len(results)
+            yield inputs, results
+
+    def _pipelined_measure_batches(self, measure_batch, n_trial, n_parallel):
+        """Generator: build the next batch while the current batch runs.
+
+        The next batch is picked before the results of the current batch are known,
+        so it is chosen with a tuner state that lags one batch behind. Tuner updates
+        done by the consumer overlap with the build of the next batch.
+        """
+
+        def next_inputs(n_submitted):
+            if n_submitted >= n_trial or not self.has_next():
+                return []
+            configs = self.next_batch(min(n_parallel, n_trial - n_submitted))
+            return [MeasureInput(self.task.target, self.task, config) for config in configs]
+
+        builder, runner = measure_batch.builder, measure_batch.runner
+        with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+            inputs = next_inputs(0)
+            n_submitted = len(inputs)
+            if inputs:
+                build_future = executor.submit(builder.build, inputs)
+            while inputs:
+                run_future = executor.submit(runner.run, inputs, build_future.result())
+
+                next_batch_inputs = next_inputs(n_submitted)
+                n_submitted += len(next_batch_inputs)
+                if next_batch_inputs:
+                    build_future = executor.submit(builder.build, next_batch_inputs)
+
+                yield inputs, run_future.result()
+                inputs = next_batch_inputs
+
+    def tune(
+        self,
+        n_trial,
+        measure_option,
+        early_stopping=None,
+        callbacks=(),
+        si_prefix="G",
+        pipeline=False,
+    ):
         """Begin tuning
 
         Parameters
@@ -108,6 +162,11 @@ class Tuner(object):
             every measurement pair. See autotvm/tuner/callback.py for some examples.
         si_prefix: str
             One of tvm.autotvm.utils.SI_PREFIXES. The SI prefix to use when reporting FLOPS.
+        pipeline: bool, optional
+            If is True, build the next batch while the current batch runs, and update the
+            tuner while the next batch builds. The next batch is then picked before the
+            results of the current one are known. Use it when programs run on remote
+            devices, since builds on the host would disturb measurements of a local runner.
         """
         measure_batch = create_measure_batch(self.task, measure_option)
         n_parallel = getattr(measure_batch, "n_parallel", 1)
@@ -123,63 +182,67 @@ class Tuner(object):
         GLOBAL_SCOPE.in_tuning = True
         i = error_ct = 0
         errors = []
-        while i < n_trial:
-            if not self.has_next():
-                break
-
-            configs = self.next_batch(min(n_parallel, n_trial - i))
-
-            inputs = [MeasureInput(self.task.target, self.task, config) for config in configs]
-            results = measure_batch(inputs)
-
-            # keep best config
-            for k, (inp, res) in enumerate(zip(inputs, results)):
-                config = inp.config
-                if res.error_no == 0:
-                    flops = inp.task.flop / np.mean(res.costs)
-                    error_ct = 0
-                else:
-                    flops = 0
-                    error_ct += 1
-                    error = res.costs[0]
-                    if isinstance(error, str):
-                        errors.append(error)
+        if pipeline:
+            batches = self._pipelined_measure_batches(measure_batch, n_trial, n_parallel)
+        else:
+            batches = self._measure_batches(measure_batch, n_trial, n_parallel)
+        try:
+            for inputs, results in batches:
+                # keep best config
+                for k, (inp, res) in enumerate(zip(inputs, results)):
+                    config = inp.config
+                    if res.error_no == 0:
+                        flops = inp.task.flop / np.mean(res.costs)
+                        error_ct = 0
+                    elif res.error_no == MeasureErrorNo.EARLY_TERMINATED:
+                        # a slow program is not an error
+                        flops = 0
+                        error_ct = 0
                     else:
-                        errors.append(str(error))
-
-                if flops > self.best_flops:
-                    self.best_flops = flops
-                    self.best_config = config
-                    self.best_measure_pair = (inp, res)
-                    self.best_iter = i + k
-
-                logger.debug(
-                    "No: %d\t%sFLOPS: %.2f/%.2f\tresult: %s\t%s",
-                    i + k + 1,
-                    si_prefix,
-                    format_si_prefix(flops, si_prefix),
-                    format_si_prefix(self.best_flops, si_prefix),
-                    res,
-                    config,
-                )
-
-            i += len(results)
-            self.ttl = min(early_stopping + self.best_iter, n_trial) - i
-
-            self.update(inputs, results)
-            for callback in callbacks:
-                callback(self, inputs, results)
-
-            if i >= self.best_iter + early_stopping:
-                logger.debug("Early stopped. Best iter: %d.", self.best_iter)
-                break
-
-            if error_ct > 150:
-                logging.basicConfig()
-                logger.warning("Too many errors happen in the tuning. Switching to debug mode.")
-                logger.setLevel(logging.DEBUG)
-            else:
-                logger.setLevel(old_level)
+                        flops = 0
+                        error_ct += 1
+                        error = res.costs[0]
+                        if isinstance(error, str):
+                            errors.append(error)
+                        else:
+                            errors.append(str(error))
+
+                    if flops > self.best_flops:
+                        self.best_flops = flops
+                        self.best_config = config
+                        self.best_measure_pair = (inp, res)
+                        self.best_iter = i + k
+
+                    logger.debug(
+                        "No: %d\t%sFLOPS: %.2f/%.2f\tresult: %s\t%s",
+                        i + k + 1,
+                        si_prefix,
+                        format_si_prefix(flops, si_prefix),
+                        format_si_prefix(self.best_flops, si_prefix),
+                        res,
+                        config,
+                    )
+
+                i += len(results)
+                self.ttl = min(early_stopping + self.best_iter, n_trial) - i
+
+                self.update(inputs, results)
+                for callback in callbacks:
+                    callback(self, inputs, results)
+
+                if i >= self.best_iter + early_stopping:
+                    logger.debug("Early stopped. Best iter: %d.", self.best_iter)
+                    break
+
+                if error_ct > 150:
+                    logging.basicConfig()
+                    logger.warning("Too many errors happen in the tuning. Switching to debug mode.")
+                    logger.setLevel(logging.DEBUG)
+                else:
+                    logger.setLevel(old_level)
+        finally:
+            # stop the pipelined builds and runs if a callback or an update raised
+            batches.close()
 
         if error_ct == i:
             _, f = tempfile.mkstemp(prefix="tvm_tuning_errors_", suffix=".log", text=True)
@@ -18,6 +18,7 @@
 """XGBoost as cost model"""
 
 import logging
+import multiprocessing
 import time
 
 import numpy as np
@@ -68,10 +69,28 @@ class XGBoostCostModel(CostModel):
         If is not none, the cost model will print training log every `log_interval` iterations.
     upper_model: XGBoostCostModel, optional
         The upper model used in transfer learning
+    incremental: bool, optional
+        If is True, `fit` continues boosting the previous model for `incremental_rounds`
+        rounds instead of training a new model from scratch, and only extracts features
+        of the samples added since the last fit. A full refit is still done every
+        `full_refit_interval` fits, and whenever a base model is in use.
+    full_refit_interval: int, optional
+        The number of fits between two full refits in incremental mode.
+    incremental_rounds: int, optional
+        The number of boosting rounds added by an incremental fit.
     """
 
     def __init__(
-        self, task, feature_type, loss_type, num_threads=None, log_interval=25, upper_model=None
+        self,
+        task,
+        feature_type,
+        loss_type,
+        num_threads=None,
+        log_interval=25,
+        upper_model=None,
+        incremental=False,
+        full_refit_interval=8,
+        incremental_rounds=20,
     ):
         global xgb
         super(XGBoostCostModel, self).__init__()
@@ -125,11 +144,12 @@ class XGBoostCostModel(CostModel):
         self.bst = None
 
         if feature_type == "itervar":
-            self.feature_extract_func = _extract_itervar_feature_index
+            self.feature_extract_func = _extract_itervar_feature_chunk
         elif feature_type == "knob":
-            self.feature_extract_func = _extract_knob_feature_index
+            # knob features are gathered in-process, see _get_feature
+            self.feature_extract_func = None
         elif feature_type == "curve":
-            self.feature_extract_func = _extract_curve_feature_index
+            self.feature_extract_func = _extract_curve_feature_chunk
         else:
             raise RuntimeError("Invalid feature type " + feature_type)
 
@@ -145,6 +165,16 @@ class XGBoostCostModel(CostModel):
         self._sample_size = 0
         self._reset_pool(self.space, self.target, self.task)
 
+        self.incremental = incremental
+        self.full_refit_interval = full_refit_interval
+        self.incremental_rounds = incremental_rounds
+        # (number of samples, fit time in seconds, whether the fit was incremental)
+        self.fit_history = []
+        # training features of the samples seen by the last fit in incremental mode
+        self._train_xs = np.empty((0,), dtype=np.int64)
+        self._train_features = None
+        self._incremental_ct = 0
+
     def _reset_pool(self, space, target, task):
         """reset processing pool for feature extraction"""
 
@@ -172,19 +202,69 @@ class XGBoostCostModel(CostModel):
     def _base_model_discount(self):
         return 1.0 / (2 ** (self._sample_size / 64.0))
 
+    def _get_train_feature(self, xs):
+        """get features for the training samples, only extracting features for the
+        samples appended to `xs` since the last call"""
+        xs = np.asarray(xs)
+        n_old = len(self._train_xs)
+        if self._train_features is None or not np.array_equal(xs[:n_old], self._train_xs):
+            n_old = 0
+            self._train_features = None
+
+        if n_old < len(xs):
+            new_features = self._get_feature(xs[n_old:])
+            if self._train_features is None:
+                capacity = max(2 * len(xs), 64)
+                self._train_features = np.empty(
+                    (capacity, new_features.shape[1]), dtype=np.float32
+                )
+            elif new_features.shape[1] != self._train_features.shape[1]:
+                # feature length changed, restart from the full set of samples
+                self._train_features = None
+                self._train_xs = np.empty((0,), dtype=np.int64)
+                return self._get_train_feature(xs)
+            elif len(xs) > len(self._train_features):
+                grown = np.empty((2 * len(xs), self._train_features.shape[1]), dtype=np.float32)
+                grown[:n_old] = self._train_features[:n_old]
+                self._train_features = grown
+            self._train_features[n_old : len(xs)] = new_features
+        self._train_xs = xs.copy()
+        return self._train_features[: len(xs)]
+
     def fit(self, xs, ys, plan_size):
         tic = time.time()
         self._reset_pool(self.space, self.target, self.task)
 
-        x_train = self._get_feature(xs)
+        if self.incremental:
+            x_train = self._get_train_feature(xs)
+        else:
+            x_train = self._get_feature(xs)
         y_train = np.array(ys)
         y_max = np.max(y_train)
         y_train = y_train / max(y_max, 1e-8)
-
         valid_index = y_train > 1e-6
+        self._sample_size = len(x_train)
+
+        if (
+            self.incremental
+            and self.bst is not None
+            and self.base_model is None
+            and self._incremental_ct < self.full_refit_interval
+        ):
+            # continue boosting from the previous model
+            self.bst = xgb.train(
+                self.xgb_params,
+                xgb.DMatrix(x_train, y_train),
+                num_boost_round=self.incremental_rounds,
+                xgb_model=self.bst,
+            )
+            self._incremental_ct += 1
+            self._log_fit(tic, xs, valid_index, True)
+            return
+        self._incremental_ct = 0
+
         index = np.random.permutation(len(x_train))
         dtrain = xgb.DMatrix(x_train[index], y_train[index])
-        self._sample_size = len(x_train)
 
         if self.base_model:
             discount = self._base_model_discount()
@@ -212,12 +292,18 @@ class XGBoostCostModel(CostModel):
             ],
         )
 
+        self._log_fit(tic, xs, valid_index, False)
+
+    def _log_fit(self, tic, xs, valid_index, incremental):
+        fit_time = time.time() - tic
+        self.fit_history.append((len(xs), fit_time, incremental))
         logger.debug(
-            "XGB train: %.2f\tobs: %d\terror: %d\tn_cache: %d",
-            time.time() - tic,
+            "XGB train: %.2f\tobs: %d\terror: %d\tn_cache: %d\tincremental: %s",
+            fit_time,
             len(xs),
             len(xs) - np.sum(valid_index),
             self.feature_cache.size(self.fea_type),
+            incremental,
         )
 
     def fit_log(self, records, plan_size, min_seed_records=500):
@@ -314,6 +400,10 @@ class XGBoostCostModel(CostModel):
 
     def _get_feature(self, indexes):
         """get features for indexes, run extraction if we do not have cache for them"""
+        if self.fea_type == "knob":
+            # knob features are a lookup into the space, no need to extract or cache them
+            return self.space.get_flatten_feature_batch(indexes)
+
         # free feature cache
         if self.feature_cache.size(self.fea_type) >= 100000:
             self.feature_cache.clear(self.fea_type)
@@ -324,10 +414,18 @@ class XGBoostCostModel(CostModel):
         need_extract = [x for x in indexes if x not in fea_cache]
 
         if need_extract:
+            # send indexes to workers in chunks to amortize the cost of a round-trip
+            n_workers = self.num_threads or multiprocessing.cpu_count()
+            chunk_size = min(_MAX_EXTRACT_CHUNK_SIZE, max(1, len(need_extract) // (4 * n_workers)))
+            chunks = [
+                need_extract[i : i + chunk_size] for i in range(0, len(need_extract), chunk_size)
+            ]
             pool = self._get_pool()
-            feas = pool.map_with_error_catching(self.feature_extract_func, need_extract)
-            for i, fea in zip(need_extract, feas):
-                fea_cache[i] = fea.value if fea.status == StatusKind.COMPLETE else None
+            results = pool.map_with_error_catching(self.feature_extract_func, chunks)
+            for chunk, res in zip(chunks, results):
+                feas = res.value if res.status == StatusKind.COMPLETE else [None] * len(chunk)
+                for i, fea in zip(chunk, feas):
+                    fea_cache[i] = fea
 
         feature_len = None
         for idx in indexes:
@@ -345,6 +443,9 @@ class XGBoostCostModel(CostModel):
         self._close_pool()
 
 
+# The maximum number of indexes sent to a worker in one feature extraction job.
+_MAX_EXTRACT_CHUNK_SIZE = 64
+
 # Global variables for passing arguments to extract functions.
 _extract_space = None
 _extract_target = None
@@ -372,6 +473,11 @@ def _extract_itervar_feature_index(args):
         return None
 
 
+def _extract_itervar_feature_chunk(indexes):
+    """extract iteration var features for a chunk of indexes in extract_space"""
+    return [_extract_itervar_feature_index(i) for i in indexes]
+
+
 def _extract_itervar_feature_log(arg):
     """extract iteration var feature for log items"""
     try:
@@ -435,6 +541,11 @@ def _extract_curve_feature_index(args):
         return None
 
 
+def _extract_curve_feature_chunk(indexes):
+    """extract sampled curve features for a chunk of indexes in extract_space"""
+    return [_extract_curve_feature_index(i) for i in indexes]
+
+
 def _extract_curve_feature_log(arg):
     """extract sampled curve feature for log items"""
     try:
@@ -70,6 +70,11 @@ class XGBTuner(ModelBasedTuner):
         The verbose level.
         If is 0, output nothing.
         Otherwise, output debug information every `verbose` iterations.
+
+    incremental: bool = False
+        If is True, the cost model continues boosting its previous model when refitting
+        instead of training from scratch, with a periodic full refit.
+        See :any:`XGBoostCostModel`.
     """
 
     def __init__(
@@ -82,6 +87,7 @@ class XGBTuner(ModelBasedTuner):
         optimizer="sa",
         diversity_filter_ratio=None,
         log_interval=50,
+        incremental=False,
     ):
         cost_model = XGBoostCostModel(
             task,
@@ -89,6 +95,7 @@ class XGBTuner(ModelBasedTuner):
             loss_type=loss_type,
             num_threads=num_threads,
             log_interval=log_interval // 2,
+            incremental=incremental,
         )
         if optimizer == "sa":
             optimizer = SimulatedAnnealingOptimizer(task, log_interval=log_interval)
@@ -0,0 +1,408 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Dynamic batching of concurrent inference requests.
+
+The batchers of this module coalesce single-sample requests from many threads into
+batches of up to `max_batch_size` samples, or of the samples that arrived within
+`max_delay_ms` of the first one. The samples are stacked along the first axis into
+pre-allocated buffers, the model runs once per batch, and every request receives its
+row of the outputs.
+
+.. code-block:: python
+
+    lib = relay.build(mod, target="llvm", params=params)  # compiled for batch size 8
+    gmod = graph_executor.GraphModule(lib["default"](tvm.cpu(0)))
+    with GraphExecutorBatcher(gmod, ["data"], max_delay_ms=2) as batcher:
+        # from any number of request handler threads
+        outputs = batcher.infer(data=sample)
+    print(batcher.stats())
+"""
+import collections
+import concurrent.futures
+import queue
+import threading
+import time
+
+import numpy as np
+
+import tvm.runtime
+
+_Request = collections.namedtuple("_Request", ["inputs", "future", "submit_time"])
+
+
+class DynamicBatcher(object):
+    """Base class of the dynamic batchers, which runs batches on a background thread.
+
+    Parameters
+    ----------
+    max_batch_size : int
+        The maximum number of samples in a batch.
+
+    max_delay_ms : float
+        The maximum time in milliseconds the first request of a batch waits for more
+        requests before the batch runs.
+
+    max_latency_samples : int
+        The number of most recent request latencies kept for the statistics.
+
+    input_specs : Optional[Dict[str, Tuple[tuple, np.dtype]]]
+        The shape and data type of every input of a sample. If is None, they are taken
+        from the first request.
+    """
+
+    def __init__(
+        self, max_batch_size, max_delay_ms=5.0, max_latency_samples=10000, input_specs=None
+    ):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size has to be positive")
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay_ms / 1000.0
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._input_specs = input_specs
+        self._latencies = collections.deque(maxlen=max_latency_samples)
+        self._batch_sizes = collections.Counter()
+        self._run_time = 0.0
+        self._start_time = None
+        self._closed = False
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+        self._thread.start()
+
+    def _run_batch(self, batch_inputs):
+        """Run one batch.
+
+        Parameters
+        ----------
+        batch_inputs : List[Dict[str, np.ndarray]]
+            The inputs of the requests of the batch.
+
+        Returns
+        -------
+        outputs : List[List[np.ndarray]]
+            The outputs of every request.
+        """
+        raise NotImplementedError()
+
+    def _check_inputs(self, inputs):
+        """Convert the inputs of a request to numpy and check them against the first one."""
+        inputs = {
+            k: v.numpy() if isinstance(v, tvm.runtime.NDArray) else np.asarray(v)
+            for k, v in inputs.items()
+        }
+        with self._lock:
+            if self._input_specs is None:
+                self._input_specs = {k: (v.shape, v.dtype) for k, v in inputs.items()}
+        if set(inputs) != set(self._input_specs):
+            raise ValueError(
+                "Expect the inputs %s, but got %s" % (sorted(self._input_specs), sorted(inputs))
+            )
+        for k, v in inputs.items():
+            shape, dtype = self._input_specs[k]
+            if tuple(v.shape) != tuple(shape):
+                raise ValueError(
+                    "Expect a sample of shape %s for input %s, but got %s"
+                    % (tuple(shape), k, tuple(v.shape))
+                )
+            if v.dtype != np.dtype(dtype):
+                raise ValueError(
+                    "Expect a sample of dtype %s for input %s, but got %s"
+                    % (np.dtype(dtype), k, v.dtype)
+                )
+        return inputs
+
+    def submit(self, **inputs):
+        """Submit a request of one sample.
+
+        Parameters
+        ----------
+        inputs : dict of str to np.ndarray or NDArray
+            The inputs of the sample, without the batch axis.
+
+        Returns
+        -------
+        future : concurrent.futures.Future
+            The future of the outputs of the sample, a list of np.ndarray without the
+            batch axis.
+        """
+        if self._closed:
+            raise RuntimeError("The batcher is closed")
+        inputs = self._check_inputs(inputs)
+        future = concurrent.futures.Future()
+        submit_time = time.time()
+        # no request is queued after the sentinel of close
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("The batcher is closed")
+            if self._start_time is None:
+                self._start_time = submit_time
+            self._queue.put(_Request(inputs, future, submit_time))
+        return future
+
+    def infer(self, timeout=None, **inputs):
+        """Run the inference of one sample in the next batch and wait for its outputs.
+
+        Parameters
+        ----------
+        timeout : Optional[float]
+            The maximum time in seconds to wait for the outputs.
+
+        inputs : dict of str to np.ndarray or NDArray
+            The inputs of the sample, without the batch axis.
+
+        Returns
+        -------
+        outputs : List[np.ndarray]
+            The outputs of the sample, without the batch axis.
+        """
+        return self.submit(**inputs).result(timeout)
+
+    def _loop(self):
+        """Collect and run batches until closed."""
+        try:
+            self._collect_and_run()
+        finally:
+            # fail the requests left behind, so no caller waits forever
+            with self._lock:
+                self._closed = True
+            while True:
+                try:
+                    request = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if request is not None and request.future.set_running_or_notify_cancel():
+                    request.future.set_exception(RuntimeError("The batcher is closed"))
+
+    def _collect_and_run(self):
+        """Collect and run batches until the sentinel of close."""
+        closing = False
+        while not closing:
+            request = self._queue.get()
+            if request is None:
+                break
+            batch = [request]
+            deadline = request.submit_time + self.max_delay
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.time()
+                try:
+                    # after the deadline, still take the requests that already arrived
+                    if remaining > 0:
+                        request = self._queue.get(timeout=remaining)
+                    else:
+                        request = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if request is None:
+                    closing = True
+                    break
+                batch.append(request)
+            self._process(batch)
+
+    def _process(self, batch):
+        """Run a batch and resolve the futures of its requests."""
+        batch = [r for r in batch if r.future.set_running_or_notify_cancel()]
+        if not batch:
+            return
+        tic = time.time()
+        try:
+            outputs = self._run_batch([r.inputs for r in batch])
+        # pylint: disable=broad-except
+        except Exception as err:
+            for r in batch:
+                r.future.set_exception(err)
+            return
+        toc = time.time()
+        with self._lock:
+            self._run_time += toc - tic
+            self._batch_sizes[len(batch)] += 1
+            self._latencies.extend(toc - r.submit_time for r in batch)
+        for r, out in zip(batch, outputs):
+            r.future.set_result(out)
+
+    def stats(self):
+        """Get the latency and throughput statistics.
+
+        Returns
+        -------
+        stats : dict
+            "num_requests" and "num_batches", the "mean_batch_size", the "throughput" in
+            requests per second since the first request, the mean time of running a batch
+            "mean_run_ms", and the "mean", "p50", "p90" and "p99" request latencies in
+            milliseconds over the most recent requests.
+        """
+        with self._lock:
+            num_batches = sum(self._batch_sizes.values())
+            num_requests = sum(k * v for k, v in self._batch_sizes.items())
+            latencies = np.array(self._latencies) * 1000.0
+            elapsed = time.time() - self._start_time if self._start_time else 0.0
+            ret = {
+                "num_requests": num_requests,
+                "num_batches": num_batches,
+                "mean_batch_size": num_requests / num_batches if num_batches else 0.0,
+                "throughput": num_requests / elapsed if elapsed > 0 else 0.0,
+                "mean_run_ms": self._run_time * 1000.0 / num_batches if num_batches else 0.0,
+            }
+        if len(latencies):
+            ret["mean"] = float(np.mean(latencies))
+            for p in [50, 90, 99]:
+                ret["p%d" % p] = float(np.percentile(latencies, p))
+        return ret
+
+    def close(self):
+        """Run the pending requests and stop the background thread."""
+        with self._lock:
+            if not self._closed:
+                self._closed = True
+                self._queue.put(None)
+        self._thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def _stack(batch_inputs, name, buf):
+    """Stack the samples of an input into a batch buffer and zero the padding."""
+    for i, inputs in enumerate(batch_inputs):
+        buf[i] = inputs[name]
+    buf[len(batch_inputs) :] = 0
+
+
+class GraphExecutorBatcher(DynamicBatcher):
+    """Dynamic batching for a graph executor compiled for a fixed batch size.
+
+    The batch size is the first dimension of the inputs. Smaller batches are padded
+    with zeros.
+
+    Parameters
+    ----------
+    gmod : tvm.contrib.graph_executor.GraphModule
+        The graph executor. It must not be used by others while the batcher is open.
+
+    input_names : List[str]
+        The names of the inputs given by every request.
+
+    max_delay_ms : float
+        The maximum time in milliseconds the first request of a batch waits for more
+        requests before the batch runs.
+
+    max_latency_samples : int
+        The number of most recent request latencies kept for the statistics.
+    """
+
+    def __init__(self, gmod, input_names, max_delay_ms=5.0, max_latency_samples=10000):
+        self.gmod = gmod
+        self._buffers = {}
+        for name in input_names:
+            arr = gmod.get_input(name)
+            if arr is None:
+                raise ValueError("Could not find '%s' in graph's inputs" % name)
+            self._buffers[name] = np.zeros(arr.shape, arr.dtype)
+        batch_sizes = {buf.shape[0] for buf in self._buffers.values()}
+        if len(batch_sizes) != 1:
+            raise ValueError("The inputs have different batch sizes %s" % sorted(batch_sizes))
+        super(GraphExecutorBatcher, self).__init__(
+            batch_sizes.pop(),
+            max_delay_ms,
+            max_latency_samples,
+            {k: (buf.shape[1:], buf.dtype) for k, buf in self._buffers.items()},
+        )
+
+    def _run_batch(self, batch_inputs):
+        for name, buf in self._buffers.items():
+            _stack(batch_inputs, name, buf)
+            self.gmod.set_input(name, buf)
+        self.gmod.run()
+        outputs = [self.gmod.get_output(i).numpy() for i in range(self.gmod.get_num_outputs())]
+        return [[out[i] for out in outputs] for i in range(len(batch_inputs))]
+
+
+class VirtualMachineBatcher(DynamicBatcher):
+    """Dynamic batching for a Relay VM.
+
+    The samples are stacked along a new first axis. For models compiled with a dynamic
+    batch dimension, set `pad_to_max_batch_size` to False to run batches of the exact
+    number of requests.
+
+    Parameters
+    ----------
+    vm : tvm.runtime.vm.VirtualMachine
+        The virtual machine. It must not be used by others while the batcher is open.
+
+    max_batch_size : int
+        The maximum number of samples in a batch.
+
+    device : Device
+        The device of the inputs of the VM.
+
+    func_name : str
+        The name of the function to invoke.
+
+    pad_to_max_batch_size : bool
+        Whether to pad every batch to `max_batch_size` samples with zeros.
+
+    max_delay_ms : float
+        The maximum time in milliseconds the first request of a batch waits for more
+        requests before the batch runs.
+
+    max_latency_samples : int
+        The number of most recent request latencies kept for the statistics.
+    """
+
+    def __init__(
+        self,
+        vm,
+        max_batch_size,
+        device=tvm.runtime.cpu(0),
+        func_name="main",
+        pad_to_max_batch_size=True,
+        max_delay_ms=5.0,
+        max_latency_samples=10000,
+    ):
+        self.vm = vm
+        self.device = device
+        self.func_name = func_name
+        self.pad_to_max_batch_size = pad_to_max_batch_size
+        self._buffers = None
+        # the device arrays of every batch size that ran, allocated once
+        self._arrays = {}
+        super(VirtualMachineBatcher, self).__init__(
+            max_batch_size, max_delay_ms, max_latency_samples
+        )
+
+    def _run_batch(self, batch_inputs):
+        if self._buffers is None:
+            self._buffers = {
+                k: np.zeros((self.max_batch_size,) + tuple(shape), dtype)
+                for k, (shape, dtype) in self._input_specs.items()
+            }
+        n = self.max_batch_size if self.pad_to_max_batch_size else len(batch_inputs)
+        if n not in self._arrays:
+            self._arrays[n] = {
+                k: tvm.runtime.ndarray.empty((n,) + buf.shape[1:], buf.dtype, self.device)
+                for k, buf in self._buffers.items()
+            }
+        arrays = self._arrays[n]
+        for name, buf in self._buffers.items():
+            _stack(batch_inputs, name, buf)
+            arrays[name].copyfrom(buf[:n])
+        ret = self.vm.invoke(self.func_name, **arrays)
+        if isinstance(ret, tvm.runtime.NDArray):
+            ret = [ret]
+        outputs = [ret[i].numpy() for i in range(len(ret))]
+        return [[out[i] for out in outputs] for i in range(len(batch_inputs))]
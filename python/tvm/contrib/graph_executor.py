@@ -15,6 +15,12 @@
 # specific language governing permissions and limitations
 # under the License.
 """Minimum graph executor that executes graph containing TVM PackedFunc."""
+import contextlib
+import queue
+import struct
+import threading
+import time
+
 import numpy as np
 import tvm._ffi
 
@@ -23,6 +29,9 @@ from tvm.rpc import base as rpc_base
 from tvm._ffi.base import string_types
 from tvm._ffi.runtime_ctypes import Device
 
+# The alignment of zero copy inputs and outputs, kAllocAlignment of the runtime
+_ZERO_COPY_ALIGNMENT = 128
+
 
 def create(graph_json_str, libmod, device):
     """Create a runtime executor module given a graph and module.
@@ -66,6 +75,64 @@ def create(graph_json_str, libmod, device):
     return GraphModule(fcreate(graph_json_str, libmod, *device_type_id))
 
 
+def aligned_empty(shape, dtype="float32", alignment=_ZERO_COPY_ALIGNMENT):
+    """Allocate an uninitialized numpy array whose data is aligned to `alignment` bytes.
+
+    Such arrays can be bound to a GraphModule with `set_input_zero_copy` and
+    `set_output_zero_copy`.
+
+    Parameters
+    ----------
+    shape : tuple of int
+        The shape of the array.
+
+    dtype : str or numpy.dtype
+        The data type of the array.
+
+    alignment : int
+        The alignment in bytes.
+
+    Returns
+    -------
+    arr : numpy.ndarray
+        The aligned array.
+    """
+    dtype = np.dtype(dtype)
+    nbytes = int(np.prod(shape)) * dtype.itemsize
+    buf = np.empty(nbytes + alignment, dtype=np.uint8)
+    offset = -buf.ctypes.data % alignment
+    return np.ndarray(shape, dtype=dtype, buffer=buf, offset=offset)
+
+
+def _zero_copy_array(value, expected, name):
+    """Wrap a caller owned buffer as an NDArray without copying, and validate it
+    against the internal tensor of the graph executor."""
+    if isinstance(value, np.ndarray) and not value.flags.c_contiguous:
+        raise ValueError("The buffer of %s has to be C contiguous" % name)
+    if isinstance(value, tvm.runtime.NDArray):
+        arr = value
+    elif hasattr(value, "__dlpack__"):
+        arr = tvm.runtime.ndarray.from_dlpack(value)
+    else:
+        raise TypeError("The buffer of %s has to be an NDArray or support DLPack" % name)
+    if tuple(arr.shape) != tuple(expected.shape) or arr.dtype != expected.dtype:
+        raise ValueError(
+            "Expect a buffer of shape %s and dtype %s for %s, but got shape %s and dtype %s"
+            % (tuple(expected.shape), expected.dtype, name, tuple(arr.shape), arr.dtype)
+        )
+    if arr.device != expected.device:
+        raise ValueError(
+            "Expect a buffer on %s for %s, but got %s" % (expected.device, name, arr.device)
+        )
+    data = arr.handle.contents.data or 0
+    if arr.handle.contents.byte_offset != 0 or data % _ZERO_COPY_ALIGNMENT != 0:
+        raise ValueError(
+            "The buffer of %s has to be aligned to %d bytes, see aligned_empty"
+            % (name, _ZERO_COPY_ALIGNMENT)
+        )
+    return arr
+
+
 def get_device(libmod, device):
     """Parse and validate all the device(s).
 
@@ -161,6 +228,11 @@ class GraphModule(object):
         self._get_num_inputs = module["get_num_inputs"]
         self._load_params = module["load_params"]
         self._share_params = module["share_params"]
+        # looked up on first use, since not every graph executor has them
+        self._set_input_zero_copy = None
+        self._set_output_zero_copy = None
+        # the buffers bound without copy, which the executor refers to but does not own
+        self._zero_copy_buffers = {}
 
     def set_input(self, key=None, value=None, **params):
         """Set inputs to the module via kwargs
@@ -194,6 +266,62 @@ class GraphModule(object):
                 if val:
                     self._get_input(k).copyfrom(params[k])
 
+    def set_input_zero_copy(self, key=None, value=None, **params):
+        """Bind caller owned buffers as inputs, without copying them.
+
+        The buffers are read by every following run, so they can be updated in place
+        between runs. They must have the shape and dtype of the inputs, be contiguous,
+        be on the device of the inputs and be aligned to 128 bytes (see `aligned_empty`).
+        The module keeps a reference to the bound buffers. Once an input is bound,
+        `set_input` on it has no effect.
+
+        Parameters
+        ----------
+        key : int or str
+           The input key
+
+        value : NDArray, or an array supporting DLPack such as numpy.ndarray
+           The input buffer
+
+        params : dict of str to NDArray or DLPack array
+           Additional arguments
+        """
+        if key is not None:
+            params = dict(params)
+            params[key] = value
+        for k, v in params.items():
+            index = self.get_input_index(k) if isinstance(k, string_types) else k
+            expected = self._get_input(index) if index >= 0 else None
+            if expected is None:
+                raise RuntimeError("Could not find '%s' in graph's inputs" % k)
+            arr = _zero_copy_array(v, expected, "input %s" % k)
+            if self._set_input_zero_copy is None:
+                self._set_input_zero_copy = self.module["set_input_zero_copy"]
+            self._set_input_zero_copy(index, arr)
+            self._zero_copy_buffers["input", index] = arr
+
+    def set_output_zero_copy(self, index, value):
+        """Bind a caller owned buffer as an output, without copying it.
+
+        Every following run writes the output to the buffer, so it needs no `get_output`.
+        The buffer has the same requirements as the ones of `set_input_zero_copy`.
+
+        Parameters
+        ----------
+        index : int
+            The output index
+
+        value : NDArray, or an array supporting DLPack such as numpy.ndarray
+            The output buffer
+        """
+        if not 0 <= index < self.get_num_outputs():
+            raise IndexError("The graph has no output %s" % index)
+        arr = _zero_copy_array(value, self._get_output(index), "output %d" % index)
+        if self._set_output_zero_copy is None:
+            self._set_output_zero_copy = self.module["set_output_zero_copy"]
+        self._set_output_zero_copy(index, arr)
+        self._zero_copy_buffers["output", index] = arr
+
     def run(self, **input_dict):
         """Run forward execution of the graph
 
@@ -407,3 +535,158 @@ class GraphModule(object):
         return self.module.time_evaluator(
             func_name, device, repeat=repeat, number=number, min_repeat_ms=min_repeat_ms
         )()
+
+
+# The magic number of the parameter blobs of tvm.runtime.save_param_dict
+_PARAM_DICT_MAGIC = 0xF7E58D4F05049CB7
+
+
+def _param_names_blob(names):
+    """Serialize the head of a parameter blob, which is all share_params reads.
+
+    It follows the layout of tvm.runtime.save_param_dict up to the tensor count,
+    without serializing the tensors themselves.
+    """
+    names = [name.encode() for name in names]
+    blob = struct.pack("<QQQ", _PARAM_DICT_MAGIC, 0, len(names))
+    for name in names:
+        blob += struct.pack("<Q", len(name)) + name
+    return bytearray(blob + struct.pack("<Q", len(names)))
+
+
+class GraphExecutorPool(object):
+    """A pool of graph executors over one library, which share one copy of the parameters.
+
+    Every instance has its own inputs, outputs and intermediate storage, so worker threads
+    can run inference concurrently on different instances. The parameters are only loaded
+    into the first instance, and the others reference them with `share_params`.
+
+    Each instance runs its operators on the TVM thread pool of the calling thread, so
+    limit TVM_NUM_THREADS to keep `num_instances` x threads below the number of cores.
+
+    Parameters
+    ----------
+    graph_json_str : str
+        The graph to be deployed in json format output by json graph.
+
+    libmod : tvm.runtime.Module
+        The module of the corresponding function
+
+    device : Device or list of Device
+        The local device(s) to deploy the module.
+
+    params : dict of str to NDArray, or bytearray
+        The parameter dict, or the parameters serialized by tvm.runtime.save_param_dict.
+
+    num_instances : int
+        The number of executor instances.
+
+    Examples
+    --------
+
+    .. code-block:: python
+
+        lib = relay.build(mod, target="llvm", params=params)
+        pool = graph_executor.GraphExecutorPool(
+            lib.get_graph_json(), lib.get_lib(), tvm.cpu(0), lib.get_params(), num_instances=4
+        )
+        # from any number of worker threads
+        outputs = pool.run(data=data)
+        # or, to control inputs and outputs directly
+        with pool.instance() as gmod:
+            gmod.set_input("data", data)
+            gmod.run()
+            out = gmod.get_output(0).numpy()
+        print(pool.stats())
+    """
+
+    def __init__(self, graph_json_str, libmod, device, params, num_instances):
+        if num_instances < 1:
+            raise ValueError("num_instances has to be positive")
+        _, num_rpc_dev, _ = get_device(libmod, device)
+        if num_rpc_dev:
+            raise ValueError("GraphExecutorPool only supports local devices")
+
+        self.instances = [create(graph_json_str, libmod, device) for _ in range(num_instances)]
+        if isinstance(params, (bytes, bytearray)):
+            self.instances[0].load_params(params)
+            params_bytes = bytearray(params)
+        else:
+            self.instances[0].set_input(**params)
+            params_bytes = _param_names_blob(params.keys())
+        for inst in self.instances[1:]:
+            inst.share_params(self.instances[0], params_bytes)
+
+        self._free = queue.LifoQueue()
+        for i in range(num_instances):
+            self._free.put(i)
+        self._lock = threading.Lock()
+        self._num_runs = [0] * num_instances
+        self._busy_time = [0.0] * num_instances
+        self._start_time = time.time()
+
+    @contextlib.contextmanager
+    def instance(self, timeout=None):
+        """Lease a free executor instance for the duration of a with block.
+
+        Parameters
+        ----------
+        timeout : Optional[float]
+            The maximum time in seconds to wait for a free instance.
+
+        Returns
+        -------
+        graph_module : GraphModule
+            The leased instance. It must not be used after the with block.
+        """
+        try:
+            idx = self._free.get(timeout=timeout)
+        except queue.Empty:
+            raise TimeoutError("No free graph executor instance within %s s" % timeout) from None
+        tic = time.time()
+        try:
+            yield self.instances[idx]
+        finally:
+            with self._lock:
+                self._num_runs[idx] += 1
+                self._busy_time[idx] += time.time() - tic
+            self._free.put(idx)
+
+    def run(self, timeout=None, **input_dict):
+        """Run the graph on a free instance and return copies of the outputs.
+
+        Parameters
+        ----------
+        timeout : Optional[float]
+            The maximum time in seconds to wait for a free instance.
+
+        input_dict: dict of str to NDArray
+            The input values.
+
+        Returns
+        -------
+        outputs : List[NDArray]
+            The outputs, copied to the host so they stay valid after the instance is released.
+        """
+        with self.instance(timeout) as gmod:
+            gmod.run(**input_dict)
+            return [
+                gmod.get_output(i).copyto(tvm.runtime.cpu(0))
+                for i in range(gmod.get_num_outputs())
+            ]
+
+    def stats(self):
+        """Get the per-instance utilization since the creation of the pool.
+
+        Returns
+        -------
+        stats : List[dict]
+            For every instance, the number of leases "num_runs", the time in seconds it was
+            leased "busy_time", and the fraction of the wall time it was leased "utilization".
+        """
+        elapsed = max(time.time() - self._start_time, 1e-9)
+        with self._lock:
+            return [
+                {"num_runs": n, "busy_time": t, "utilization": t / elapsed}
+                for n, t in zip(self._num_runs, self._busy_time)
+            ]
@@ -22,7 +22,10 @@ with additional timeout support.
 """
 import os
 import sys
+import time
+import queue
 import struct
+import importlib
 import threading
 import subprocess
 import concurrent.futures
@@ -79,6 +82,12 @@ class MapResult(namedtuple("MapResult", ["status", "value"])):
     __slots__ = []
 
 
+def _preload_modules(names):
+    """Import modules in a worker process."""
+    for name in names:
+        importlib.import_module(name)
+
+
 class PopenWorker:
     """A subprocess worker via Popen.
 
@@ -92,12 +101,20 @@ class PopenWorker:
 
     initargs: Tuple[object]
         A tuple of args for the initializer
+
+    preload_modules: Tuple[str]
+        Names of modules imported by the process when it starts, before the initializer.
+
+    on_spawn: callable or None
+        Called with the number of seconds it took to start a process, every time one is started.
     """
 
-    def __init__(self, initializer=None, initargs=()):
+    def __init__(self, initializer=None, initargs=(), preload_modules=(), on_spawn=None):
         self._proc = None
         self._initializer = initializer
         self._initargs = initargs
+        self._preload_modules = tuple(preload_modules)
+        self._on_spawn = on_spawn
         if self._initializer is not None and not callable(self._initializer):
             raise TypeError("initializer must be callable for PopenWorker")
 
@@ -165,6 +182,25 @@ class PopenWorker:
         self._reader = os.fdopen(main_read, "rb")
         self._writer = os.fdopen(main_write, "wb")
 
+    def start(self):
+        """Start the process if it is not running, and wait until it is ready to serve.
+
+        The process is ready once it has imported tvm and the preloaded modules and
+        has run the initializer.
+        """
+        if self._proc is not None:
+            return
+        tic = time.time()
+        self._start()
+        if self._preload_modules:
+            self.send(_preload_modules, (self._preload_modules,))
+            self.recv()
+        if self._initializer is not None:
+            self.send(self._initializer, self._initargs)
+            self.recv()
+        if self._on_spawn is not None:
+            self._on_spawn(time.time() - tic)
+
     def join(self, timeout=None):
         """Join the current process worker before it terminates.
 
@@ -214,11 +250,7 @@ class PopenWorker:
         import cloudpickle
 
         if self._proc is None:
-            self._start()
-            # init
-            if self._initializer is not None:
-                self.send(self._initializer, self._initargs)
-                self.recv()
+            self.start()
         kwargs = {} if not kwargs else kwargs
         data = cloudpickle.dumps((fn, args, kwargs, timeout), protocol=pickle.HIGHEST_PROTOCOL)
         try:
@@ -292,6 +324,20 @@ class PopenPoolExecutor:
     initargs: Tuple[object]
         A tuple of args for the initializer
 
+    warm : bool
+        If True, keep `num_spares` started spare workers. A worker killed by a timeout
+        or crash is replaced by a spare instead of being restarted on the next job, so
+        jobs do not wait for the replacement to import tvm and run the initializer.
+
+    num_spares : int
+        The number of spare workers kept started in warm mode.
+
+    prestart : bool
+        If True in warm mode, also start `max_workers` workers ahead of the first jobs.
+
+    preload_modules : Tuple[str]
+        Names of modules imported by each worker when it starts.
+
     Note
     ----
     If max_workers is NONE then the number returned by
@@ -299,41 +345,131 @@ class PopenPoolExecutor:
     behavior of multiprocessing.pool().
     """
 
-    def __init__(self, max_workers=None, timeout=None, initializer=None, initargs=()):
+    def __init__(
+        self,
+        max_workers=None,
+        timeout=None,
+        initializer=None,
+        initargs=(),
+        warm=False,
+        num_spares=1,
+        preload_modules=(),
+        prestart=False,
+    ):
+        # the state read by shutdown, which __del__ calls even if the arguments are invalid
+        self._lock = threading.Lock()
+        self._is_shutdown = False
+        self._worker_map = {}
+        self._spares = queue.Queue()
+        self._spawner = None
+        self._threadpool = None
+
         if max_workers is None:
             max_workers = os.cpu_count()
         # Use an internal thread pool to send to popen workers
         self._threadpool = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
         self._timeout = timeout
-        self._worker_map = {}
-        self._lock = threading.Lock()
         self._initializer = initializer
         self._initargs = initargs
+        self._preload_modules = tuple(preload_modules)
+        self._stats = {"spawn_count": 0, "spawn_time": 0.0, "respawn_count": 0, "wait_time": 0.0}
 
         if self._initializer is not None and not callable(self._initializer):
             raise TypeError("initializer must be callable for PopenPoolExecutor")
 
+        self._warm = warm
+        if warm:
+            self._spawner = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
+            for _ in range(num_spares + (max_workers if prestart else 0)):
+                self._request_spare()
+
     def __del__(self):
-        self._lock.acquire()
-        for worker in self._worker_map.values():
+        self.shutdown()
+
+    def shutdown(self):
+        """Kill the worker processes and stop the internal threads.
+
+        The executor can not be used afterwards. Calling it again has no effect.
+        """
+        with self._lock:
+            if self._is_shutdown:
+                return
+            self._is_shutdown = True
+            workers = list(self._worker_map.values())
+            self._worker_map.clear()
+        if self._spawner is not None:
+            # wait for the spares being started, so they are killed below
+            self._spawner.shutdown(wait=True)
+        while not self._spares.empty():
+            workers.append(self._spares.get_nowait())
+        for worker in workers:
             try:
                 worker.kill()
             except ImportError:
                 pass
-        self._lock.release()
-        self._threadpool.shutdown()
+        if self._threadpool is not None:
+            self._threadpool.shutdown()
+
+    def _on_spawn(self, seconds):
+        with self._lock:
+            self._stats["spawn_count"] += 1
+            self._stats["spawn_time"] += seconds
+
+    def _new_worker(self):
+        return PopenWorker(
+            self._initializer, self._initargs, self._preload_modules, on_spawn=self._on_spawn
+        )
+
+    def _start_spare(self):
+        worker = self._new_worker()
+        try:
+            worker.start()
+        except Exception:  # pylint: disable=broad-except
+            # let the job thread start it and surface the error
+            worker.kill()
+        self._spares.put(worker)
+
+    def _request_spare(self):
+        self._spawner.submit(self._start_spare)
+
+    def stats(self):
+        """Get the statistics of worker processes.
+
+        Returns
+        -------
+        stats : Dict[str, Union[int, float]]
+            "spawn_count": the number of worker processes started.
+            "spawn_time": the seconds spent to start them, including the initializer.
+            "respawn_count": the number of workers replaced after a timeout or crash.
+            "wait_time": the seconds jobs waited for a worker process to be ready.
+        """
+        with self._lock:
+            return dict(self._stats)
 
     def _worker_run(self, fn, args, kwargs):
         """Internal thread runner."""
+        tic = time.time()
         self._lock.acquire()
         tid = threading.get_ident()
-        if tid not in self._worker_map:
-            proc = PopenWorker(self._initializer, self._initargs)
-            self._worker_map[tid] = proc
-        else:
-            proc = self._worker_map[tid]
+        proc = self._worker_map.get(tid)
+        if proc is not None and not proc.is_alive():
+            self._stats["respawn_count"] += 1
+            if self._warm:
+                proc = None
         self._lock.release()
 
+        if proc is None:
+            if self._warm:
+                proc = self._spares.get()
+                self._request_spare()
+            else:
+                proc = self._new_worker()
+            with self._lock:
+                self._worker_map[tid] = proc
+        proc.start()
+        with self._lock:
+            self._stats["wait_time"] += time.time() - tic
+
         proc.send(fn, args, kwargs, self._timeout)
         return proc.recv()
 
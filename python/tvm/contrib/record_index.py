@@ -0,0 +1,142 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Best record index of tuning logs with one json record per line.
+
+The index maps (target key, workload key) and (target model, workload key) to the
+byte offset and mean cost of the best valid record of a log. It is kept in a
+``<log>.bestidx`` file next to the log, so that only the lines appended since it was
+written are scanned. The format of the records is given by a callback, which is how
+autotvm and auto_scheduler logs share this module.
+"""
+import hashlib
+import json
+import os
+
+from tvm.target import Target
+
+# The version of the format of best record index files
+BEST_INDEX_VERSION = 2
+
+
+def _covered_digest(filename, covered):
+    """Digest the head and the tail of the part of a log file covered by an index.
+
+    Together with the inode, this detects logs that were rewritten or truncated
+    since the index was written, whose byte offsets would be stale.
+    """
+    with open(filename, "rb") as fin:
+        digest = hashlib.sha1(fin.read(min(covered, 4096)))
+        if covered > 4096:
+            fin.seek(max(covered - 4096, 4096))
+            digest.update(fin.read(covered - fin.tell()))
+    return digest.hexdigest()
+
+
+def _load_cached(cache_file, filename, stat):
+    """Load the index file of a log, or return None if it does not match the log."""
+    try:
+        with open(cache_file) as fin:
+            cached = json.load(fin)
+    except (OSError, ValueError):
+        return None
+    if (
+        cached.get("version") != BEST_INDEX_VERSION
+        or cached["inode"] != stat.st_ino
+        or cached["covered"] > stat.st_size
+        or cached["digest"] != _covered_digest(filename, cached["covered"])
+    ):
+        return None
+    return cached
+
+
+def load_best_index(filename, parse_line, use_cache=True):
+    """Get the best record index of a log file without decoding its records.
+
+    Parameters
+    ----------
+    filename : str
+        The log file.
+    parse_line : Callable[[bytes], Optional[Tuple[float, str, str]]]
+        Parse a line of the log into the mean cost, the target string and the workload
+        key of a valid record, or return None to skip the line.
+    use_cache : bool = True
+        Whether to reuse and update the index file.
+
+    Returns
+    -------
+    index : Dict[str, Dict[Tuple[str, str], Tuple[int, float]]]
+        A dict with keys "targetkey" and "model", each mapping (key, workload key)
+        to (offset, cost).
+    """
+    cache_file = filename + ".bestidx"
+    stat = os.stat(filename)
+    index = {"targetkey": {}, "model": {}}
+    covered = 0
+
+    cached = _load_cached(cache_file, filename, stat) if use_cache else None
+    if cached is not None:
+        covered = cached["covered"]
+        for kind in index:
+            index[kind] = {(k, wkl): (offset, cost) for k, wkl, offset, cost in cached[kind]}
+
+    if covered == stat.st_size:
+        return index
+
+    target_keys = {}
+    with open(filename, "rb") as fin:
+        fin.seek(covered)
+        offset = covered
+        for line in fin:
+            if not line.endswith(b"\n"):
+                # an unfinished line of a log that is still being written
+                break
+            row_offset, offset = offset, offset + len(line)
+            if not line.strip() or line.startswith(b"#"):
+                continue
+            parsed = parse_line(line)
+            if parsed is None:
+                continue
+            cost, target, workload_key = parsed
+
+            if target not in target_keys:
+                tgt = Target(target)
+                target_keys[target] = (list(tgt.keys), tgt.model)
+            keys, model = target_keys[target]
+
+            entries = [("targetkey", k) for k in keys]
+            if model != "unknown":
+                entries.append(("model", model))
+            for kind, k in entries:
+                best = index[kind]
+                if (k, workload_key) not in best or best[(k, workload_key)][1] > cost:
+                    best[(k, workload_key)] = (row_offset, cost)
+        covered = offset
+
+    if use_cache:
+        cached = {
+            "version": BEST_INDEX_VERSION,
+            "covered": covered,
+            "inode": stat.st_ino,
+            "digest": _covered_digest(filename, covered),
+        }
+        for kind, best in index.items():
+            cached[kind] = [[k, wkl, offset, cost] for (k, wkl), (offset, cost) in best.items()]
+        tmp = cache_file + ".tmp.%d" % os.getpid()
+        with open(tmp, "w") as fout:
+            json.dump(cached, fout)
+        os.replace(tmp, cache_file)
+    return index
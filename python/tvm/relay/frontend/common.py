@@ -18,6 +18,9 @@
 """Common utilities"""
 from __future__ import absolute_import as _abs
 import logging
+import threading
+from collections import OrderedDict
+
 import numpy as np
 
 import tvm
@@ -29,6 +32,7 @@ from .. import function as _function
 from .. import transform as _transform
 from .. import op as _op
 from .. import analysis
+from ..expr_functor import ExprMutator
 
 # pylint: disable=invalid-name
 logger = logging.getLogger("Common")
@@ -472,8 +476,131 @@ def get_name(node):
     return name
 
 
+# Relay objects only compare equal in Python dictionaries if they are the same
+# C++ object, so the nodes handed to converters can be used as keys of the
+# type memo while the nodes visited inside a mutator are mapped back to them.
+# https://discuss.tvm.apache.org/t/round-tripping-objects-through-the-ffi/8440
+class _TypeFinder(ExprMutator):
+    """Replace the subexpressions of known types by variables annotated with their types."""
+
+    def __init__(self, types):
+        super().__init__()
+        self.counter = 0
+        self.vars = {}
+        self.types = types
+        self.leave = set()  # some variables are not inputs
+
+    def visit_let(self, let):
+        self.leave.add(let.var)
+        return super().visit_let(let)
+
+    def visit_function(self, fn):
+        self.leave.update(fn.params)
+        return super().visit_function(fn)
+
+    def visit(self, expr):
+        if expr in self.leave:
+            return super().visit(expr)
+        if expr in self.vars:
+            return self.vars[expr]
+        if isinstance(expr, _expr.Var):
+            self.vars[expr] = expr
+            return expr
+        if expr in self.types:
+            ty = self.types[expr]
+            v = _expr.var("_{}".format(self.counter), type_annotation=ty)
+            self.counter += 1
+            self.vars[expr] = v
+            return v
+        v = super().visit(expr)
+        return v
+
+
+class IncrementalTypeInference(object):
+    """Infer the types of a graph under construction incrementally.
+
+    The checked types of inferred nodes are memoized. Inferring a new node only
+    type checks the subexpressions which have not been typed before; the typed
+    ones are replaced by variables of their types. This keeps the cost of each
+    call proportional to the newly added nodes instead of the whole graph.
+
+    When used as a context, `infer_type` and `infer_shape` go through it.
+
+    Examples
+    --------
+    .. code-block:: python
+
+        with IncrementalTypeInference():
+            mod, params = converter.from_onnx(graph, opset)
+    """
+
+    current = None
+
+    def __init__(self):
+        self.types = {}  # map from nodes to their checked types
+        self._old_ctx = None
+
+    def __enter__(self):
+        self._old_ctx = IncrementalTypeInference.current
+        IncrementalTypeInference.current = self
+        return self
+
+    def __exit__(self, ptype, value, trace):
+        IncrementalTypeInference.current = self._old_ctx
+
+    def infer_typed_expr(self, node, mod=None):
+        """Infer the type of a node.
+
+        Parameters
+        ----------
+        node : relay.Expr
+            The node.
+        mod : Optional[IRModule]
+            The module holding the global definitions used by the node.
+
+        Returns
+        -------
+        expr : relay.Expr
+            An expression of the type of the node, with `checked_type` populated.
+            Its typed subexpressions may be replaced by variables.
+        """
+        finder = _TypeFinder(types=self.types)
+        new_node = finder.visit(node)
+        fn = _function.Function(list(finder.vars.values()), new_node)
+        new_mod = IRModule({"main": fn})
+        if mod is not None:
+            new_mod.update(mod)
+        new_mod = _transform.RemoveUnusedFunctions()(new_mod)
+        new_mod = _transform.InferType()(new_mod)
+        ret = new_mod["main"].body
+        self.types[node] = ret.checked_type
+        return ret
+
+    def infer_type(self, node, mod=None):
+        """Infer the checked type of a node.
+
+        Parameters
+        ----------
+        node : relay.Expr
+            The node.
+        mod : Optional[IRModule]
+            The module holding the global definitions used by the node.
+
+        Returns
+        -------
+        ty : relay.Type
+            The checked type of the node.
+        """
+        if node in self.types:
+            return self.types[node]
+        return self.infer_typed_expr(node, mod).checked_type
+
+
 def infer_type(node, mod=None):
     """A method to infer the type of an intermediate node in the relay graph."""
+    ctx = IncrementalTypeInference.current
+    if ctx is not None and mod is None and not isinstance(node, _function.Function):
+        return ctx.infer_typed_expr(node)
     if isinstance(mod, IRModule):
         mod["main"] = _function.Function(tvm.relay.analysis.free_vars(node), node)
         mod = _transform.InferType()(mod)
@@ -509,8 +636,11 @@ def infer_channels(inputs, transpose=False):
 
 def infer_shape(inputs, mod=None):
     """A method to get the output type of an intermediate node in the graph."""
-    out_type = infer_type(inputs, mod=mod)
-    checked_type = out_type.checked_type
+    ctx = IncrementalTypeInference.current
+    if ctx is not None and mod is None and not isinstance(inputs, _function.Function):
+        checked_type = ctx.infer_type(inputs)
+    else:
+        checked_type = infer_type(inputs, mod=mod).checked_type
     if hasattr(checked_type, "shape"):
         # Regular operator that outputs tensors
         return get_const_tuple(checked_type.shape)
@@ -518,6 +648,155 @@ def infer_shape(inputs, mod=None):
     return checked_type
 
 
+class ConstantEvaluator(object):
+    """Evaluate subexpressions of frontend graphs, reusing compiled modules across calls.
+
+    Expressions are compiled with their free variables as inputs, so a compiled
+    module is shared by all the structurally equal expressions, whatever the values
+    of their inputs. The values are memoized too, keyed by the structural hash of
+    the expression and the identities of its input arrays.
+
+    When used as a context, `infer_value` goes through it. The modules and values
+    are dropped when the context exits, so they do not outlive one import.
+
+    Examples
+    --------
+    .. code-block:: python
+
+        with ConstantEvaluator():
+            mod, params = converter.from_onnx(graph, opset)
+
+    Parameters
+    ----------
+    max_modules : int
+        The maximum number of compiled modules kept. The least recently used is dropped.
+    max_values : int
+        The maximum number of memoized values kept. The least recently used is dropped.
+    """
+
+    current = None
+
+    def __init__(self, max_modules=256, max_values=1024):
+        self._old_ctx = None
+        self.max_modules = max_modules
+        self.max_values = max_values
+        # structural hash -> [(function, graph module or None if it cannot be built)]
+        self._modules = OrderedDict()
+        # (structural hash, ids of inputs) -> (function, inputs, value)
+        self._values = OrderedDict()
+        self._lock = threading.Lock()
+        self.num_builds = 0
+        self.num_module_hits = 0
+        self.num_value_hits = 0
+
+    def __enter__(self):
+        self._old_ctx = ConstantEvaluator.current
+        ConstantEvaluator.current = self
+        return self
+
+    def __exit__(self, ptype, value, trace):
+        ConstantEvaluator.current = self._old_ctx
+        self.clear()
+
+    def clear(self):
+        """Drop all compiled modules and memoized values."""
+        with self._lock:
+            self._modules.clear()
+            self._values.clear()
+
+    @staticmethod
+    def _put(cache, key, value, max_size):
+        cache[key] = value
+        cache.move_to_end(key)
+        while len(cache) > max_size:
+            cache.popitem(last=False)
+
+    def _get_module(self, func, key):
+        """Get a structurally equal function and its compiled module, or None if it
+        cannot be compiled."""
+        # pylint: disable=import-outside-toplevel
+        from tvm.contrib import graph_executor
+
+        with self._lock:
+            for cached_func, module in self._modules.get(key, []):
+                if tvm.ir.structural_equal(cached_func, func):
+                    self._modules.move_to_end(key)
+                    self.num_module_hits += 1
+                    return cached_func, module
+
+        try:
+            with tvm.transform.PassContext(opt_level=0):
+                lib = tvm.relay.build(func, target="llvm")
+            module = graph_executor.GraphModule(lib["default"](tvm.cpu(0)))
+        # pylint: disable=broad-except
+        except Exception:
+            module = None
+
+        with self._lock:
+            self.num_builds += 1
+            entries = self._modules.get(key, [])
+            entries.append((func, module))
+            self._put(self._modules, key, entries, self.max_modules)
+        return func, module
+
+    def evaluate(self, input_val, params, mod=None):
+        """Evaluate an expression.
+
+        Parameters
+        ----------
+        input_val : relay.Expr
+            The expression.
+        params : Dict[str, Union[tvm.nd.NDArray, np.ndarray]]
+            The values of the free variables of the expression, by name.
+        mod : Optional[IRModule]
+            The module used by the interpreter if the expression cannot be compiled.
+
+        Returns
+        -------
+        value : tvm.nd.NDArray
+            The value of the expression.
+        """
+        func = _function.Function(analysis.free_vars(input_val), input_val)
+        inputs = [params[param.name_hint] for param in func.params]
+        key = tvm.ir.structural_hash(func)
+        value_key = (key, tuple(id(inp) for inp in inputs))
+
+        with self._lock:
+            hit = self._values.get(value_key)
+            if hit is not None and tvm.ir.structural_equal(hit[0], func):
+                self._values.move_to_end(value_key)
+                self.num_value_hits += 1
+                return hit[2]
+
+        value = None
+        compiled_func, module = self._get_module(func, key)
+        if module is not None:
+            try:
+                with self._lock:
+                    # a graph module holds a single set of inputs and outputs, named
+                    # after the parameters of the function it was compiled from
+                    for param, inp in zip(compiled_func.params, inputs):
+                        module.set_input(param.name_hint, inp)
+                    module.run()
+                    value = module.get_output(0).copyto(tvm.cpu(0))
+            # pylint: disable=broad-except
+            except Exception:
+                value = None
+        if value is None:
+            if isinstance(mod, IRModule):
+                mod["main"] = func
+            else:
+                mod = IRModule.from_expr(func)
+            value = tvm.relay.create_executor(
+                "debug", mod=mod, device=tvm.cpu(), target="llvm"
+            ).evaluate()(*inputs)
+
+        with self._lock:
+            # keep the inputs alive, so that their ids are not reused
+            self._put(self._values, value_key, (func, inputs, value), self.max_values)
+        return value
+
+
 def infer_value(input_val, params, mod=None):
     """A hack for getting the value of an expression by evaluating a
     portion of the relay graph. This is often needed for functions that
@@ -528,30 +807,8 @@ def infer_value(input_val, params, mod=None):
         var.name_hint in params.keys() for var in analysis.free_vars(input_val)
     ), "All inputs to infer must be available in params."
     assert tvm.runtime.enabled("llvm"), "LLVM must be enabled to infer value."
-    try:
-        # TODO(kevinthesun): Use VM for all cases.
-        # pylint: disable=import-outside-toplevel
-        from tvm.contrib import graph_executor
-
-        func = _function.Function(analysis.free_vars(input_val), input_val)
-        with tvm.transform.PassContext(opt_level=0):
-            lib = tvm.relay.build(func, target="llvm", params=params)
-        dev = tvm.cpu(0)
-        m = graph_executor.GraphModule(lib["default"](dev))
-        m.run()
-        return m.get_output(0)
-    except Exception:
-        if isinstance(mod, IRModule):
-            mod["main"] = _function.Function(analysis.free_vars(input_val), input_val)
-        else:
-            mod = IRModule.from_expr(input_val)
-        inputs = []
-        for param in mod["main"].params:
-            inputs.append(params[param.name_hint])
-        result = tvm.relay.create_executor(
-            "debug", mod=mod, device=tvm.cpu(), target="llvm"
-        ).evaluate()(*inputs)
-        return result
+    evaluator = ConstantEvaluator.current or ConstantEvaluator(max_modules=0, max_values=0)
+    return evaluator.evaluate(input_val, params, mod)
 
 
 def infer_value_simulated(input_val, params):
@@ -38,6 +38,8 @@ from .. import ty as _ty
 from .. import vision as _vision
 from .common import (
     AttrCvt,
+    ConstantEvaluator,
+    IncrementalTypeInference,
     Renamer,
     fold_constant,
     get_name,
@@ -4224,6 +4226,8 @@ def from_onnx(
         )
 
     # Use the graph proto as a scope so that ops can access other nodes if needed.
-    with g:
+    # The types of converted nodes and the evaluated constants are memoized while
+    # the graph grows.
+    with g, IncrementalTypeInference(), ConstantEvaluator():
         mod, params = g.from_onnx(graph, opset)
     return mod, params
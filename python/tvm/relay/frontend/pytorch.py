@@ -26,20 +26,18 @@ import sys
 
 import numpy as np
 import tvm
-from tvm.ir import IRModule
 from tvm.topi.utils import get_const_tuple
 
 from .. import analysis as _analysis
 from .. import expr as _expr
-from .. import function as _function
 from .. import op as _op
 from .. import qnn, transform
-from ..expr_functor import ExprMutator
 from ..loops import while_loop
 from ..prelude import Prelude, StaticTensorArrayOps
 from ..ty import Any, TensorType, TupleType
 from . import qnn_torch
-from .common import AttrCvt, get_relay_op, unbind, lstm_cell, gru_cell
+from .common import AttrCvt, ConstantEvaluator, IncrementalTypeInference, get_relay_op
+from .common import unbind, lstm_cell, gru_cell
 from .common import infer_value as _infer_value
 from .common import infer_shape as _infer_shape
 from .common import infer_value_simulated as _infer_value_simulated
@@ -52,47 +50,6 @@ __all__ = ["from_pytorch"]
 # the type is known. It also records things to map the input
 # nodes to the extracted graph's nodes.
 # As Python objects are not round-trippable through C++, and
-# our type annotations only live in Python, we need to map
-# the we need to map the nodes we get in visiting to the nodes
-# we used to construct the graph (they are the same in C++,
-# match each other in dictionary lookups, but are not the same
-# in Python) by using the hint dictionary filled as
-# {node: node for node in nodes} to get the type annotations.
-# https://discuss.tvm.apache.org/t/round-tripping-objects-through-the-ffi/8440
-class _TypeFinder(ExprMutator):
-    def __init__(self, types):
-        super().__init__()
-        self.counter = 0
-        self.vars = {}
-        self.types = types
-        self.leave = set()  # some variables are not inputs
-
-    def visit_let(self, let):
-        self.leave.add(let.var)
-        return super().visit_let(let)
-
-    def visit_function(self, fn):
-        self.leave.update(fn.params)
-        return super().visit_function(fn)
-
-    def visit(self, expr):
-        if expr in self.leave:
-            return super().visit(expr)
-        if expr in self.vars:
-            return self.vars[expr]
-        if isinstance(expr, tvm.relay.Var):
-            self.vars[expr] = expr
-            return expr
-        if expr in self.types:
-            ty = self.types[expr]
-            v = tvm.relay.var(f"_{self.counter}", type_annotation=ty)
-            self.counter += 1
-            self.vars[expr] = v
-            return v
-        v = super().visit(expr)
-        return v
-
-
 def _should_construct_dynamic_list(list_construct_node):
     # if this list is element-accessed or modified at runtime, generate List ADT
     def inplace_add_to_add(op_name):
@@ -139,30 +96,15 @@ class PyTorchOpConverter:
         self.prelude = prelude
         self.default_dtype = default_dtype
         self.create_convert_map()
-        self.types = {}  # map from nodes to (Relay) type annotations
+        self.type_inference = IncrementalTypeInference()
+        self.types = self.type_inference.types  # map from nodes to (Relay) type annotations
 
-    # this incrementally infers the type, see the comments on the type visitor
-    # above.
     def infer_type(self, node, mod=None):
         """An incremental method to infer the type of a node in the relay graph."""
 
-        if node in self.types:
-            return self.types[node]
-        if isinstance(node, tvm.relay.Var):
+        if isinstance(node, tvm.relay.Var) and node not in self.types:
             return node.type_annotation
-
-        tf = _TypeFinder(types=self.types)
-        new_node = tf.visit(node)
-        fn = _function.Function(list(tf.vars.values()), new_node)
-        new_mod = IRModule({"main": fn})
-        if mod is not None:
-            new_mod.update(mod)
-        new_mod = transform.RemoveUnusedFunctions()(new_mod)
-        new_mod = transform.InferType()(new_mod)
-        entry = new_mod["main"]
-        ty = entry.body.checked_type
-        self.types[node] = ty
-        return self.types[node]
+        return self.type_inference.infer_type(node, mod)
 
     def infer_type_with_prelude(self, val):
         body = self.infer_type(val, self.prelude.mod)
@@ -3773,7 +3715,8 @@ def from_pytorch(script_module, input_infos, custom_convert_map=None, default_dt
         qnn_torch.add_quant_params(tvm_params, weight_quant_params)
         converter.update_convert_map(qnn_torch.convert_map)
 
-    ret = converter.convert_operators(_get_operator_nodes(graph.nodes()), outputs, ret_name)[0]
+    with converter.type_inference, ConstantEvaluator():
+        ret = converter.convert_operators(_get_operator_nodes(graph.nodes()), outputs, ret_name)[0]
     if isinstance(ret, list):
         # ListConstruct kept original python list. Convert to tuple.
         ret = _expr.Tuple(ret)
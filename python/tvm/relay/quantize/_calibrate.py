@@ -30,7 +30,7 @@ from .. import expr as _expr
 from .. import analysis as _analysis
 from .. import build_module as _build_module
 from ...contrib import graph_executor
-from .kl_divergence import _find_scale_by_kl
+from .kl_divergence import _find_scale_by_kl_hist
 
 
 def _get_profile_runtime(mod):
@@ -51,11 +51,136 @@ def _get_profile_runtime(mod):
     return runtime
 
 
-def collect_stats(mod, dataset, chunk_by=-1):
-    """Given an annotated graph, create a profile graph to collect profile data from the
-    calibration dataset. This pass collects simulated_quantize op input into a tuple.
-    Simulated_quantize ops are rewritten to identity mode. The tuple is the output of the profile
-    graph.
+class StreamingHistogram(object):
+    """The running histogram of the values of a tensor over a calibration dataset.
+
+    The histogram has a fixed number of bins over a range symmetric around zero.
+    When a value falls out of the range, the range is doubled and adjacent bins are
+    merged, so the memory does not depend on the size of the dataset.
+
+    Parameters
+    ----------
+    num_bins: int
+        The number of bins, a multiple of 4.
+    """
+
+    def __init__(self, num_bins=65536):
+        assert num_bins % 4 == 0, "The number of bins must be a multiple of 4"
+        self.num_bins = num_bins
+        self.hist = np.zeros(num_bins, dtype=np.int64)
+        # half width of the range, set by the first non-zero value
+        self.bound = None
+        self.min_val = np.inf
+        self.max_val = -np.inf
+        self._num_zeros = 0
+
+    @property
+    def max_abs(self):
+        """The maximum absolute value seen."""
+        return max(abs(self.min_val), abs(self.max_val))
+
+    def update(self, arr):
+        """Add the values of an array to the histogram."""
+        # the extremes are exact in the dtype of the values
+        arr = np.asarray(arr).reshape(-1)
+        if arr.size == 0:
+            return
+        self.min_val = min(self.min_val, float(np.min(arr)))
+        self.max_val = max(self.max_val, float(np.max(arr)))
+        max_abs = self.max_abs
+
+        if self.bound is None:
+            if max_abs == 0:
+                self._num_zeros += arr.size
+                return
+            self.bound = max_abs
+            self.hist[self.num_bins // 2] += self._num_zeros
+        while max_abs > self.bound:
+            # double the range, the old bins become the middle half of the new ones
+            merged = self.hist.reshape(-1, 2).sum(axis=1)
+            self.hist[:] = 0
+            self.hist[self.num_bins // 4 : self.num_bins * 3 // 4] = merged
+            self.bound *= 2
+
+        scale = self.num_bins / (2 * self.bound)
+        idx = ((arr.astype(np.float64) + self.bound) * scale).astype(np.int64)
+        np.clip(idx, 0, self.num_bins - 1, out=idx)
+        self.hist += np.bincount(idx, minlength=self.num_bins)
+
+    def _cdf(self):
+        """The edges of the bins and the cumulative counts at them."""
+        edges = np.linspace(-self.bound, self.bound, self.num_bins + 1)
+        cdf = np.concatenate([[0], np.cumsum(self.hist)])
+        return edges, cdf
+
+    def kl_histogram(self, num_bins=8001):
+        """Resample the histogram over the range of the maximum absolute value.
+
+        Parameters
+        ----------
+        num_bins: int
+            The number of bins of the result.
+
+        Returns
+        -------
+        hist: np.ndarray
+            The counts, as the histogram of the values over the range would have.
+        edges: np.ndarray
+            The edges of the bins.
+        """
+        thres = self.max_abs
+        if thres == 0:
+            # the range numpy uses for the histogram of zeros
+            thres = 0.5
+        target_edges = np.linspace(-thres, thres, num_bins + 1)
+        if self.bound is None:
+            hist = np.zeros(num_bins, dtype=np.int64)
+            hist[num_bins // 2] = self._num_zeros
+            return hist, target_edges
+        edges, cdf = self._cdf()
+        target_cdf = np.round(np.interp(target_edges, edges, cdf))
+        # all the values are in the range
+        target_cdf[0], target_cdf[-1] = 0, cdf[-1]
+        hist = np.diff(target_cdf).astype(np.int64)
+        # the KL minimization counts with 32-bit integers
+        int_max = np.iinfo(np.int32).max
+        if hist.sum() > int_max:
+            hist = hist * (int_max / hist.sum())
+            hist = hist.astype(np.int64)
+        return hist, target_edges
+
+    def percentile(self, percentile=0.99999):
+        """Estimate the value at a percentile of the absolute values.
+
+        Parameters
+        ----------
+        percentile: float
+            The percentile, in [0, 1].
+
+        Returns
+        -------
+        value: float
+            The estimated value.
+        """
+        if self.bound is None:
+            return 0.0
+        half = self.num_bins // 2
+        abs_hist = self.hist[half:] + self.hist[:half][::-1]
+        cdf = np.concatenate([[0], np.cumsum(abs_hist)])
+        edges = np.linspace(0, self.bound, half + 1)
+        # the rank of the value, as in np.partition(x, int(x.size * percentile))
+        rank = min(int(cdf[-1] * percentile) + 1, cdf[-1])
+        # interpolate in the first bin reaching the rank
+        i = max(int(np.searchsorted(cdf, rank)), 1)
+        frac = (rank - cdf[i - 1]) / max(cdf[i] - cdf[i - 1], 1)
+        value = edges[i - 1] + frac * (edges[i] - edges[i - 1])
+        return min(float(value), self.max_abs)
+
+
+def collect_histograms(mod, dataset, num_bins=65536, chunk_by=-1):
+    """Given an annotated graph, create a profile graph and collect the histogram of
+    every layer's output from the calibration dataset. The profile graph collects
+    the inputs of the simulated_quantize ops, which are rewritten to identity mode.
 
     Parameters
     ----------
@@ -65,39 +190,54 @@ def collect_stats(mod, dataset, chunk_by=-1):
     dataset: Iterable[NDArray]
         The calibration dataset.
 
+    num_bins: int
+        The number of bins of each histogram.
+
     chunk_by: optional, int
-        The size of chunk to be returned in one iteration. It is meant to be
-        used for reducing memory usage. If not specified, return samples for
-        all layers in one chunk.
+        The number of layers whose histograms are collected in one pass over the
+        dataset. It is meant to be used for reducing memory usage, at the cost of
+        reading the dataset once per chunk. If not specified, the dataset is read
+        exactly once for all layers, so it can be a generator. Otherwise it has to
+        be iterable repeatedly, e.g. a list.
 
     Returns
     -------
-    ret: Iterable[list of ndarray]
-        List of output data of each layer, chunked by the chunk_by parameter
+    ret: Iterable[List[StreamingHistogram]]
+        The histogram of each layer, chunked by the chunk_by parameter.
     """
-    logging.info("collecting statistics for calibration...")
+    logging.info("collecting histograms for calibration...")
     runtime = _get_profile_runtime(mod)
     num_outputs = runtime.get_num_outputs()
     chunk_by = num_outputs if chunk_by == -1 else chunk_by
 
+    num_batches = None
     for i in range(0, num_outputs, chunk_by):
-        outputs = [[] for i in range(min(chunk_by, num_outputs - i))]
+        outputs = range(i, min(i + chunk_by, num_outputs))
+        hists = [StreamingHistogram(num_bins) for _ in outputs]
+        chunk_batches = 0
         for batch in dataset:
             runtime.set_input(**batch)
             runtime.run()
-            for j in range(i, min(i + chunk_by, num_outputs)):
-                outputs[j - i].append(runtime.get_output(j).numpy())
-        yield [np.concatenate(output).reshape(-1) for output in outputs]
+            for j, hist in zip(outputs, hists):
+                hist.update(runtime.get_output(j).numpy())
+            chunk_batches += 1
+        if num_batches is not None and chunk_batches != num_batches:
+            raise ValueError(
+                "The calibration dataset is read once per chunk of layers, but it gave %d "
+                "batches and then %d. Use a dataset that can be iterated repeatedly, or "
+                "calibrate_chunk_by=-1 to read it once." % (num_batches, chunk_batches)
+            )
+        num_batches = chunk_batches
+        yield hists
 
 
 def _kl_scale(mod, dataset):
     cfg = quantize.current_qconfig()
-    chunk_by = cfg.calibrate_chunk_by
     scales = []
-    for samples in collect_stats(mod, dataset, chunk_by):
-        logging.info("finding threshold with kl for calibration...")
-        with mp.Pool() as pool:
-            scales += list(pool.map(_find_scale_by_kl, samples))
+    with mp.Pool() as pool:
+        for hists in collect_histograms(mod, dataset, chunk_by=cfg.calibrate_chunk_by):
+            logging.info("finding threshold with kl for calibration...")
+            scales += pool.starmap(_find_scale_by_kl_hist, [h.kl_histogram() for h in hists])
 
     def func(_):
         scale = scales[func.scale_idx]
@@ -109,21 +249,12 @@ def _kl_scale(mod, dataset):
     return func
 
 
-def _find_scale_by_percentile(arr, percentile=0.99999):
-    assert isinstance(arr, np.ndarray)
-    x = np.abs(arr)
-    max_k = int(x.size * percentile)
-    return np.partition(x, max_k)[max_k]
-
-
 def _percentile_scale(mod, dataset):
     cfg = quantize.current_qconfig()
-    chunk_by = cfg.calibrate_chunk_by
     scales = []
-    for samples in collect_stats(mod, dataset, chunk_by):
+    for hists in collect_histograms(mod, dataset, chunk_by=cfg.calibrate_chunk_by):
         logging.info("finding threshold with percentile for calibration...")
-        with mp.Pool() as pool:
-            scales += list(pool.map(_find_scale_by_percentile, samples))
+        scales += [hist.percentile(0.99999) for hist in hists]
 
     def func(_):
         scale = scales[func.scale_idx]
@@ -35,7 +35,21 @@ def _find_scale_by_kl(arr, quantized_dtype="int8", num_bins=8001, num_quantized_
     max_val = np.max(arr)
     thres = max(abs(min_val), abs(max_val))
 
-    if min_val >= 0 and quantized_dtype in ["uint8"]:
+    hist, hist_edges = np.histogram(arr, bins=num_bins, range=(-thres, thres))
+    return _find_scale_by_kl_hist(
+        hist, hist_edges, min_val >= 0, quantized_dtype, num_quantized_bins
+    )
+
+
+def _find_scale_by_kl_hist(
+    hist, hist_edges, non_negative=False, quantized_dtype="int8", num_quantized_bins=255
+):
+    """Given the histogram of a tensor, find the optimal threshold for quantizing it.
+
+    The histogram must be symmetric around zero, over an odd number of bins, see
+    `_find_scale_by_kl`. `non_negative` tells whether the tensor has no negative value.
+    """
+    if non_negative and quantized_dtype in ["uint8"]:
         # We need to move negative bins to positive bins to fit uint8 range.
         num_quantized_bins = num_quantized_bins * 2 + 1
 
@@ -43,10 +57,12 @@ def _find_scale_by_kl(arr, quantized_dtype="int8", num_bins=8001, num_quantized_
         ptr = arr.ctypes.data_as(ctypes.POINTER(ctypes_type))
         return ctypes.cast(ptr, ctypes.c_void_p)
 
-    hist, hist_edges = np.histogram(arr, bins=num_bins, range=(-thres, thres))
-    hist_ptr = get_pointer(hist.astype(np.int32), ctypes.c_int)
+    # keep the converted arrays alive while their pointers are used
+    hist = np.ascontiguousarray(hist, dtype=np.int32)
+    hist_edges = np.ascontiguousarray(hist_edges, dtype=np.float32)
+    hist_ptr = get_pointer(hist, ctypes.c_int)
     hist_edges_ptr = get_pointer(hist_edges, ctypes.c_float)
 
     return _quantize.FindScaleByKLMinimization(
-        hist_ptr, hist_edges_ptr, num_bins, num_quantized_bins
+        hist_ptr, hist_edges_ptr, len(hist), num_quantized_bins
     )
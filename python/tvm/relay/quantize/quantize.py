@@ -153,6 +153,12 @@ def qconfig(**kwargs):
     global_scale: float
         The global scale for calibration.
 
+    calibrate_chunk_by: int
+        The number of layers whose activation histograms are collected in one pass
+        over the calibration dataset, to bound the memory of calibration. The dataset
+        is then read once per chunk. By default, all layers are collected in a single
+        pass.
+
     weight_scale: str
         The way to calculate scales for weights (annotated with QAnnotateKind.WEIGHT).
         power2: Find the maximum of the absolute value of the tensor, and then round up to power
@@ -26,6 +26,6 @@ upload and run remote RPC server, get the result back to verify correctness.
 """
 
 from .server import Server
-from .client import connect, connect_tracker
-from .client import RPCSession, LocalSession, PopenSession, TrackerSession
+from .client import connect, connect_tracker, get_session_pool
+from .client import RPCSession, LocalSession, PopenSession, TrackerSession, SessionPool
 from .minrpc import with_minrpc
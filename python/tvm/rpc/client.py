@@ -15,10 +15,12 @@
 # specific language governing permissions and limitations
 # under the License.
 """RPC client tools"""
+import contextlib
 import os
 import stat
 import socket
 import struct
+import threading
 import time
 
 import tvm._ffi
@@ -538,3 +540,204 @@ def connect_tracker(url, port):
         The connected tracker session.
     """
     return TrackerSession((url, port))
+
+
+class SessionPool(object):
+    """A pool of RPC sessions requested from a tracker, which reuses them across requests.
+
+    Requesting a session from the tracker costs a tracker round trip, a new connection
+    and a handshake. The pool keeps released sessions alive and hands them out again to
+    requests of the same key, after checking that they still respond.
+
+    Sessions idle for more than `idle_timeout` seconds are closed by a background thread,
+    so they do not keep the device from other clients. A session requested
+    with a positive `session_timeout` is killed by the server after that duration, so it
+    is only reused within the first half of it, and always has at least half of its
+    duration left.
+
+    Parameters
+    ----------
+    url : str
+        The url of the tracker
+
+    port : int
+        The port of the tracker
+
+    idle_timeout : float
+        The maximum time in seconds a released session is kept alive.
+    """
+
+    def __init__(self, url, port, idle_timeout=60.0):
+        self.idle_timeout = idle_timeout
+        self._tracker_addr = (url, port)
+        self._tracker = None
+        self._tracker_lock = threading.Lock()
+        self._lock = threading.Lock()
+        # (key, session_timeout, constructor args) -> [(session, start time, release time)]
+        self._idle = {}
+        # id(session) -> (pool key, start time)
+        self._leased = {}
+        self.num_requests = 0
+        self.num_reused = 0
+        self._stop = threading.Event()
+        self._reaper = None
+
+    @staticmethod
+    def _is_alive(sess):
+        try:
+            sess.cpu(0).exist  # pylint: disable=pointless-statement
+            return True
+        # pylint: disable=broad-except
+        except Exception:
+            return False
+
+    def _reap_loop(self):
+        while not self._stop.wait(max(self.idle_timeout / 2, 0.1)):
+            with self._lock:
+                self._reap(time.time())
+
+    def _reap(self, now):
+        """Drop the sessions that were idle for too long. Dropping the last reference
+        to a session closes its connection."""
+        for pool_key, sessions in list(self._idle.items()):
+            sessions[:] = [s for s in sessions if now - s[2] <= self.idle_timeout]
+            if not sessions:
+                del self._idle[pool_key]
+
+    def request(
+        self, key, priority=1, session_timeout=0, max_retry=5, session_constructor_args=None
+    ):
+        """Lease a session, reusing a released one if possible.
+
+        Parameters
+        ----------
+        key : str
+            The type key of the device.
+
+        priority : int, optional
+            The priority of the request.
+
+        session_timeout : float, optional
+            The duration of the session, see :py:meth:`TrackerSession.request`.
+
+        max_retry : int, optional
+            Maximum number of times to retry before give up.
+
+        session_constructor_args : list, optional
+            List of additional arguments to passed as the remote session constructor.
+
+        Returns
+        -------
+        sess : RPCSession
+            The leased session. Return it to the pool with :py:meth:`release`.
+        """
+        pool_key = (key, session_timeout, tuple(session_constructor_args or ()))
+        with self._lock:
+            self.num_requests += 1
+        while True:
+            with self._lock:
+                self._reap(time.time())
+                sessions = self._idle.get(pool_key)
+                if not sessions:
+                    break
+                sess, start_time, _ = sessions.pop()
+            # a dead session is dropped, which closes it
+            if self._is_alive(sess):
+                with self._lock:
+                    self.num_reused += 1
+                    self._leased[id(sess)] = (pool_key, start_time)
+                return sess
+
+        # the tracker connection is shared, so requests to it are serialized
+        with self._tracker_lock:
+            if self._tracker is None:
+                self._tracker = TrackerSession(self._tracker_addr)
+            start_time = time.time()
+            sess = self._tracker.request(
+                key,
+                priority=priority,
+                session_timeout=session_timeout,
+                max_retry=max_retry,
+                session_constructor_args=session_constructor_args,
+            )
+        with self._lock:
+            self._leased[id(sess)] = (pool_key, start_time)
+        return sess
+
+    def release(self, sess, reuse=True):
+        """Return a leased session to the pool.
+
+        Parameters
+        ----------
+        sess : RPCSession
+            The session returned by :py:meth:`request`.
+
+        reuse : bool
+            Whether the session can be handed out again. Set it to False when the session
+            may be broken, e.g. after an error.
+        """
+        now = time.time()
+        with self._lock:
+            pool_key, start_time = self._leased.pop(id(sess))
+            session_timeout = pool_key[1]
+            if reuse and (session_timeout <= 0 or now - start_time < session_timeout / 2):
+                self._idle.setdefault(pool_key, []).append((sess, start_time, now))
+                if self._reaper is None:
+                    self._reaper = threading.Thread(target=self._reap_loop, daemon=True)
+                    self._reaper.start()
+
+    @contextlib.contextmanager
+    def session(
+        self, key, priority=1, session_timeout=0, max_retry=5, session_constructor_args=None
+    ):
+        """Lease a session for the duration of a with block.
+
+        The session is only reused if the block exits without an exception.
+        See :py:meth:`request` for the parameters.
+        """
+        sess = self.request(key, priority, session_timeout, max_retry, session_constructor_args)
+        try:
+            yield sess
+        except BaseException:
+            self.release(sess, reuse=False)
+            raise
+        self.release(sess)
+
+    def close(self):
+        """Close the idle sessions and the tracker connection."""
+        self._stop.set()
+        with self._lock:
+            self._idle.clear()
+        with self._tracker_lock:
+            if self._tracker is not None:
+                self._tracker.close()
+                self._tracker = None
+
+
+# The session pools of this process, keyed on the tracker address
+_SESSION_POOLS = {}
+_SESSION_POOLS_LOCK = threading.Lock()
+
+
+def get_session_pool(url, port):
+    """Get the session pool of this process for a tracker.
+
+    Sessions cannot be shared between processes, so every process has its own pools.
+
+    Parameters
+    ----------
+    url : str
+        The url of the tracker
+
+    port : int
+        The port of the tracker
+
+    Returns
+    -------
+    pool : SessionPool
+        The session pool.
+    """
+    with _SESSION_POOLS_LOCK:
+        if (url, port) not in _SESSION_POOLS:
+            _SESSION_POOLS[url, port] = SessionPool(url, port)
+        return _SESSION_POOLS[url, port]
@@ -16,8 +16,23 @@
 # under the License.
 # pylint: disable=invalid-name
 """Helper utility to save and load parameter dicts."""
+import json
+import mmap
+import struct
+import warnings
+
+import numpy as np
+
 from . import _ffi_api, ndarray
 
+# The magic number of the page aligned parameters file of save_param_file.
+# It differs from kTVMNDArrayListMagic of the save_param_dict format.
+_PARAMS_FILE_MAGIC = 0xF7E58D4F05049CB9
+_PARAMS_FILE_VERSION = 1
+
+# Whether numpy arrays can be exported through DLPack, which needs numpy >= 1.22
+_NUMPY_HAS_DLPACK = hasattr(np.ndarray, "__dlpack__")
+
 
 def save_param_dict(params):
     """Save parameter dictionary to binary bytes.
@@ -47,7 +62,9 @@ def save_param_dict(params):
        # Pass in byte array to module to directly set parameters
        tvm.runtime.load_param_dict(param_bytes)
     """
-    transformed = {k: ndarray.array(v) for (k, v) in params.items()}
+    transformed = {
+        k: v if isinstance(v, ndarray.NDArray) else ndarray.array(v) for (k, v) in params.items()
+    }
     return _ffi_api.SaveParams(transformed)
 
 
@@ -67,3 +84,112 @@ def load_param_dict(param_bytes):
     if isinstance(param_bytes, (bytes, str)):
         param_bytes = bytearray(param_bytes)
     return _ffi_api.LoadParams(param_bytes)
+
+
+def _align(offset, alignment):
+    return (offset + alignment - 1) // alignment * alignment
+
+
+def save_param_file(params, path, alignment=4096):
+    """Save parameter dictionary to a page aligned file for :py:func:`load_param_file`.
+
+    The file starts with a small json header, followed by the raw data of every
+    parameter at an offset aligned to `alignment` bytes. The parameters are written
+    one by one, so no serialized copy of the whole dictionary is kept in memory.
+
+    Parameters
+    ----------
+    params : dict of str to NDArray or numpy.ndarray
+        The parameter dictionary. The data types must be supported by numpy.
+
+    path : str
+        The path of the file.
+
+    alignment : int
+        The alignment of the parameter data in bytes. It should be a multiple of
+        the page size so the data of loaded parameters is page aligned.
+    """
+    params = {
+        k: v if isinstance(v, (ndarray.NDArray, np.ndarray)) else np.asarray(v)
+        for (k, v) in params.items()
+    }
+    entries = {}
+    offset = 0
+    for name, value in params.items():
+        dtype = np.dtype(str(value.dtype))
+        shape = [int(x) for x in value.shape]
+        entries[name] = {"dtype": dtype.str, "shape": shape, "offset": offset}
+        offset = _align(offset + dtype.itemsize * int(np.prod(shape)), alignment)
+    header = json.dumps(
+        {
+            "version": _PARAMS_FILE_VERSION,
+            "alignment": alignment,
+            "params": entries,
+        }
+    ).encode()
+    data_start = _align(16 + len(header), alignment)
+
+    with open(path, "wb") as f:
+        f.write(struct.pack("<QQ", _PARAMS_FILE_MAGIC, len(header)))
+        f.write(header)
+        for name, value in params.items():
+            f.write(b"\0" * (data_start + entries[name]["offset"] - f.tell()))
+            if isinstance(value, ndarray.NDArray):
+                value = value.numpy()
+            f.write(np.ascontiguousarray(value, dtype=entries[name]["dtype"]).tobytes())
+
+
+def load_param_file(path):
+    """Load parameter dictionary from a file written by :py:func:`save_param_file`.
+
+    Unlike :py:func:`load_param_dict`, the file is memory mapped and the parameters
+    are CPU NDArrays viewing the mapped data, without copies. Processes loading the
+    same file share its pages through the page cache. The mapping is copy-on-write,
+    so writes to the parameters are private and do not change the file.
+
+    The parameters view the mapped data through DLPack, which needs numpy >= 1.22.
+    With an older numpy they are copied into NDArrays, with a warning.
+
+    Parameters
+    ----------
+    path : str
+        The path of the file.
+
+    Returns
+    -------
+    params : dict of str to NDArray
+        The parameter dictionary.
+    """
+    if not _NUMPY_HAS_DLPACK:
+        warnings.warn(
+            "numpy %s can not export arrays through DLPack, the parameters of %s are "
+            "copied instead of viewing the memory mapped file. Please upgrade numpy "
+            "to 1.22 or later." % (np.__version__, path)
+        )
+    with open(path, "rb") as f:
+        magic, header_len = struct.unpack("<QQ", f.read(16))
+        if magic != _PARAMS_FILE_MAGIC:
+            raise ValueError("Invalid parameters file format: %s" % path)
+        header = json.loads(f.read(header_len).decode())
+        if header["version"] > _PARAMS_FILE_VERSION:
+            raise ValueError("Unsupported parameters file version: %d" % header["version"])
+        # The mapping stays alive as long as the arrays viewing it
+        data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+
+    data_start = _align(16 + header_len, header["alignment"])
+    params = {}
+    for name, entry in header["params"].items():
+        arr = np.ndarray(
+            entry["shape"],
+            dtype=np.dtype(entry["dtype"]),
+            buffer=data,
+            offset=data_start + entry["offset"],
+        )
+        if not arr.dtype.isnative:
+            # A file written on a machine of the other byte order needs a converting copy
+            params[name] = ndarray.array(arr.astype(arr.dtype.newbyteorder("=")))
+        elif not _NUMPY_HAS_DLPACK:
+            params[name] = ndarray.array(arr)
+        else:
+            params[name] = ndarray.from_dlpack(arr)
+    return params
@@ -56,6 +56,7 @@ static const char* ErrorNoToStr[] = {
     "BuildTimeoutError",
     "RunTimeoutError",
     "UnknownError",
+    "EarlyTerminated",
 };
 
 /********** Measure input and result **********/
@@ -85,13 +86,14 @@ BuildResult::BuildResult(String filename, Array<te::Tensor> args, int error_no,
 }
 
 MeasureResult::MeasureResult(Array<PrimExpr> costs, int error_no, String error_msg, double all_cost,
-                             double timestamp) {
+                             double timestamp, double rel_ci) {
   auto node = make_object<MeasureResultNode>();
   node->costs = std::move(costs);
   node->error_no = error_no;
   node->error_msg = std::move(error_msg);
   node->all_cost = all_cost;
   node->timestamp = timestamp;
+  node->rel_ci = rel_ci;
   data_ = std::move(node);
 }
 
@@ -102,6 +104,7 @@ MeasureResult MeasureResultNode::copy() const {
   node->error_msg = error_msg;
   node->all_cost = all_cost;
   node->timestamp = timestamp;
+  node->rel_ci = rel_ci;
   return MeasureResult(node);
 }
 
@@ -127,7 +130,8 @@ Array<BuildResult> LocalBuilderNode::Build(const Array<MeasureInput>& inputs, in
 
 /********** LocalRunner **********/
 LocalRunner::LocalRunner(int timeout, int number, int repeat, int min_repeat_ms,
-                         double cooldown_interval, bool enable_cpu_cache_flush) {
+                         double cooldown_interval, bool enable_cpu_cache_flush,
+                         double probe_ratio, double max_rel_ci, double ci_time_budget) {
   ObjectPtr<LocalRunnerNode> node = make_object<LocalRunnerNode>();
   node->timeout = timeout;
   node->number = number;
@@ -135,6 +139,9 @@ LocalRunner::LocalRunner(int timeout, int number, int repeat, int min_repeat_ms,
   node->min_repeat_ms = min_repeat_ms;
   node->cooldown_interval = cooldown_interval;
   node->enable_cpu_cache_flush = enable_cpu_cache_flush;
+  node->probe_ratio = probe_ratio;
+  node->max_rel_ci = max_rel_ci;
+  node->ci_time_budget = ci_time_budget;
   data_ = std::move(node);
 }
 
@@ -143,7 +150,7 @@ Array<MeasureResult> LocalRunnerNode::Run(const Array<MeasureInput>& inputs,
   if (const auto* f = runtime::Registry::Get("auto_scheduler.local_runner.run")) {
     Array<MeasureResult> results =
         (*f)(inputs, build_results, timeout, number, repeat, min_repeat_ms, cooldown_interval,
-             enable_cpu_cache_flush, verbose);
+             enable_cpu_cache_flush, verbose, probe_ratio, max_rel_ci, ci_time_budget);
     return results;
   }
   LOG(FATAL) << "auto_scheduler.local_runner.run is not registered. "
@@ -155,7 +162,8 @@ Array<MeasureResult> LocalRunnerNode::Run(const Array<MeasureInput>& inputs,
 /********** RPCRunner **********/
 RPCRunner::RPCRunner(const String& key, const String& host, int port, int priority, int n_parallel,
                      int timeout, int number, int repeat, int min_repeat_ms,
-                     double cooldown_interval, bool enable_cpu_cache_flush) {
+                     double cooldown_interval, bool enable_cpu_cache_flush,
+                     double session_lifetime) {
   auto node = make_object<RPCRunnerNode>();
   node->key = key;
   node->host = host;
@@ -168,6 +176,7 @@ RPCRunner::RPCRunner(const String& key, const String& host, int port, int priori
   node->min_repeat_ms = min_repeat_ms;
   node->cooldown_interval = cooldown_interval;
   node->enable_cpu_cache_flush = enable_cpu_cache_flush;
+  node->session_lifetime = session_lifetime;
   data_ = std::move(node);
 }
 
@@ -176,7 +185,7 @@ Array<MeasureResult> RPCRunnerNode::Run(const Array<MeasureInput>& inputs,
   if (const auto* f = runtime::Registry::Get("auto_scheduler.rpc_runner.run")) {
     Array<MeasureResult> results =
         (*f)(inputs, build_results, key, host, port, priority, n_parallel, timeout, number, repeat,
-             min_repeat_ms, cooldown_interval, enable_cpu_cache_flush, verbose);
+             min_repeat_ms, cooldown_interval, enable_cpu_cache_flush, verbose, session_lifetime);
     return results;
   } else {
     LOG(FATAL) << "auto_scheduler.rpc_runner.run is not registered. "
@@ -263,6 +272,11 @@ Array<MeasureResult> ProgramMeasurerNode::Measure(const SearchTask& task,
         flops = task->compute_dag->flop_ct / FloatArrayMean(result_batch[j]->costs);
         error_ct = 0;
         has_valid.insert(workload_key);
+      } else if (result_batch[j]->error_no ==
+                 static_cast<int>(MeasureErrorNO::kEarlyTerminated)) {
+        // a slow program is not an error
+        flops = 0.0;
+        error_ct = 0;
       } else {
         flops = 0.0;
         error_ct++;
@@ -378,8 +392,8 @@ TVM_REGISTER_GLOBAL("auto_scheduler.BuildResult")
 
 TVM_REGISTER_GLOBAL("auto_scheduler.MeasureResult")
     .set_body_typed([](Array<PrimExpr> costs, int error_no, String error_msg, double all_cost,
-                       double timestamp) {
-      return MeasureResult(costs, error_no, error_msg, all_cost, timestamp);
+                       double timestamp, double rel_ci) {
+      return MeasureResult(costs, error_no, error_msg, all_cost, timestamp, rel_ci);
     });
 
 TVM_REGISTER_GLOBAL("auto_scheduler.PythonBasedMeasureCallback")
@@ -387,6 +401,12 @@ TVM_REGISTER_GLOBAL("auto_scheduler.PythonBasedMeasureCallback")
       return PythonBasedMeasureCallback(callback_func);
     });
 
+TVM_REGISTER_GLOBAL("auto_scheduler.MeasureCallbackCallback")
+    .set_body_typed([](MeasureCallback callback, SearchPolicy policy, Array<MeasureInput> inputs,
+                       Array<MeasureResult> results) {
+      callback->Callback(policy, inputs, results);
+    });
+
 TVM_REGISTER_GLOBAL("auto_scheduler.ProgramMeasurer")
     .set_body_typed([](ProgramBuilder builder, ProgramRunner runner,
                        Array<MeasureCallback> callbacks, int verbose, int max_continuous_error) {
@@ -409,17 +429,19 @@ TVM_REGISTER_GLOBAL("auto_scheduler.LocalBuilder")
 
 TVM_REGISTER_GLOBAL("auto_scheduler.LocalRunner")
     .set_body_typed([](int timeout, int number, int repeat, int min_repeat_ms,
-                       double cooldown_interval, bool enable_cpu_cache_flush) {
+                       double cooldown_interval, bool enable_cpu_cache_flush, double probe_ratio,
+                       double max_rel_ci, double ci_time_budget) {
       return LocalRunner(timeout, number, repeat, min_repeat_ms, cooldown_interval,
-                         enable_cpu_cache_flush);
+                         enable_cpu_cache_flush, probe_ratio, max_rel_ci, ci_time_budget);
     });
 
 TVM_REGISTER_GLOBAL("auto_scheduler.RPCRunner")
     .set_body_typed([](const String& key, const String& host, int port, int priority,
                        int n_parallel, int timeout, int number, int repeat, int min_repeat_ms,
-                       double cooldown_interval, bool enable_cpu_cache_flush) {
+                       double cooldown_interval, bool enable_cpu_cache_flush,
+                       double session_lifetime) {
       return RPCRunner(key, host, port, priority, n_parallel, timeout, number, repeat,
-                       min_repeat_ms, cooldown_interval, enable_cpu_cache_flush);
+                       min_repeat_ms, cooldown_interval, enable_cpu_cache_flush, session_lifetime);
     });
 
 }  // namespace auto_scheduler
@@ -38,39 +38,9 @@ TVM_REGISTER_OBJECT_TYPE(PreloadMeasuredStatesNode);
 void SearchPolicyNode::PreloadMeasuredStates(const String& log_file) {
   RecordReader reader = RecordReader(log_file);
   const auto& res = reader->ReadLines(-1);
-  size_t log_size = res.first.size();
-  ICHECK_EQ(log_size, res.second.size());
-  if (log_size) {
-    Array<State> measured_states;
-    std::vector<float> measured_throughputs;
-    for (size_t i = 0; i < log_size; i++) {
-      const auto& inp = res.first[i];
-      if (inp->task->workload_key == search_task->workload_key &&
-          inp->task->target->kind->name.compare(search_task->target->kind->name) == 0) {
-        State state = search_task->compute_dag->init_state;
-        auto pstate = state.CopyOnWrite();
-        pstate->transform_steps = inp->state->transform_steps;
-        for (const auto& step : pstate->transform_steps) {
-          StepApplyToState(step, &state, search_task->compute_dag);
-        }
-        measured_states.push_back(std::move(state));
-        measured_throughputs.push_back(
-            res.second[i]->error_no == 0 ? (1.0 / FloatArrayMean(res.second[i]->costs)) : 0.0);
-      }
-    }
-    // We can assume the recorded states will all be valid after infer bound
-    measured_states = search_task->compute_dag.InferBound(measured_states);
-    for (size_t i = 0; i < measured_states.size(); i++) {
-      auto& state = measured_states[i];
-      const auto& state_str = state.ToStr();
-      if (!measured_states_set_.count(state_str)) {
-        measured_states_set_.insert(state_str);
-        if (measured_throughputs[i] != 0.0) {
-          measured_states_vector_.emplace_back(std::move(state));
-          measured_states_throughputs_.emplace_back(measured_throughputs[i]);
-        }
-      }
-    }
+  ICHECK_EQ(res.first.size(), res.second.size());
+  if (res.first.size()) {
+    PreloadMeasuredStates(res.first, res.second);
 
     StdCout(verbose) << "SearchPolicy: Loaded " << measured_states_set_.size()
                      << " measurement records from " << log_file << " for "
@@ -81,6 +51,41 @@ void SearchPolicyNode::PreloadMeasuredStates(const String& log_file) {
   }
 }
 
+void SearchPolicyNode::PreloadMeasuredStates(const Array<MeasureInput>& inputs,
+                                             const Array<MeasureResult>& results) {
+  ICHECK_EQ(inputs.size(), results.size());
+  Array<State> measured_states;
+  std::vector<float> measured_throughputs;
+  for (size_t i = 0; i < inputs.size(); i++) {
+    const auto& inp = inputs[i];
+    if (inp->task->workload_key == search_task->workload_key &&
+        inp->task->target->kind->name.compare(search_task->target->kind->name) == 0) {
+      State state = search_task->compute_dag->init_state;
+      auto pstate = state.CopyOnWrite();
+      pstate->transform_steps = inp->state->transform_steps;
+      for (const auto& step : pstate->transform_steps) {
+        StepApplyToState(step, &state, search_task->compute_dag);
+      }
+      measured_states.push_back(std::move(state));
+      measured_throughputs.push_back(
+          results[i]->error_no == 0 ? (1.0 / FloatArrayMean(results[i]->costs)) : 0.0);
+    }
+  }
+  // We can assume the recorded states will all be valid after infer bound
+  measured_states = search_task->compute_dag.InferBound(measured_states);
+  for (size_t i = 0; i < measured_states.size(); i++) {
+    auto& state = measured_states[i];
+    const auto& state_str = state.ToStr();
+    if (!measured_states_set_.count(state_str)) {
+      measured_states_set_.insert(state_str);
+      if (measured_throughputs[i] != 0.0) {
+        measured_states_vector_.emplace_back(std::move(state));
+        measured_states_throughputs_.emplace_back(measured_throughputs[i]);
+      }
+    }
+  }
+}
+
 void SearchPolicyNode::RunCallbacks(const Array<SearchCallback>& callbacks) {
   for (const auto& callback : callbacks) {
     callback->Callback(this);
@@ -112,6 +117,12 @@ TVM_REGISTER_GLOBAL("auto_scheduler.SearchPolicyContinueSearchOneRound")
       return Array<ObjectRef>{inputs, results};
     });
 
+TVM_REGISTER_GLOBAL("auto_scheduler.SearchPolicyPreloadMeasuredStates")
+    .set_body_typed([](SearchPolicy policy, Array<MeasureInput> inputs,
+                       Array<MeasureResult> results) {
+      policy->PreloadMeasuredStates(inputs, results);
+    });
+
 TVM_REGISTER_GLOBAL("auto_scheduler.SearchPolicySetVerbose")
     .set_body_typed([](SearchPolicy policy, int verbose) { policy->verbose = verbose; });
 
@@ -141,6 +141,12 @@ void GraphExecutor::CheckExternalDLTensor(const DLTensor* external, uint32_t eid
 
   ICHECK_EQ(data_alignment_[eid], details::GetDataAlignment(*external));
   ICHECK_EQ(reinterpret_cast<size_t>(external->data) % kAllocAlignment, 0);
+  // Only the data pointer is bound, so the tensor must start at it and be compact.
+  ICHECK_EQ(external->byte_offset, 0);
+  ICHECK(IsContiguous(*external)) << "Zero copy tensors must be contiguous";
+  ICHECK(DataType(internal->dtype) == DataType(external->dtype))
+      << "Expect the data type " << DataType(internal->dtype) << ", but got "
+      << DataType(external->dtype);
   ICHECK_EQ(internal->ndim, static_cast<size_t>(external->ndim));
   ICHECK_EQ(internal->device.device_type, external->device.device_type);
   ICHECK_EQ(internal->device.device_id, external->device.device_id);
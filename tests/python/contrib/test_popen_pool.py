@@ -15,6 +15,8 @@
 # specific language governing permissions and limitations
 # under the License.
 """Test PopenPoolExecutor."""
+import gc
+import sys
 import pytest
 import time
 from tvm.contrib.popen_pool import PopenWorker, PopenPoolExecutor
@@ -138,6 +140,58 @@ def test_popen_pool_executor_timeout():
         assert isinstance(ex, TimeoutError)
 
 
+def test_popen_pool_executor_warm():
+    initargs = (1, 2, 3)
+    pool = PopenPoolExecutor(
+        max_workers=2,
+        timeout=0.5,
+        initializer=initializer,
+        initargs=initargs,
+        warm=True,
+        preload_modules=("tvm.testing",),
+        prestart=True,
+    )
+    assert pool.submit(after_initializer).result() == initargs
+
+    with pytest.raises(TimeoutError):
+        pool.submit(identity_after, 1, 100).result()
+
+    # the killed worker is replaced by a spare which already ran the initializer
+    values = pool.map_with_error_catching(lambda _: after_initializer(), range(8))
+    for val in values:
+        assert val.value == initargs
+
+    stats = pool.stats()
+    assert stats["respawn_count"] >= 1
+    assert stats["spawn_count"] >= 3
+    assert stats["spawn_time"] > 0
+
+
+def test_popen_pool_executor_shutdown():
+    pool = PopenPoolExecutor(max_workers=2, warm=True, num_spares=1)
+    assert pool.submit(identity_after, 1, 0).result() == 1
+    procs = [worker._proc for worker in pool._worker_map.values()]
+    pool.shutdown()
+    pool.shutdown()
+    # without prestart, only the spare taken by the job and its replacement started
+    assert pool.stats()["spawn_count"] == 2
+    for proc in procs:
+        proc.wait(timeout=10)
+
+
+def test_popen_pool_executor_invalid_initializer():
+    unraisable = []
+    old_hook, sys.unraisablehook = sys.unraisablehook, unraisable.append
+    try:
+        with pytest.raises(TypeError):
+            PopenPoolExecutor(max_workers=1, initializer=1)
+        # the partly initialized executor is shut down without errors
+        gc.collect()
+    finally:
+        sys.unraisablehook = old_hook
+    assert not unraisable
+
+
 if __name__ == "__main__":
     test_popen_worker()
     test_popen_pool_executor()
@@ -145,3 +199,6 @@ if __name__ == "__main__":
     test_popen_ffi()
     test_popen_pool_executor_async()
     test_popen_pool_executor_timeout()
+    test_popen_pool_executor_warm()
+    test_popen_pool_executor_shutdown()
+    test_popen_pool_executor_invalid_initializer()
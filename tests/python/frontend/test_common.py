@@ -14,7 +14,18 @@
 # KIND, either express or implied.  See the License for the
 # specific language governing permissions and limitations
 # under the License.
-from tvm.relay.frontend.common import StrAttrsDict
+import numpy as np
+
+import tvm
+from tvm import relay
+from tvm.relay.frontend.common import (
+    ConstantEvaluator,
+    IncrementalTypeInference,
+    StrAttrsDict,
+    infer_shape,
+    infer_type,
+    infer_value,
+)
 
 
 def test_key_is_present():
@@ -27,6 +38,69 @@ def test_key_is_not_present():
     assert not attrs.has_attr("b")
 
 
+def test_incremental_type_inference():
+    x = relay.var("x", shape=(2, 3), dtype="float32")
+    y = relay.nn.relu(x)
+    z = relay.reshape(y, (3, 2))
+    w = relay.sum(relay.Tuple([z, z])[0], axis=0)
+
+    with IncrementalTypeInference() as ctx:
+        assert infer_shape(y) == (2, 3)
+        assert y in ctx.types
+        assert infer_shape(z) == (3, 2)
+        assert int(infer_type(w).checked_type.shape[0]) == 2
+        assert len(ctx.types) == 3
+        # the memoized type of the root is reused
+        assert infer_type(z).checked_type == ctx.types[z]
+
+    assert IncrementalTypeInference.current is None
+    assert infer_shape(w) == (2,)
+
+    # bound variables are not turned into inputs
+    v = relay.var("v")
+    f = relay.Function([x], relay.Let(v, y, v))
+    a = relay.var("a", shape=(2, 3), dtype="float32")
+    with IncrementalTypeInference() as ctx:
+        assert int(ctx.infer_type(relay.Call(f, [a])).shape[1]) == 3
+
+
+def test_constant_evaluator():
+    evaluator = ConstantEvaluator(max_modules=2)
+    x = relay.var("x", shape=(4,), dtype="float32")
+    params = {"x": tvm.nd.array(np.arange(4, dtype="float32"))}
+
+    value = evaluator.evaluate(relay.shape_of(x * relay.const(2.0)), params)
+    np.testing.assert_equal(value.numpy(), [4])
+    value = evaluator.evaluate(x * relay.const(2.0), params)
+    np.testing.assert_equal(value.numpy(), [0, 2, 4, 6])
+    assert evaluator.num_builds == 2
+
+    # the same expression with the same inputs is memoized
+    evaluator.evaluate(x * relay.const(2.0), params)
+    assert evaluator.num_value_hits == 1
+
+    # new inputs reuse the compiled module of a structurally equal expression
+    y = relay.var("y", shape=(4,), dtype="float32")
+    value = evaluator.evaluate(y * relay.const(2.0), {"y": np.ones(4, "float32")})
+    np.testing.assert_equal(value.numpy(), [2, 2, 2, 2])
+    assert evaluator.num_builds == 2
+    assert evaluator.num_module_hits == 1
+
+    # another constant is another program
+    value = evaluator.evaluate(x * relay.const(3.0), params)
+    np.testing.assert_equal(value.numpy(), [0, 3, 6, 9])
+    assert evaluator.num_builds == 3
+
+    # infer_value goes through the evaluator of the enclosing import only
+    with evaluator:
+        infer_value(x * relay.const(3.0), params)
+        assert evaluator.num_value_hits == 2
+    assert ConstantEvaluator.current is None
+    assert not evaluator._modules and not evaluator._values
+
+
 if __name__ == "__main__":
     test_key_is_present()
     test_key_is_present()
+    test_incremental_type_inference()
+    test_constant_evaluator()
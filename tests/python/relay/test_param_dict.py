@@ -16,6 +16,7 @@
 # under the License.
 import os
 import numpy as np
+import pytest
 import tvm
 from tvm import te, runtime
 import json
@@ -53,6 +54,39 @@ def test_ndarray_reflection():
     np.testing.assert_equal(deser_param_dict["x"].numpy(), deser_param_dict["y"].numpy())
 
 
+def test_save_load_param_file():
+    x = np.random.uniform(size=(10, 2)).astype("float32")
+    y = np.arange(6).astype("int8").reshape((1, 2, 3))
+    params = {"x": tvm.nd.array(x), "y": y, "z": np.zeros((0,), "float64")}
+    temp = utils.tempdir()
+    path = temp.relpath("params.bin")
+    runtime.save_param_file(params, path)
+    param2 = runtime.load_param_file(path)
+    assert list(param2) == ["x", "y", "z"]
+    np.testing.assert_equal(param2["x"].numpy(), x)
+    np.testing.assert_equal(param2["y"].numpy(), y)
+    assert param2["z"].shape == (0,) and param2["z"].dtype == "float64"
+    if runtime.params._NUMPY_HAS_DLPACK:
+        for arr in [param2["x"], param2["y"]]:
+            # the parameters view the page aligned mapping of the file
+            assert (arr.handle.contents.data + arr.handle.contents.byte_offset) % 4096 == 0
+
+    # writes to the copy-on-write mapping do not change the file
+    param2["x"].copyfrom(np.zeros_like(x))
+    np.testing.assert_equal(runtime.load_param_file(path)["x"].numpy(), x)
+
+    # numpy without DLPack support falls back to copies
+    has_dlpack = runtime.params._NUMPY_HAS_DLPACK
+    runtime.params._NUMPY_HAS_DLPACK = False
+    try:
+        with pytest.warns(UserWarning, match="DLPack"):
+            param3 = runtime.load_param_file(path)
+    finally:
+        runtime.params._NUMPY_HAS_DLPACK = has_dlpack
+    np.testing.assert_equal(param3["x"].numpy(), x)
+    np.testing.assert_equal(param3["y"].numpy(), y)
+
+
 def test_bigendian_rpc_param():
     """Test big endian rpc when there is a PowerPC RPC server available"""
     host = os.environ.get("TVM_POWERPC_TEST_HOST", None)
@@ -92,4 +126,5 @@ def test_bigendian_rpc_param():
 if __name__ == "__main__":
     test_save_load()
     test_ndarray_reflection()
+    test_save_load_param_file()
     test_bigendian_rpc_param()
@@ -129,6 +129,46 @@ def test_calibrate_memory_bound():
         relay.quantize.quantize(mod, params, dataset)
 
 
+def test_calibrate_streaming_histogram():
+    from tvm.relay.quantize._calibrate import StreamingHistogram
+
+    batches = [np.random.normal(size=(4, 256)) * (1 + i) for i in range(8)]
+    values = np.concatenate([batch.reshape(-1) for batch in batches])
+    hist = StreamingHistogram()
+    for batch in batches:
+        hist.update(batch)
+
+    assert hist.max_abs == np.abs(values).max()
+    assert hist.hist.sum() == values.size
+    # the range has grown without losing resolution beyond a factor of 2
+    assert hist.max_abs <= hist.bound <= 2 * hist.max_abs
+
+    abs_values = np.abs(values)
+    max_k = int(abs_values.size * 0.99999)
+    exact = np.partition(abs_values, max_k)[max_k]
+    bin_width = 2 * hist.bound / hist.num_bins
+    assert abs(hist.percentile(0.99999) - exact) <= bin_width
+
+    kl_hist, edges = hist.kl_histogram(num_bins=801)
+    ref, ref_edges = np.histogram(values, bins=801, range=(-hist.max_abs, hist.max_abs))
+    np.testing.assert_allclose(edges, ref_edges)
+    assert kl_hist.sum() == ref.sum()
+
+
+def test_calibrate_one_pass():
+    mod, params = testing.synthetic.get_workload()
+    # the dataset is read once, so a generator can be used
+    dataset = iter(get_calibration_dataset(mod, "data"))
+    with relay.quantize.qconfig(calibrate_mode="kl_divergence"):
+        relay.quantize.quantize(mod, params, dataset)
+
+    # reading the dataset once per chunk of layers exhausts a generator
+    dataset = iter(get_calibration_dataset(mod, "data"))
+    with relay.quantize.qconfig(calibrate_mode="kl_divergence", calibrate_chunk_by=1):
+        with pytest.raises(ValueError, match="once per chunk"):
+            relay.quantize.quantize(mod, params, dataset)
+
+
 def test_calibrate_percentile():
     mod, params = testing.synthetic.get_workload()
     dataset = get_calibration_dataset(mod, "data")
@@ -410,6 +450,8 @@ if __name__ == "__main__":
     test_calibrate_target(False)
     test_calibrate_target(True)
     test_calibrate_memory_bound()
+    test_calibrate_streaming_histogram()
+    test_calibrate_one_pass()
     test_calibrate_percentile()
 
     test_add_partition()
@@ -43,6 +43,18 @@ def get_sample_records(number):
     return task, inputs, results
 
 
+def save_records_with_unregistered_workload(log_file, inputs, results):
+    """Save records to a log, with every other record of a workload that is not registered"""
+    auto_scheduler.save_records(log_file, inputs, results)
+    with open(log_file) as fin:
+        lines = fin.readlines()
+    with open(log_file, "w") as fout:
+        for i, line in enumerate(lines):
+            if i % 2 == 1:
+                line = line.replace("matmul_auto_scheduler_test", "unregistered_workload")
+            fout.write(line)
+
+
 def test_random_model():
     task, inputs, results = get_sample_records(50)
 
@@ -79,6 +91,106 @@ def test_xgb_model():
     model.load(tmpfile)
 
 
+def test_xgb_model_feature_cache():
+    task, inputs, results = get_sample_records(20)
+    tmpdir = tvm.contrib.utils.tempdir()
+
+    expected = auto_scheduler.feature.get_per_store_features_from_measure_pairs(inputs, results)
+    cache = auto_scheduler.feature.FeatureCache(tmpdir.relpath("features"))
+    for _ in range(2):
+        features, throughputs, task_ids = cache.get_per_store_features_from_measure_pairs(
+            inputs, results
+        )
+        for x, y in zip(features, expected[0]):
+            np.testing.assert_allclose(x, y, rtol=1e-6)
+        np.testing.assert_allclose(throughputs, expected[1])
+        np.testing.assert_equal(task_ids, expected[2])
+    assert cache.num_misses == len(inputs)
+    assert cache.num_hits == len(inputs)
+
+    # a new model resumes from the features cached on disk
+    model = auto_scheduler.XGBModel(num_warmup_sample=-1, feature_cache=tmpdir.relpath("features"))
+    model.update(inputs, results)
+    assert model.feature_cache.num_hits == len(inputs)
+    assert model.feature_cache.num_misses == 0
+    preds = model.predict(task, [x.state for x in inputs])
+    assert len(preds) == len(inputs)
+
+
+def test_feature_cache_unregistered_workload():
+    _, inputs, results = get_sample_records(10)
+    tmpdir = tvm.contrib.utils.tempdir()
+    log_file = tmpdir.relpath("records.json")
+    save_records_with_unregistered_workload(log_file, inputs, results)
+    inputs, results = auto_scheduler.RecordReader(log_file).read_lines()
+
+    # the extraction skips the records of the unregistered workload
+    expected = auto_scheduler.feature.get_per_store_features_from_measure_pairs(inputs, results)
+    assert len(expected[0]) == len(inputs) // 2
+    cache = auto_scheduler.feature.FeatureCache(tmpdir.relpath("features"))
+    for _ in range(2):
+        features, throughputs, task_ids = cache.get_per_store_features_from_measure_pairs(
+            inputs, results
+        )
+        assert len(features) == len(throughputs) == len(task_ids) == len(expected[0])
+        for x, y in zip(features, expected[0]):
+            np.testing.assert_allclose(x, y, rtol=1e-6)
+        np.testing.assert_allclose(throughputs, expected[1])
+        np.testing.assert_equal(task_ids, expected[2])
+    assert cache.num_hits == len(expected[0])
+
+
+def test_xgb_model_pretrain():
+    task, inputs, results = get_sample_records(50)
+    tmpdir = tvm.contrib.utils.tempdir()
+    log_file = tmpdir.relpath("records.json")
+    model_file = tmpdir.relpath("model.xgb")
+    auto_scheduler.save_records(log_file, inputs, results)
+
+    # the chunked loading normalizes the throughputs over the whole file
+    features, throughputs, task_ids = auto_scheduler.cost_model.load_features_from_files(
+        [log_file], chunk_size=7
+    )
+    expected = auto_scheduler.feature.get_per_store_features_from_file(log_file, -1)
+    assert len(features) == len(inputs)
+    np.testing.assert_allclose(throughputs, expected[1], rtol=1e-5)
+    np.testing.assert_equal(task_ids, expected[2])
+
+    auto_scheduler.cost_model.pretrain_xgb_model([tmpdir.path], model_file, chunk_size=7)
+
+    # warm-start a new model from the pretrained one
+    model = auto_scheduler.XGBModel(base_model_file=model_file)
+    preds = model.predict(task, [x.state for x in inputs])
+    costs = [np.mean([x.value for x in res.costs]) for res in results]
+    rmse = np.sqrt(np.mean(np.square(preds - np.min(costs) / costs)))
+    assert rmse <= 0.3
+    model.update(inputs[:10], results[:10])
+    assert len(model.predict(task, [x.state for x in inputs])) == len(inputs)
+
+
+def test_load_features_unregistered_workload():
+    _, inputs, results = get_sample_records(20)
+    tmpdir = tvm.contrib.utils.tempdir()
+    log_file = tmpdir.relpath("records.json")
+    save_records_with_unregistered_workload(log_file, inputs, results)
+
+    # the records of the unregistered workload are skipped, not misaligned
+    inputs, results = auto_scheduler.RecordReader(log_file).read_lines()
+    expected = auto_scheduler.feature.get_per_store_features_from_measure_pairs(inputs, results)
+    features, throughputs, task_ids = auto_scheduler.cost_model.load_features_from_files(
+        [log_file], chunk_size=3, feature_cache=tmpdir.relpath("features")
+    )
+    assert len(features) == len(throughputs) == len(task_ids) == len(inputs) // 2
+    for x, y in zip(features, expected[0]):
+        np.testing.assert_allclose(x, y, rtol=1e-6)
+    np.testing.assert_allclose(throughputs, expected[1], rtol=1e-5)
+    np.testing.assert_equal(task_ids, expected[2])
+
+
 if __name__ == "__main__":
     test_random_model()
     test_xgb_model()
+    test_xgb_model_feature_cache()
+    test_feature_cache_unregistered_workload()
+    test_xgb_model_pretrain()
+    test_load_features_unregistered_workload()
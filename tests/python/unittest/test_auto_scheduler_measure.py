@@ -17,6 +17,7 @@
 
 """ Test measurement and log serialization. """
 import json
+import os
 
 import multiprocessing
 import numpy as np
@@ -203,6 +204,52 @@ def test_recover_measure_input():
         assert str(correct_inp.state) == str(inp.state)
 
 
+def test_lazy_apply_history_best():
+    task = auto_scheduler.SearchTask(
+        func=matmul_auto_scheduler_test, args=(512, 512, 512), target="llvm"
+    )
+    other = auto_scheduler.SearchTask(
+        func=matmul_auto_scheduler_test, args=(256, 256, 256), target="llvm"
+    )
+    inp = auto_scheduler.measure.MeasureInput(task, task.compute_dag.init_state)
+    other_inp = auto_scheduler.measure.MeasureInput(other, other.compute_dag.init_state)
+
+    def result(cost, error_no=0):
+        return auto_scheduler.measure.MeasureResult([cost], error_no, "", 0.2, 1)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        log_file = os.path.join(tmp_dir, "log.json")
+        auto_scheduler.save_records(
+            log_file, [inp, inp, inp], [result(0.3), result(0.1), result(0.01, error_no=2)]
+        )
+
+        index = auto_scheduler.load_best_index(log_file)
+        offset, cost = index["targetkey"][("cpu", task.workload_key)]
+        assert cost == 0.1
+        assert os.path.isfile(log_file + ".bestidx")
+
+        # the index is extended with the appended records
+        auto_scheduler.save_records(log_file, [other_inp], [result(0.5)])
+        index = auto_scheduler.load_best_index(log_file)
+        assert index["targetkey"][("cpu", task.workload_key)] == (offset, cost)
+        assert index["targetkey"][("cpu", other.workload_key)][1] == 0.5
+        assert index == auto_scheduler.load_best_index(log_file, use_cache=False)
+
+        target = tvm.target.Target("llvm")
+        lazy = auto_scheduler.LazyApplyHistoryBest(log_file)
+        eager = auto_scheduler.ApplyHistoryBest(log_file)
+        for wkl in [task.workload_key, other.workload_key]:
+            state = lazy._query_inside(target, wkl, "main")
+            assert str(state) == str(eager._query_inside(target, wkl, "main"))
+
+        # a compatible workload is matched with the indexed costs
+        with auto_scheduler.LazyApplyHistoryBest(log_file, include_compatible=True) as lazy:
+            wkl = json.dumps(["matmul_auto_scheduler_test", 1024, 1024, 1024])
+            assert lazy._query_inside(target, wkl, "main") is not None
+        # the log is unmapped on exit
+        assert all(mapped._mmap is None for mapped in lazy._files)
+
+
 def test_workload_dis_factor():
     calc = auto_scheduler.utils.calc_workload_dis_factor
     decode = auto_scheduler.utils.decode_workload_key
@@ -257,6 +304,48 @@ def test_measure_local_builder_runner():
         assert mress[0].error_no == 0
 
 
+def test_measure_local_runner_probe():
+    if not tvm.testing.device_enabled("llvm"):
+        return
+
+    task = auto_scheduler.SearchTask(
+        func=matmul_auto_scheduler_test, args=(96, 80, 72), target="llvm"
+    )
+    minp = auto_scheduler.MeasureInput(task, task.compute_dag.init_state)
+    local_builder = auto_scheduler.LocalBuilder()
+    # with a tiny ratio, every program is slower than the best one by far
+    local_runner = auto_scheduler.LocalRunner(timeout=60, probe_ratio=1e-9)
+
+    mress = local_runner.run([minp, minp], local_builder.build([minp, minp]))
+    assert mress[0].error_no == 0
+    assert mress[1].error_no == auto_scheduler.measure.MeasureErrorNo.EARLY_TERMINATED
+    assert 0 < mress[1].costs[0].value < auto_scheduler.measure.MAX_FLOAT
+
+
+def test_measure_local_runner_confidence_interval():
+    if not tvm.testing.device_enabled("llvm"):
+        return
+
+    task = auto_scheduler.SearchTask(
+        func=matmul_auto_scheduler_test, args=(96, 80, 72), target="llvm"
+    )
+    minp = auto_scheduler.MeasureInput(task, task.compute_dag.init_state)
+    local_builder = auto_scheduler.LocalBuilder()
+    local_runner = auto_scheduler.LocalRunner(
+        timeout=60, repeat=2, min_repeat_ms=1, max_rel_ci=0.05, ci_time_budget=5
+    )
+
+    mress = local_runner.run([minp], local_builder.build([minp]))
+    assert mress[0].error_no == 0
+    # stopped either at the target or when the budget ran out
+    assert mress[0].rel_ci <= 0.05 or mress[0].all_cost >= 5
+    assert len(mress[0].costs) >= 2
+
+    # the default runner does not compute the interval
+    mress = auto_scheduler.LocalRunner(timeout=60).run([minp], local_builder.build([minp]))
+    assert mress[0].rel_ci < 0
+
+
 def test_dag_measure_local_builder_runner():
     if not tvm.testing.device_enabled("llvm"):
         return
@@ -326,6 +415,39 @@ def test_measure_local_builder_rpc_runner():
         del measure_ctx
 
 
+@tvm.testing.requires_llvm
+def test_measure_rpc_runner_session_lifetime():
+    task = auto_scheduler.SearchTask(
+        func=matmul_auto_scheduler_test, args=(64, 64, 64), target="llvm"
+    )
+    minps = [auto_scheduler.MeasureInput(task, task.compute_dag.init_state) for _ in range(4)]
+    local_builder = auto_scheduler.LocalBuilder()
+    measure_ctx = auto_scheduler.LocalRPCMeasureContext()
+    device_key = "$local$device$%d" % measure_ctx.tracker.port
+
+    executors = []
+    for n_parallel in [1, 1, 2]:
+        # the reused sessions keep their working directory across measurements and calls
+        rpc_runner = auto_scheduler.RPCRunner(
+            device_key,
+            "127.0.0.1",
+            measure_ctx.tracker.port,
+            n_parallel=n_parallel,
+            timeout=60,
+            session_lifetime=60,
+        )
+        bress = local_builder.build(minps)
+        assert all(bres.error_no == 0 for bres in bress)
+        mress = rpc_runner.run(minps, bress)
+        assert all(mres.error_no == 0 for mres in mress), mress
+        executors.append(auto_scheduler.measure._RPC_RUN_EXECUTOR["executor"])
+
+    # the executor is kept for the same parallelism, and shut down when replaced
+    assert executors[0] is executors[1]
+    assert executors[2] is not executors[1] and executors[1]._is_shutdown
+    del measure_ctx
+
+
 def measure_local_builder_rpc_runner_spawn():
     assert multiprocessing.get_start_method(False) == "spawn"
     test_measure_local_builder_rpc_runner()
@@ -429,11 +551,15 @@ if __name__ == "__main__":
     test_record_follow_split_follow_fused_split()
     test_record_pragma_storage_align_rfactor()
     test_recover_measure_input()
+    test_lazy_apply_history_best()
     test_workload_dis_factor()
     test_measure_local_builder_runner()
+    test_measure_local_runner_probe()
+    test_measure_local_runner_confidence_interval()
     test_dag_measure_local_builder_runner()
     test_workload_serialization()
     test_measure_local_builder_rpc_runner()
+    test_measure_rpc_runner_session_lifetime()
     test_measure_target_host()
     test_measure_special_inputs_map_by_name_local_runner()
     test_measure_special_inputs_map_by_name_rpc_runner()
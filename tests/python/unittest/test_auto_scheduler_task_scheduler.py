@@ -16,6 +16,7 @@
 # under the License.
 """ Test task scheduler """
 
+import os
 import tempfile
 
 import multiprocessing
@@ -139,7 +140,91 @@ def test_task_scheduler_gradient():
         del measure_ctx
 
 
+@tvm.testing.requires_llvm
+def test_task_scheduler_concurrent():
+    tasks = []
+    for n in [2, 4, 8]:
+        tasks.append(
+            auto_scheduler.SearchTask(
+                func=matmul_auto_scheduler_test, args=(n, n, n), target="llvm"
+            )
+        )
+
+    with tempfile.NamedTemporaryFile() as fp:
+        log_file = fp.name
+        n_trials = 8
+
+        measure_ctx = auto_scheduler.LocalRPCMeasureContext(n_parallel=2)
+        tune_option = auto_scheduler.TuningOptions(
+            num_measure_trials=n_trials,
+            runner=measure_ctx.runner,
+            num_measures_per_round=1,
+            measure_callbacks=[auto_scheduler.RecordToFile(log_file)],
+        )
+        task_scheduler = auto_scheduler.TaskScheduler(tasks, callbacks=[])
+        task_scheduler.tune(tune_option, search_policy="sketch.random", num_parallel_tasks=2)
+
+        counters = {}
+        for task in tasks:
+            counters[task.workload_key] = 0
+
+        for inp, _ in auto_scheduler.load_records(log_file):
+            counters[inp.task.workload_key] += 1
+
+        # every task is warmed up, and the trials in flight count towards the budget
+        assert all(counters[task.workload_key] >= 1 for task in tasks)
+        assert sum(counters.values()) == n_trials
+        assert task_scheduler.ct == n_trials
+        del measure_ctx
+
+
+@tvm.testing.requires_llvm
+def test_task_scheduler_checkpoint():
+    tasks = []
+    for n in [2, 4]:
+        tasks.append(
+            auto_scheduler.SearchTask(
+                func=matmul_auto_scheduler_test, args=(n, n, n), target="llvm"
+            )
+        )
+
+    tmpdir = tvm.contrib.utils.tempdir()
+    checkpoint_file = tmpdir.relpath("scheduler.ckpt")
+    tune_option = auto_scheduler.TuningOptions(
+        num_measure_trials=4,
+        runner=auto_scheduler.LocalRunner(),
+        num_measures_per_round=1,
+    )
+
+    task_scheduler = auto_scheduler.TaskScheduler(
+        tasks, callbacks=[], checkpoint_file=checkpoint_file, checkpoint_interval=1
+    )
+    task_scheduler.tune(tune_option, search_policy="sketch.xgb")
+    assert os.path.isfile(checkpoint_file)
+    with open(checkpoint_file + ".records", "rb") as fin:
+        records = fin.read()
+    assert len(records.splitlines()) == task_scheduler.checkpoint_sizes["n_records"] == 4
+    assert task_scheduler.checkpoint_sizes["n_features"] == 4
+
+    # a new scheduler resumes the status, the records and the model
+    resumed = auto_scheduler.TaskScheduler(tasks, callbacks=[], checkpoint_file=checkpoint_file)
+    resumed.tune(tune_option, search_policy="sketch.xgb")
+    assert len(resumed.cost_model.inputs) == 8
+    assert sum(resumed.task_cts) == sum(task_scheduler.task_cts) + 4
+    for old, new in zip(task_scheduler.task_costs_history, resumed.task_costs_history):
+        assert new[: len(old)] == old
+    # the checkpoints only append the new records and features
+    with open(checkpoint_file + ".records", "rb") as fin:
+        assert fin.read().startswith(records)
+    assert resumed.checkpoint_sizes["n_records"] == resumed.checkpoint_sizes["n_features"] == 8
+    assert os.path.getsize(checkpoint_file + ".features") == (
+        resumed.checkpoint_sizes["features_bytes"]
+    )
+
+
 if __name__ == "__main__":
     test_task_scheduler_round_robin()
     test_task_scheduler_round_robin_spawn()
     test_task_scheduler_gradient()
+    test_task_scheduler_concurrent()
+    test_task_scheduler_checkpoint()
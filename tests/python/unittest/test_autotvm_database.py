@@ -19,7 +19,8 @@ import copy
 import logging
 
 from tvm.autotvm import database
-from tvm.autotvm.record import encode, MeasureResult
+from tvm.contrib import utils
+from tvm.autotvm.record import encode
 
 from tvm.testing.autotvm import get_sample_records
 
@@ -54,11 +55,9 @@ def test_db_hash():
     inp2 = copy.deepcopy(inp1)
     inp1.config.code_hash = "cafecafe"
     inp2.config.code_hash = "dbffdbff"
-    res2l = list(tuple(res1))
 
     # set timestamp
-    res2l[-1] = -1
-    res2 = MeasureResult(*res2l)
+    res2 = res1._replace(timestamp=-1)
     _db = database.DummyDatabase()
     _db.flush()
     _db.save(inp1, res1, extend=True)
@@ -74,17 +73,11 @@ def test_db_hash():
 def test_db_latest_all():
     logging.info("test db load w/ multiple results ...")
     inp1, res1 = get_sample_records(1)[0]
-    lis1 = list(tuple(res1))
-    lis2 = list(tuple(res1))
-    lis3 = list(tuple(res1))
 
     # set timestamp
-    lis1[-1] = 0.0
-    lis2[-1] = 1.1
-    lis3[-1] = 9999.9999
-    res1 = MeasureResult(*lis1)
-    res2 = MeasureResult(*lis2)
-    res3 = MeasureResult(*lis3)
+    res2 = res1._replace(timestamp=1.1)
+    res3 = res1._replace(timestamp=9999.9999)
+    res1 = res1._replace(timestamp=0.0)
 
     _db = database.DummyDatabase()
     _db.flush()
@@ -116,9 +109,46 @@ def test_db_filter():
     assert len(records) == 2
 
 
+def test_sqlite_db():
+    logging.info("test sqlite db ...")
+    temp = utils.tempdir()
+    records = get_sample_records(5)
+    inputs, results = zip(*records)
+
+    _db = database.SQLiteDatabase(temp.relpath("records.db"))
+    _db.save_batch(inputs[:3], results[:3])
+    assert _db.load(inputs[0]) == results[0]
+    assert _db.load(inputs[3]) is None
+
+    # a second connection sees the same history
+    _db2 = database.SQLiteDatabase(temp.relpath("records.db"))
+    partial_results, unsaved = database.filter_inputs(_db2, inputs)
+    assert partial_results[:3] == list(results[:3])
+    assert partial_results[3:] == [None, None]
+    assert unsaved == list(inputs[3:])
+
+    res = results[0]._replace(timestamp=9999.0)
+    _db2.save(inputs[0], res, extend=True)
+    assert _db.load(inputs[0]).timestamp == 9999.0
+    assert len(_db.load(inputs[0], get_all=True)) == 2
+    _db2.save(inputs[0], res)
+    assert len(_db.load(inputs[0], get_all=True)) == 1
+
+    _db.save_batch(inputs[3:], results[3:])
+    matched = _db.filter(lambda inp, ress: any(r.costs[0] <= 2 for r in ress))
+    assert len(matched) == 2
+    assert len(_db.filter(lambda inp, ress: True, workload=inputs[0].task.workload)) == 5
+
+    _db.flush()
+    assert _db2.load(inputs[0]) is None
+    _db.close()
+    _db2.close()
+
+
 if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO)
     test_save_load()
     test_db_hash()
     test_db_latest_all()
     test_db_filter()
+    test_sqlite_db()
@@ -17,6 +17,7 @@
 """Test builder and runner"""
 import logging
 import multiprocessing
+import os
 import concurrent
 
 import numpy as np
@@ -24,6 +25,7 @@ import numpy as np
 import tvm
 from tvm import te
 from tvm.autotvm.measure import executor
+from tvm.contrib import utils
 from tvm.testing.autotvm import DummyRunner, bad_matmul, get_sample_task
 from tvm import autotvm
 from tvm.autotvm.measure.measure import MeasureErrorNo, MeasureResult
@@ -50,6 +52,27 @@ def test_task_tuner_without_measurement():
         assert tuner.best_flops > 1
 
 
+def test_task_tuner_pipeline():
+    """test pipelined build and run in tuner"""
+    task, _ = get_sample_task()
+
+    measure_option = autotvm.measure_option(
+        builder=autotvm.LocalBuilder(n_parallel=2), runner=DummyRunner()
+    )
+
+    measured = []
+    for tuner_class in [autotvm.tuner.RandomTuner, autotvm.tuner.XGBTuner]:
+        tuner = tuner_class(task)
+        tuner.tune(
+            n_trial=10,
+            measure_option=measure_option,
+            callbacks=[lambda _, inputs, results: measured.extend(inputs)],
+            pipeline=True,
+        )
+        assert tuner.best_flops > 1
+    assert len(measured) == 20
+
+
 def task_tuner_spawn():
     assert multiprocessing.get_start_method(False) == "spawn"
     test_task_tuner_without_measurement()
@@ -86,9 +109,120 @@ def test_task_runner_with_ref_input():
     assert runner.executor.ran_dummy_executor
 
 
+def test_local_builder_build_cache():
+    """test the build cache of LocalBuilder"""
+    temp = utils.tempdir()
+    task, target = get_sample_task()
+    inputs = [measure.MeasureInput(target, task, task.config_space.get(i)) for i in range(4)]
+
+    builder = measure.LocalBuilder(n_parallel=1, build_cache=temp.relpath("cache"))
+    builder.set_task(task)
+
+    def _build():
+        results = builder.build(inputs)
+        ret = []
+        for res in results:
+            assert res.error is None
+            # the builder removes the libraries of a batch when building the next one
+            with open(res.filename, "rb") as fin:
+                ret.append((res.arg_info, fin.read()))
+        return ret
+
+    first = _build()
+    # mark the cached libraries, a rebuild would not return the marks
+    marks = set()
+    for name in os.listdir(temp.relpath("cache")):
+        if not name.endswith(".json"):
+            mark = b"cached " + name.encode()
+            marks.add(mark)
+            with open(os.path.join(temp.relpath("cache"), name), "wb") as fout:
+                fout.write(mark)
+    second = _build()
+    assert [arg_info for arg_info, _ in second] == [arg_info for arg_info, _ in first]
+    assert marks and all(lib in marks for _, lib in second)
+
+    # a bound of zero evicts every entry after insertion
+    cache = measure.BuildCache(temp.relpath("small"), max_size_mb=0)
+    lib = temp.relpath("lib.tar")
+    with open(lib, "wb") as f:
+        f.write(b"0" * 16)
+    cache.put("cafe", "tar", lib, (((1, 2), "float32"),))
+    assert cache.fetch("cafe", "tar", temp.relpath("out.tar")) is None
+
+
+def test_local_runner_probe():
+    """test the early termination of slow programs"""
+    task, target = get_sample_task()
+    inputs = [measure.MeasureInput(target, task, task.config_space.get(i)) for i in range(3)]
+
+    builder = measure.LocalBuilder(n_parallel=1)
+    # with a tiny ratio, every program is slower than the best one by far
+    runner = measure.LocalRunner(probe_ratio=1e-9)
+    measure_batch = measure.create_measure_batch(
+        task, measure.measure_option(builder=builder, runner=runner)
+    )
+    results = measure_batch(inputs)
+    assert results[0].error_no == MeasureErrorNo.NO_ERROR
+    for res in results[1:]:
+        assert res.error_no == MeasureErrorNo.EARLY_TERMINATED
+        assert len(res.costs) == 1 and res.costs[0] > 0
+
+
+def test_local_runner_session_lifetime():
+    """test measuring several batches on reused rpc sessions"""
+    task, target = get_sample_task()
+    inputs = [measure.MeasureInput(target, task, task.config_space.get(i)) for i in range(4)]
+
+    builder = measure.LocalBuilder(n_parallel=1)
+    runner = measure.LocalRunner(timeout=60, session_lifetime=60)
+    measure_batch = measure.create_measure_batch(
+        task, measure.measure_option(builder=builder, runner=runner)
+    )
+    # the later measurements run in the working directory of the earlier ones
+    for _ in range(2):
+        for res in measure_batch(inputs):
+            assert res.error_no == MeasureErrorNo.NO_ERROR, res
+
+
+def test_local_runner_confidence_interval():
+    """test repeating measurements until a confidence target"""
+    task, target = get_sample_task()
+    inputs = [measure.MeasureInput(target, task, task.config_space.get(i)) for i in range(2)]
+
+    builder = measure.LocalBuilder(n_parallel=1)
+    runner = measure.LocalRunner(repeat=2, max_rel_ci=0.05, ci_time_budget=5)
+    measure_batch = measure.create_measure_batch(
+        task, measure.measure_option(builder=builder, runner=runner)
+    )
+    for res in measure_batch(inputs):
+        assert res.error_no == MeasureErrorNo.NO_ERROR
+        # stopped either at the target or when the budget ran out
+        assert res.rel_ci <= 0.05 or res.all_cost >= 5
+        assert len(res.costs) >= 2
+
+    # the same sentinel as auto_scheduler when the target is not set
+    measure_batch = measure.create_measure_batch(
+        task, measure.measure_option(builder=builder, runner=measure.LocalRunner())
+    )
+    for res in measure_batch(inputs):
+        assert res.error_no == MeasureErrorNo.NO_ERROR
+        assert res.rel_ci < 0
+    assert "rel_ci=-1" in repr(MeasureResult((1.0,), MeasureErrorNo.NO_ERROR, 1.0, 0.0))
+
+    costs = [1.0, 1.1, 0.9, 1.0]
+    assert measure.measure_methods.relative_confidence_interval(costs[:1]) == float("inf")
+    assert 0 < measure.measure_methods.relative_confidence_interval(costs) < 0.2
+    assert measure.measure_methods.relative_confidence_interval([1.0] * 4) == 0
+
+
 if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO)
 
     test_task_tuner_without_measurement()
+    test_task_tuner_pipeline()
     test_task_tuner_without_measurement_spawn()
     test_task_runner_with_ref_input()
+    test_local_builder_build_cache()
+    test_local_runner_probe()
+    test_local_runner_session_lifetime()
+    test_local_runner_confidence_interval()
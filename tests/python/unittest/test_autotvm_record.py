@@ -15,6 +15,7 @@
 # specific language governing permissions and limitations
 # under the License.
 """test the correctness of dump and load of data log"""
+import os
 import time
 
 import tvm
@@ -24,6 +25,7 @@ from tvm.contrib import utils
 from tvm import autotvm
 from tvm.autotvm.measure import MeasureInput, MeasureResult, MeasureErrorNo
 from tvm.autotvm.record import encode, decode, ApplyHistoryBest, measure_str_key
+from tvm.autotvm.record_store import RecordStore, convert_from_json
 
 from tvm.testing.autotvm import get_sample_task
 
@@ -87,7 +89,91 @@ def test_apply_history_best():
     assert str(x) == str(tsk.config_space.get(2))
 
 
+def test_record_store():
+    temp = utils.tempdir()
+    log_path = temp.relpath("temp.log")
+    store_path = temp.relpath("temp.rec")
+
+    tsk, target = get_sample_task()
+    costs = [0.1, 0.3, 0.01, 0.4]
+    inputs = [MeasureInput(target, tsk, tsk.config_space.get(i)) for i in range(len(costs))]
+    results = [MeasureResult((c,), 0, 2.3, 0) for c in costs]
+
+    with open(log_path, "w") as fo:
+        autotvm.callback.log_to_file(fo)(None, inputs, results)
+    assert convert_from_json(log_path, store_path) == len(costs)
+
+    with RecordStore(store_path, readonly=True) as store:
+        assert len(store) == len(costs)
+        best_inp, best_res = store.best_by_targetkey(target.keys[0], tsk.workload)
+        assert str(best_inp.config) == str(tsk.config_space.get(2))
+        assert best_res.costs == (0.01,)
+        assert inputs[1] in store
+        assert store.get(inputs[1])[1].costs == (0.3,)
+        assert MeasureInput(target, tsk, tsk.config_space.get(5)) not in store
+
+    # appending updates the persisted indices
+    with RecordStore(store_path) as store:
+        inp = MeasureInput(target, tsk, tsk.config_space.get(5))
+        offset = store.append(inp, MeasureResult((0.001,), 0, 2.3, 0))
+        # the new record is readable before the store is flushed
+        assert store.record_at(offset)[1].costs == (0.001,)
+        assert store.get(inp)[1].costs == (0.001,)
+    with RecordStore(store_path, readonly=True) as store:
+        assert len(store) == len(costs) + 1
+        assert len(list(store)) == len(costs) + 1
+
+    hist_best = ApplyHistoryBest(store_path)
+    x = hist_best.query(target, tsk.workload)
+    assert str(x) == str(tsk.config_space.get(5))
+
+
+def test_lazy_apply_history_best():
+    temp = utils.tempdir()
+    log_path = temp.relpath("temp.log")
+
+    tsk, target = get_sample_task()
+    costs = [0.1, 0.3, 0.01, 0.4]
+    inputs = [MeasureInput(target, tsk, tsk.config_space.get(i)) for i in range(len(costs))]
+    results = [MeasureResult((c,), 0, 2.3, 0) for c in costs]
+    with open(log_path, "w") as fo:
+        autotvm.callback.log_to_file(fo)(None, inputs, results)
+
+    hist_best = autotvm.task.LazyApplyHistoryBest(log_path)
+    assert not hist_best.best_by_targetkey
+    x = hist_best.query(target, tsk.workload)
+    assert str(x) == str(tsk.config_space.get(2))
+    assert os.path.isfile(log_path + ".bestidx")
+
+    # appended records are picked up on top of the cached index
+    with open(log_path, "a") as fo:
+        inp = MeasureInput(target, tsk, tsk.config_space.get(5))
+        autotvm.callback.log_to_file(fo)(None, [inp], [MeasureResult((0.001,), 0, 2.3, 0)])
+    hist_best = autotvm.task.LazyApplyHistoryBest(log_path)
+    x = hist_best.query(target, tsk.workload)
+    assert str(x) == str(tsk.config_space.get(5))
+
+    # a log rewritten with the same head is indexed again, not read at stale offsets
+    inputs = [MeasureInput(target, tsk, tsk.config_space.get(i)) for i in range(64)]
+    results = [MeasureResult((1.0,), 0, 2.3, 0) for _ in inputs]
+    with open(log_path, "w") as fo:
+        autotvm.callback.log_to_file(fo)(None, inputs, results)
+    assert os.path.getsize(log_path) > 8192
+    autotvm.task.LazyApplyHistoryBest(log_path)
+    results[-1] = MeasureResult((0.0001,), 0, 2.3, 0)
+    with open(log_path, "w") as fo:
+        autotvm.callback.log_to_file(fo)(None, inputs, results)
+    with autotvm.task.LazyApplyHistoryBest(log_path) as hist_best:
+        x = hist_best.query(target, tsk.workload)
+        # a workload of dynamic shapes falls back as in ApplyHistoryBest
+        dyn_workload = (tsk.workload[0], (tvm.tir.Var("n", "int32"), 128))
+        assert hist_best.query(target, dyn_workload).is_fallback
+    assert str(x) == str(tsk.config_space.get(63))
+
+
 if __name__ == "__main__":
     test_load_dump()
     test_apply_history_best()
     test_file_io()
+    test_record_store()
+    test_lazy_apply_history_best()
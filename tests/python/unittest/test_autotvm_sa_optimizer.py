@@ -0,0 +1,59 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Test the simulated annealing model optimizer"""
+import numpy as np
+
+from tvm.autotvm.tuner.model_based_tuner import knob2point, knobs2points, points2knobs
+from tvm.autotvm.tuner.sa_model_optimizer import SimulatedAnnealingOptimizer, random_walk_batch
+from tvm.testing.autotvm import get_sample_task
+
+
+def test_batch_knob_conversion():
+    dims = [7, 1, 13, 1024, 5]
+    points = np.random.randint(0, int(np.prod(dims)), size=100)
+    knobs = points2knobs(points, dims)
+    assert [knob2point(k, dims) for k in knobs] == list(points)
+    np.testing.assert_equal(knobs2points(knobs, dims), points)
+
+
+def test_random_walk_batch():
+    dims = [7, 1, 13, 2]
+    knobs = points2knobs(np.arange(int(np.prod(dims))), dims)
+    for _ in range(10):
+        new_knobs = random_walk_batch(knobs, dims)
+        # exactly one dimension changes and stays inside the space
+        assert np.all(np.sum(new_knobs != knobs, axis=1) == 1)
+        assert np.all(new_knobs >= 0) and np.all(new_knobs < np.array(dims))
+
+
+def test_find_maximums():
+    task, _ = get_sample_task()
+
+    class DummyModel:
+        def predict(self, xs):
+            return np.asarray(xs, dtype=np.float64)
+
+    sa = SimulatedAnnealingOptimizer(task, n_iter=50, parallel_size=16, log_interval=0)
+    maximums = sa.find_maximums(DummyModel(), 4, set())
+    assert len(maximums) == 4
+    assert len(set(maximums)) == 4
+
+
+if __name__ == "__main__":
+    test_batch_knob_conversion()
+    test_random_walk_batch()
+    test_find_maximums()
@@ -16,9 +16,12 @@
 # under the License.
 """Test space definition primitives"""
 
+import numpy as np
+
 import tvm
 from tvm import te
 from tvm.autotvm.task.space import ConfigSpace, FallbackConfigEntity
+from tvm.autotvm.tuner.model_based_tuner import point2knob
 
 
 def gemm_func(cfg, N):
@@ -102,5 +105,60 @@ def test_split():
         pass
 
 
+def test_flatten_feature_batch():
+    cfg = ConfigSpace()
+    gemm_func(cfg, 128)
+    cfg.define_annotate("ann", [cfg.axis(8), cfg.axis(8)], policy="try_unroll")
+    cfg.define_knob("unroll", [0, 512, 1500])
+
+    indexes = np.arange(len(cfg))
+    batch = cfg.get_flatten_feature_batch(indexes)
+    expected = np.stack([cfg.get(i).get_flatten_feature() for i in indexes])
+    np.testing.assert_equal(batch, expected)
+
+    try:
+        cfg.get_flatten_feature_batch([len(cfg)])
+        assert False
+    except IndexError:
+        pass
+
+
+def test_split_entity_order():
+    # the array enumeration matches the depth-first order over the factors
+    cfg = ConfigSpace()
+    cfg.define_split("tile_x", cfg.axis(64), policy="factors", num_outputs=3)
+    space = cfg.space_map["tile_x"]
+    expected = [
+        [-1, c, b]
+        for b in space.factors
+        for c in space.factors
+        if b * c <= 64 and 64 % (b * c) == 0
+    ]
+    assert [entity.size for entity in space.entities] == expected
+    assert all(isinstance(x, int) for x in space[3].size)
+
+    cfg.define_split("tile_y", cfg.axis(64), num_outputs=2, filter=lambda x: x.size[-1] >= 4)
+    assert all(entity.size[-1] >= 4 for entity in cfg.space_map["tile_y"].entities)
+
+
+def test_get_many():
+    cfg = ConfigSpace()
+    gemm_func(cfg, 128)
+    cfg.define_knob("unroll", [0, 512, 1500])
+
+    indexes = [0, 5, 17, len(cfg) - 1]
+    for config, index in zip(cfg.get_many(indexes), indexes):
+        assert config.index == index
+        assert str(config) == str(cfg.get(index))
+
+    # the batched decode is the one of the tuners
+    dims = [len(space) for space in cfg.space_map.values()]
+    for row, index in zip(ConfigSpace.decode_indexes(indexes, dims), indexes):
+        assert row.tolist() == point2knob(index, dims)
+
+
 if __name__ == "__main__":
     test_split()
+    test_flatten_feature_batch()
+    test_split_entity_order()
+    test_get_many()
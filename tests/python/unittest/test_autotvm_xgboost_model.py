@@ -44,6 +44,23 @@ def test_fit():
     upper_model.fit(xs, ys, plan_size=32)
 
 
+def test_fit_incremental():
+    task, target = get_sample_task()
+    model = XGBoostCostModel(
+        task, feature_type="knob", loss_type="rank", incremental=True, full_refit_interval=2
+    )
+
+    xs, ys = [], []
+    for i in range(4):
+        xs.extend(range(10 * i, 10 * (i + 1)))
+        ys.extend(np.random.rand(10))
+        model.fit(xs, ys, plan_size=8)
+
+    assert [n for n, _, _ in model.fit_history] == [10, 20, 30, 40]
+    assert [incremental for _, _, incremental in model.fit_history] == [False, True, True, False]
+    assert len(model.predict(np.arange(5))) == 5
+
+
 def fit_spawn():
     assert multiprocessing.get_start_method(False) == "spawn"
     test_fit()
@@ -89,6 +106,7 @@ def test_update():
 
 if __name__ == "__main__":
     test_fit()
+    test_fit_incremental()
     test_fit_spawn()
     test_tuner()
     test_update()
@@ -0,0 +1,131 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Test the dynamic batching of inference requests"""
+import concurrent.futures
+
+import numpy as np
+import pytest
+
+import tvm
+import tvm.testing
+from tvm import relay
+from tvm.contrib import graph_executor
+from tvm.contrib.dynamic_batching import (
+    DynamicBatcher,
+    GraphExecutorBatcher,
+    VirtualMachineBatcher,
+)
+
+
+def _get_model(batch_size):
+    x = relay.var("x", shape=(batch_size, 8))
+    w = relay.var("w", shape=(4, 8))
+    func = relay.Function([x, w], relay.nn.relu(relay.nn.dense(x, w)))
+    w_in = np.random.uniform(-1, 1, size=(4, 8)).astype("float32")
+    return tvm.IRModule.from_expr(func), {"w": w_in}
+
+
+def _reference(x, params):
+    return np.maximum(x.dot(params["w"].T), 0)
+
+
+def _infer_concurrently(batcher, num_requests):
+    samples = [np.random.uniform(size=(8,)).astype("float32") for _ in range(num_requests)]
+    with concurrent.futures.ThreadPoolExecutor(max_workers=16) as executor:
+        outputs = list(executor.map(lambda x: batcher.infer(x=x), samples))
+    return samples, outputs
+
+
+@tvm.testing.requires_llvm
+def test_graph_executor_batcher():
+    mod, params = _get_model(4)
+    lib = relay.build(mod, target="llvm", params=params)
+    gmod = graph_executor.GraphModule(lib["default"](tvm.cpu(0)))
+
+    with GraphExecutorBatcher(gmod, ["x"], max_delay_ms=10) as batcher:
+        assert batcher.max_batch_size == 4
+        samples, outputs = _infer_concurrently(batcher, 32)
+        with pytest.raises(ValueError):
+            batcher.submit(x=np.zeros((4, 8), "float32"))
+    for x, out in zip(samples, outputs):
+        assert len(out) == 1 and out[0].shape == (4,)
+        tvm.testing.assert_allclose(out[0], _reference(x, params), rtol=1e-5)
+
+    stats = batcher.stats()
+    assert stats["num_requests"] == 32
+    assert 8 <= stats["num_batches"] <= 32
+    assert stats["p50"] <= stats["p99"]
+    with pytest.raises(RuntimeError):
+        batcher.submit(x=samples[0])
+
+
+@tvm.testing.requires_llvm
+def test_vm_batcher():
+    for batch_size, pad in [(4, True), (relay.Any(), False)]:
+        mod, params = _get_model(batch_size)
+        exe = relay.vm.compile(mod, target="llvm", params=params)
+        vm = tvm.runtime.vm.VirtualMachine(exe, tvm.cpu(0))
+
+        with VirtualMachineBatcher(vm, 4, pad_to_max_batch_size=pad) as batcher:
+            samples, outputs = _infer_concurrently(batcher, 16)
+        for x, out in zip(samples, outputs):
+            tvm.testing.assert_allclose(out[0], _reference(x, params), rtol=1e-5)
+        assert batcher.stats()["num_requests"] == 16
+
+
+class _DoubleBatcher(DynamicBatcher):
+    def _run_batch(self, batch_inputs):
+        return [[inputs["x"] * 2] for inputs in batch_inputs]
+
+
+def test_batcher_check_inputs():
+    with _DoubleBatcher(4, input_specs={"x": ((2,), np.dtype("float32"))}) as batcher:
+        np.testing.assert_equal(batcher.infer(x=np.ones(2, "float32"))[0], [2, 2])
+        with pytest.raises(ValueError, match="dtype"):
+            batcher.submit(x=np.ones(2, "float64"))
+        with pytest.raises(ValueError, match="shape"):
+            batcher.submit(x=np.ones(3, "float32"))
+
+
+def test_batcher_submit_while_closing():
+    batcher = _DoubleBatcher(4, max_delay_ms=1)
+    x = np.ones(2, "float32")
+
+    def submit():
+        try:
+            return batcher.submit(x=x)
+        except RuntimeError:
+            return None
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+        submitted = [executor.submit(submit) for _ in range(200)]
+        batcher.close()
+        futures = [f.result() for f in submitted]
+    # every accepted request is either run or failed, none is left pending
+    for future in futures:
+        if future is not None:
+            assert future.done()
+            np.testing.assert_equal(future.result()[0], x * 2)
+    with pytest.raises(RuntimeError):
+        batcher.submit(x=x)
+
+
+if __name__ == "__main__":
+    test_graph_executor_batcher()
+    test_vm_batcher()
+    test_batcher_check_inputs()
+    test_batcher_submit_while_closing()
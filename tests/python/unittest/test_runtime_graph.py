@@ -19,6 +19,8 @@ import tvm.testing
 from tvm import te, runtime
 import numpy as np
 import json
+import concurrent.futures
+import pytest
 from tvm import rpc
 from tvm import relay
 from tvm.contrib import utils, graph_executor
@@ -118,6 +120,66 @@ def test_graph_simple():
     check_sharing()
 
 
+@tvm.testing.requires_llvm
+def test_graph_executor_pool():
+    x = relay.var("x", shape=(1, 10))
+    y = relay.var("y", shape=(1, 10))
+    func = relay.Function([x, y], relay.add(x, y))
+    x_in = np.random.uniform(size=(1, 10)).astype("float32")
+    lib = relay.build(func, target="llvm", params={"x": x_in})
+    graph_json, params = lib.get_graph_json(), lib.get_params()
+    # the bound x is lifted to a param with a generated name
+    assert len(params) == 1
+    param_name = next(iter(params))
+
+    for p in [params, runtime.save_param_dict(params)]:
+        pool = graph_executor.GraphExecutorPool(graph_json, lib.get_lib(), tvm.cpu(0), p, 3)
+        # all instances reference the parameters of the first one
+        x_data = [inst.get_input(param_name).handle.contents.data for inst in pool.instances]
+        assert len(set(x_data)) == 1
+
+        inputs = [np.random.uniform(size=(1, 10)).astype("float32") for _ in range(16)]
+        with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+            outputs = list(executor.map(lambda a: pool.run(y=a)[0].numpy(), inputs))
+        for a, out in zip(inputs, outputs):
+            tvm.testing.assert_allclose(out, x_in + a)
+
+        stats = pool.stats()
+        assert len(stats) == 3
+        assert sum(s["num_runs"] for s in stats) == 16
+        assert all(0 <= s["utilization"] <= 1 for s in stats)
+
+
+@tvm.testing.requires_llvm
+def test_graph_zero_copy():
+    x = relay.var("x", shape=(1, 10))
+    y = relay.var("y", shape=(1, 10))
+    func = relay.Function([x, y], relay.add(x, y))
+    lib = relay.build(func, target="llvm")
+    mod = graph_executor.GraphModule(lib["default"](tvm.cpu(0)))
+
+    x_in = graph_executor.aligned_empty((1, 10), "float32")
+    y_in = graph_executor.aligned_empty((1, 10), "float32")
+    out = graph_executor.aligned_empty((1, 10), "float32")
+    mod.set_input_zero_copy("x", x_in, y=y_in)
+    mod.set_output_zero_copy(0, out)
+    for _ in range(2):
+        # the bound buffers are updated in place between runs
+        x_in[:] = np.random.uniform(size=(1, 10))
+        y_in[:] = np.random.uniform(size=(1, 10))
+        mod.run()
+        tvm.testing.assert_allclose(out, x_in + y_in)
+
+    with pytest.raises(ValueError):
+        mod.set_input_zero_copy("x", graph_executor.aligned_empty((1, 10), "float64"))
+    with pytest.raises(ValueError):
+        mod.set_input_zero_copy("x", graph_executor.aligned_empty((1, 11), "float32")[:, 1:])
+    with pytest.raises(RuntimeError):
+        mod.set_input_zero_copy("z", x_in)
+    with pytest.raises(IndexError):
+        mod.set_output_zero_copy(1, out)
+
+
 def test_load_unexpected_params():
     # Test whether graph_executor.load_params works if parameters
     # are provided that are not an expected input.
@@ -140,4 +202,6 @@ def test_load_unexpected_params():
 
 if __name__ == "__main__":
     test_graph_simple()
+    test_graph_executor_pool()
+    test_graph_zero_copy()
     test_load_unexpected_params()
@@ -538,3 +538,43 @@ def test_rpc_tracker_request():
     proc2.join()
     server.terminate()
     tracker.terminate()
+
+
+@tvm.testing.requires_rpc
+def test_rpc_session_pool():
+    tracker = Tracker(port=9000, port_end=10000)
+    device_key = "test_device"
+    server = rpc.Server(
+        port=9000,
+        port_end=10000,
+        key=device_key,
+        tracker_addr=("127.0.0.1", tracker.port),
+    )
+    pool = rpc.SessionPool("127.0.0.1", tracker.port, idle_timeout=1)
+
+    with pool.session(device_key) as remote:
+        remote.upload(bytearray(b"abc"), target="data.txt")
+    # the released session is reused, with its working directory
+    with pool.session(device_key) as remote2:
+        assert remote2 is remote
+        assert remote2.download("data.txt") == bytearray(b"abc")
+    assert pool.num_requests == 2 and pool.num_reused == 1
+
+    # a session is not reused after an error
+    with pytest.raises(ValueError):
+        with pool.session(device_key) as remote3:
+            raise ValueError()
+    del remote, remote2, remote3
+    with pool.session(device_key) as remote:
+        assert remote.cpu(0).exist
+    assert pool.num_reused == 2
+
+    # idle sessions are closed, which frees the device for other clients
+    time.sleep(2)
+    assert not pool._idle
+    client = rpc.connect_tracker("127.0.0.1", tracker.port)
+    assert client.request(device_key, max_retry=1).cpu(0).exist
+
+    pool.close()
+    server.terminate()
+    tracker.terminate()